@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark of the knight, king and pawn attack lookup tables against the previous shift-based attack generation.
+Sliding piece attacks are shared: both boards use the current bishopAttacks() and rookAttacks() (and legalMoves()
+the same pin detection), such that the speedups measure the knight, king and pawn tables only, not the sliding
+attack changes benchmarked by benchmarks/sliding.py. Each time is the minimum over several alternating runs, which is
+the least disturbed by other processes.
+
+Run from the project root: python3 -m benchmarks.attacks
+"""
+
+from timeit import timeit
+from core.board import Board, RED, BLUE, YELLOW, GREEN, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, boardMask
+from core.geometry import bishopAttacks, rookAttacks
+from benchmarks.positions import randomPositions
+
+
+class ShiftBoard(Board):
+    """Board that generates knight, king and pawn attacks by chaining bitboard shifts on every call (reference). Sliding
+    attacks are those of Board."""
+    def pawnMoves(self, origin, color, attacksOnly=False):
+        """Pseudo-legal pawn moves."""
+        if attacksOnly:
+            origin = 1 << origin
+            if color == RED:
+                attacks = self.shiftNW(origin) | self.shiftNE(origin)
+            elif color == BLUE:
+                attacks = self.shiftNE(origin) | self.shiftSE(origin)
+            elif color == YELLOW:
+                attacks = self.shiftSE(origin) | self.shiftSW(origin)
+            elif color == GREEN:
+                attacks = self.shiftSW(origin) | self.shiftNW(origin)
+            else:
+                return 0
+            return attacks & boardMask
+        return super().pawnMoves(origin, color)
+
+    def knightMoves(self, origin):
+        """Pseudo-legal knight moves."""
+        origin = 1 << origin
+        NNE = self.shiftN(self.shiftNE(origin))
+        NEE = self.shiftNE(self.shiftE(origin))
+        SEE = self.shiftSE(self.shiftE(origin))
+        SSE = self.shiftS(self.shiftSE(origin))
+        SSW = self.shiftS(self.shiftSW(origin))
+        SWW = self.shiftSW(self.shiftW(origin))
+        NWW = self.shiftNW(self.shiftW(origin))
+        NNW = self.shiftN(self.shiftNW(origin))
+        return (NNE | NEE | SEE | SSE | SSW | SWW | NWW | NNW) & boardMask
+
+    def kingMoves(self, origin):
+        """Pseudo-legal king moves."""
+        kingSet = 1 << origin
+        moves = self.shiftW(kingSet) | self.shiftE(kingSet)
+        kingSet |= moves
+        moves |= self.shiftN(kingSet) | self.shiftS(kingSet)
+        return moves & boardMask
+
+    def attacked(self, square, color):
+        """Checks if a square is attacked by a player."""
+        opposite = (color + 2) % 4
+        if self.pawnMoves(square, opposite, True) & self.pieceSet(color, PAWN):
+            return True
+        if self.knightMoves(square) & self.pieceSet(color, KNIGHT):
+            return True
+        if self.kingMoves(square) & self.pieceSet(color, KING):
+            return True
+        if bishopAttacks(square, self.occupiedBB) & (self.pieceSet(color, BISHOP) | self.pieceSet(color, QUEEN)):
+            return True
+        if rookAttacks(square, self.occupiedBB) & (self.pieceSet(color, ROOK) | self.pieceSet(color, QUEEN)):
+            return True
+        return False
+
+    def kingInCheck(self, color):
+        """Checks if a player's king is in check, by shift-based attack queries of both opponents."""
+        kingSquare = self.bitScanForward(self.pieceSet(color, KING))
+        if color in (RED, YELLOW):
+            return self.attacked(kingSquare, BLUE) or self.attacked(kingSquare, GREEN), self.fileRank(kingSquare)
+        else:
+            return self.attacked(kingSquare, RED) or self.attacked(kingSquare, YELLOW), self.fileRank(kingSquare)
+
+
+def squares(board):
+    """Returns all board squares (16x16 indices)."""
+    return [board.square(file, rank) for file, rank in board.getSquares(boardMask)]
+
+
+def attackedLoop(board):
+    """Queries attacks on every board square by every player."""
+    for square in squares(board):
+        for color in (RED, BLUE, YELLOW, GREEN):
+            board.attacked(square, color)
+
+
+def kingInCheckLoop(board):
+    """Queries check status of all four kings."""
+    for color in (RED, BLUE, YELLOW, GREEN):
+        board.kingInCheck(color)
+
+
+def legalMovesLoop(board):
+    """Generates moves of every piece of every player."""
+    for color in (RED, BLUE, YELLOW, GREEN):
+        for file, rank in board.getSquares(board.pieceBB[color]):
+            piece = board.getPieceCode(file, rank) >> 2
+            board.legalMoves(piece, board.square(file, rank), color)
+
+
+def verify(boards, references):
+    """Asserts that table lookups and shift-based generation agree on every square."""
+    for board, reference in zip(boards, references):
+        for square in squares(board):
+            assert board.knightMoves(square) == reference.knightMoves(square)
+            assert board.kingMoves(square) == reference.kingMoves(square)
+            for color in (RED, BLUE, YELLOW, GREEN):
+                assert board.pawnMoves(square, color, True) == reference.pawnMoves(square, color, True)
+                assert board.pawnMoves(square, color) == reference.pawnMoves(square, color)
+                assert board.attacked(square, color) == reference.attacked(square, color)
+        for color in (RED, BLUE, YELLOW, GREEN):
+            if board.pieceSet(color, KING):
+                assert board.kingInCheck(color) == reference.kingInCheck(color)
+
+
+def main():
+    """Times attacked(), kingInCheck() and legalMoves() with lookup tables (kingInCheck(): both opponents in one
+    opponentAttackers() query) and with shift-based generation of knight, king and pawn attacks."""
+    boards = randomPositions()
+    references = randomPositions(boardClass=ShiftBoard)
+    verify(boards, references)
+    print('knight, king and pawn attacks; sliding attacks shared')
+    print('{:<12}{:>14}{:>14}{:>10}'.format('function', 'shifts (ms)', 'tables (ms)', 'speedup'))
+    for name, function, number in (('attacked', attackedLoop, 2), ('kingInCheck', kingInCheckLoop, 100),
+                                   ('legalMoves', legalMovesLoop, 10)):
+        # Alternate the two runs, such that both see the same load
+        shifts = tables = float('inf')
+        for _ in range(15):
+            shifts = min(shifts, timeit(lambda: [function(board) for board in references], number=number))
+            tables = min(tables, timeit(lambda: [function(board) for board in boards], number=number))
+        shifts *= 1000 / number
+        tables *= 1000 / number
+        print('{:<12}{:>14.2f}{:>14.2f}{:>9.1f}x'.format(name, shifts, tables, shifts / tables))
+
+
+if __name__ == '__main__':
+    main()
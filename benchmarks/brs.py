@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark of the Free-For-All searches (core/brs.py): depth reached within a fixed time per position by
+Best-Reply Search and paranoid search, on the start position and random FFA game positions. Depth counts plies of
+the search tree; in Best-Reply Search every second ply is a move of the root player, in paranoid search every
+fourth.
+
+Run from the project root:
+    python3 -m benchmarks.brs                       1 second per position
+    python3 -m benchmarks.brs --movetime 5 --positions 8
+"""
+
+from argparse import ArgumentParser
+from core.board import Board
+from core.brs import BestReplySearch
+from benchmarks.positions import randomPositions, startFen4
+
+
+def main():
+    """Searches the position suite for a fixed time with each search and prints depth, root player moves searched
+    ahead, nodes and nodes per second per position, followed by the averages."""
+    parser = ArgumentParser(description='Benchmark of the Free-For-All searches.')
+    parser.add_argument('--movetime', type=float, default=1., help='time per position in seconds (default: 1)')
+    parser.add_argument('--positions', type=int, default=4, help='number of random game positions (default: 4)')
+    parser.add_argument('--hash', type=int, default=16, help='transposition table size in MB (default: 16)')
+    args = parser.parse_args()
+    start = Board(14, 14, ffa=True)
+    start.parseFen4(startFen4)
+    boards = [start] + randomPositions(count=args.positions, ffa=True)
+    for name, paranoid, period in (('best-reply', False, 2), ('paranoid', True, 4)):
+        search = BestReplySearch(args.hash, paranoid)
+        totalDepth = 0
+        totalNodes = 0
+        totalTime = 0
+        for index, board in enumerate(boards):
+            search.tt.clear()
+            move, score = search.search(board, movetime=args.movetime)
+            totalDepth += search.depth
+            totalNodes += search.nodes
+            totalTime += search.elapsed
+            print('{:<10}  position {:>2}  depth {:>2}  own moves {}  score {:>6}  {:>8} nodes  {:>6} nps'.format(
+                name, index, search.depth, (search.depth + period - 1) // period, score, search.nodes, search.nps()))
+        print('{:<10}  average depth {:.2f} in {:.2f} s, {:.2f} plies per second, {:.0f} nps'.format(
+            name, totalDepth / len(boards), totalTime / len(boards), totalDepth / totalTime, totalNodes / totalTime))
+
+
+if __name__ == '__main__':
+    main()
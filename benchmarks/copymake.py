@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Verification and benchmark of the ways to branch from a position: FEN4 round trip, Board.copy(),
+Board.snapshot()/Board.restore() and Board.makeMove()/Board.unmakeMove().
+
+Run from the project root: python3 -m benchmarks.copymake
+"""
+
+from timeit import timeit
+from core.board import Board
+from benchmarks.positions import randomPositions
+
+
+def fen4Clone(board):
+    """Returns new board set up from FEN4 of board (the way to clone a position before snapshots)."""
+    clone = Board(14, 14)
+    clone.parseFen4(board.getFen4() + 'rbyg'[board.turn] + ' ' + board.castlingAvailability() + ' - 0 1')
+    return clone
+
+
+def state(board):
+    """Returns all position fields of board, for comparison."""
+    return (bytes(board.boardData), board.pieceBB, board.occupiedBB, board.emptyBB, board.castle, board.turn,
+            board.hash, board.psqt)
+
+
+def verify(boards):
+    """Asserts that copies, restored snapshots and made/unmade moves give the same position as the original."""
+    for board in boards:
+        assert state(board.copy()) == state(board) == state(fen4Clone(board))
+        snapshot = board.snapshot()
+        for move in board.generateMoves(board.turn):
+            board.makeMove(move)
+            child = board.copy()
+            board.restore(snapshot)
+            assert board.snapshot() == snapshot and board.psqt == board.computePsqt()
+            board.makeMove(move)
+            assert state(board) == state(child)
+            board.unmakeMove()
+            assert board.snapshot() == snapshot
+
+
+def main():
+    """Verifies on random game positions, then times cloning and branching from a position."""
+    boards = randomPositions()
+    verify(boards)
+    print('verified on {} positions'.format(len(boards)))
+    number = 200
+    board = boards[-1]
+    move = board.generateMoves(board.turn)[0]
+    snapshot = board.snapshot()
+
+    def copyMake():
+        child = board.copy()
+        child.makeMove(move)
+
+    def snapshotRestore():
+        board.makeMove(move)
+        board.restore(snapshot)
+
+    def makeUnmake():
+        board.makeMove(move)
+        board.unmakeMove()
+
+    for name, function in (('FEN4 clone', lambda: fen4Clone(board)), ('copy()', board.copy),
+                           ('snapshot()', board.snapshot), ('copy + make', copyMake),
+                           ('make + restore', snapshotRestore), ('make + unmake', makeUnmake)):
+        print('{:<16}{:>10.2f} us'.format(name, timeit(function, number=number) / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Benchmark of the incremental evaluation (core/evaluation.py): time per evaluation with scores recomputed from the
+board data and with the scores maintained by makeMove() and unmakeMove(). Verifies that the incremental scores match
+the recomputed ones along random games, including moves taken back.
+
+Run from the project root: python3 -m benchmarks.evaluation
+"""
+
+from random import Random
+from timeit import timeit
+from core.board import Board
+from core.evaluation import evaluate
+from benchmarks.positions import randomPositions, startFen4
+
+
+def verify(games=20, plies=80, seed=0):
+    """Asserts that incremental scores equal recomputed scores after every move made and taken back."""
+    rng = Random(seed)
+    for _ in range(games):
+        board = Board(14, 14)
+        board.parseFen4(startFen4)
+        for ply in range(plies):
+            moves = board.generateMoves(board.turn)
+            if not moves:
+                break
+            board.makeMove(rng.choice(moves))
+            assert board.psqt == board.computePsqt()
+        while board.undoStack:
+            board.unmakeMove()
+            assert board.psqt == board.computePsqt()
+
+
+def recomputed(board, color):
+    """Returns evaluation with scores recomputed from the board data (reference)."""
+    psqt = board.computePsqt()
+    return psqt[color] + psqt[(color + 2) % 4] - psqt[(color + 1) % 4] - psqt[(color + 3) % 4]
+
+
+def main():
+    """Times evaluation with recomputed and incremental scores."""
+    verify()
+    boards = randomPositions()
+    for board in boards:
+        assert recomputed(board, board.turn) == evaluate(board, board.turn)
+    print('{:<14}{:>14}'.format('evaluation', 'per call (us)'))
+    for name, function, number in (('recomputed', lambda: [recomputed(board, board.turn) for board in boards], 50),
+                                   ('incremental', lambda: [evaluate(board, board.turn) for board in boards], 5000)):
+        seconds = timeit(function, number=number) / number
+        print('{:<14}{:>14.2f}'.format(name, seconds / len(boards) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
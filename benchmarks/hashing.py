@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Verification and benchmark of the incremental Zobrist hash Board.hash against FEN4 strings as position identity,
+including castling availability removed by capturing a rook on its original square.
+
+Run from the project root: python3 -m benchmarks.hashing
+"""
+
+from random import Random
+from timeit import timeit
+from core.board import Board
+from benchmarks.positions import startFen4
+
+
+def fen4(board):
+    """Returns FEN4 of board with player to move and castling availability (the fields covered by the hash)."""
+    return board.getFen4() + 'rbyg'[board.turn] + ' ' + board.castlingAvailability() + ' - 0 1'
+
+
+def verify(games=20, plies=80, seed=0):
+    """Plays random games with random take-backs and checks that the incremental hash always equals the hash of the
+    same position set up from FEN4, and that different FEN4 never share a hash. Returns number of positions."""
+    rng = Random(seed)
+    hashes = {}
+    count = 0
+    for _ in range(games):
+        board = Board(14, 14)
+        board.parseFen4(startFen4)
+        for _ in range(plies):
+            moves = board.generateMoves(board.turn)
+            if not moves:
+                break
+            move = rng.choice(moves)
+            before = board.hash
+            board.makeMove(move)
+            if rng.random() < 0.2:
+                board.unmakeMove()
+                assert board.hash == before
+                board.makeMove(move)
+            reference = Board(14, 14)
+            reference.parseFen4(fen4(board))
+            assert board.hash == reference.hash, fen4(board)
+            assert hashes.setdefault(board.hash, fen4(board)) == fen4(board), 'hash collision'
+            count += 1
+    return count
+
+
+def verifyRookCapture():
+    """Checks that capturing a rook on its original square removes castling availability of its side from the board
+    and the hash, and that taking the capture back restores it."""
+    # Red king and rooks on their original squares, blue rook on d5 to capture the rook on d1
+    rookCaptureFen4 = '6yK7/14/14/14/14/14/bK13/13gK/14/3bR10/14/14/14/3rR3rK2rR3 b rKrQ - 0 0 1'
+    board = Board(14, 14)
+    board.parseFen4(rookCaptureFen4)
+    before = board.hash
+    board.makeMove(board.encodeMove(3, 4, 3, 0))
+    assert board.castlingAvailability() == 'rK', board.castlingAvailability()
+    reference = Board(14, 14)
+    reference.parseFen4(fen4(board))
+    assert board.hash == reference.hash
+    board.unmakeMove()
+    assert board.castlingAvailability() == 'rKrQ' and board.hash == before
+
+
+def main():
+    """Verifies the incremental hash, then times it against generating FEN4."""
+    print('verified hash of {} positions'.format(verify()))
+    verifyRookCapture()
+    print('verified castling availability after capturing a rook')
+    board = Board(14, 14)
+    board.parseFen4(startFen4)
+    number = 2000
+    fen = timeit(lambda: fen4(board) == startFen4, number=number) / number
+    hash_ = timeit(lambda: board.hash == 0, number=number) / number
+    print('position comparison: FEN4 {:.2f} us, hash {:.3f} us'.format(fen * 1e6, hash_ * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Scaling benchmark of the Monte Carlo Tree Search (core/mcts.py): playouts per second on the start position and
+random game positions with playouts in the calling process (0 workers) and in pools of 1, 2 and 4 worker processes,
+and the speedup relative to the first worker count. The pool is started before timing. Requires Python 3.7 or later.
+
+Run from the project root:
+    python3 -m benchmarks.mcts                      2 seconds per position with 0, 1, 2 and 4 workers
+    python3 -m benchmarks.mcts --movetime 5 --workers 1 2 4 8 --batch 16
+"""
+
+from argparse import ArgumentParser
+from core.board import Board
+from core.mcts import MonteCarloSearch
+from benchmarks.positions import randomPositions, startFen4
+
+
+def main():
+    """Searches the position suite for a fixed time with each number of workers and prints playouts and playouts per
+    second per position, followed by the totals and the speedup."""
+    parser = ArgumentParser(description='Scaling benchmark of the Monte Carlo Tree Search.')
+    parser.add_argument('--movetime', type=float, default=2., help='time per position in seconds (default: 2)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2, 4],
+                        help='numbers of worker processes, 0 for the calling process (default: 0 1 2 4)')
+    parser.add_argument('--batch', type=int, default=8, help='leaves per batch (default: 8)')
+    parser.add_argument('--plies', type=int, default=32, help='maximum plies per playout (default: 32)')
+    parser.add_argument('--positions', type=int, default=4, help='number of random game positions (default: 4)')
+    args = parser.parse_args()
+    start = Board(14, 14)
+    start.parseFen4(startFen4)
+    boards = [start] + randomPositions(count=args.positions)
+    baseline = None
+    for workers in args.workers:
+        search = MonteCarloSearch(workers, args.batch, args.plies)
+        totalPlayouts = 0
+        totalTime = 0
+        try:
+            search.search(start, playouts=max(1, workers) * args.batch)  # Start the worker processes
+            for index, board in enumerate(boards):
+                search.root = None  # No tree reuse between unrelated positions
+                move, reward = search.search(board, movetime=args.movetime)
+                totalPlayouts += search.playouts
+                totalTime += search.elapsed
+                print('workers {}  position {:>2}  reward {:.3f}  {:>6} playouts  {:>6} playouts/s'.format(
+                    workers, index, reward, search.playouts, search.pps()))
+        finally:
+            search.close()
+        rate = totalPlayouts / totalTime
+        if baseline is None:
+            baseline = rate
+        print('workers {}  total {} playouts in {:.2f} s, {:.0f} playouts/s, speedup {:.2f}'.format(
+            workers, totalPlayouts, totalTime, rate, rate / baseline))
+
+
+if __name__ == '__main__':
+    main()
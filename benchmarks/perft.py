@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Perft (performance test, move path enumeration) and divide over Board.generateMoves(), Board.makeMove() and
+Board.unmakeMove(). Counts the leaf nodes of the legal move tree to a fixed depth, which verifies the move generator
+against known node counts and measures its throughput in nodes per second.
+
+Run from the project root:
+    python3 -m benchmarks.perft                         run the reference suite (data/perft/suite.txt)
+    python3 -m benchmarks.perft 3                       perft(3) from the start position
+    python3 -m benchmarks.perft 3 --divide --fen4 FEN4  node count per root move of an arbitrary position
+"""
+
+import sys
+from argparse import ArgumentParser
+from os import path
+from time import perf_counter
+from core.algorithm import Algorithm
+from core.board import Board
+
+SUITE = path.join(path.dirname(path.dirname(path.abspath(__file__))), 'data', 'perft', 'suite.txt')
+
+
+def setupBoard(fen4):
+    """Returns board and player to move (color index) set up from FEN4."""
+    board = Board(14, 14)
+    board.parseFen4(fen4)
+    return board, board.turn
+
+
+def moveString(board, move):
+    """Returns origin and target of move as string, e.g. 'h2-h4'. Castling moves have the rook square as target."""
+    (fromFile, fromRank), (toFile, toRank) = board.fileRank(move & 255), board.fileRank(move >> 8 & 255)
+    return chr(fromFile + 97) + str(fromRank + 1) + '-' + chr(toFile + 97) + str(toRank + 1)
+
+
+def perft(board, color, depth):
+    """Returns number of leaf nodes of the legal move tree of given depth, with player color to move."""
+    if depth == 0:
+        return 1
+    moves = board.generateMoves(color)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        board.makeMove(move)
+        nodes += perft(board, (color + 1) % 4, depth - 1)
+        board.unmakeMove()
+    return nodes
+
+
+def divide(board, color, depth):
+    """Returns list of (move string, number of leaf nodes) for each legal root move, with player color to move."""
+    result = []
+    for move in board.generateMoves(color):
+        board.makeMove(move)
+        result.append((moveString(board, move), perft(board, (color + 1) % 4, depth - 1)))
+        board.unmakeMove()
+    return result
+
+
+def readSuite(fileName=SUITE):
+    """Returns list of (name, FEN4, {depth: nodes}) from suite file. Each line is 'name; FEN4; D1 n; D2 n; ...',
+    lines starting with '#' are comments."""
+    suite = []
+    with open(fileName, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = [field.strip() for field in line.split(';')]
+            counts = {int(field.split()[0][1:]): int(field.split()[1]) for field in fields[2:]}
+            suite.append((fields[0], fields[1], counts))
+    return suite
+
+
+def runSuite(fileName=SUITE, maxDepth=None):
+    """Runs perft on all positions of the suite up to maxDepth and returns list of failures."""
+    failures = []
+    totalNodes = 0
+    totalTime = 0
+    for name, fen4, counts in readSuite(fileName):
+        for depth in sorted(counts):
+            if maxDepth is not None and depth > maxDepth:
+                continue
+            board, color = setupBoard(fen4)
+            start = perf_counter()
+            nodes = perft(board, color, depth)
+            elapsed = perf_counter() - start
+            totalNodes += nodes
+            totalTime += elapsed
+            status = 'ok' if nodes == counts[depth] else 'FAILED (expected {})'.format(counts[depth])
+            print('{:<12} depth {}  {:>10} nodes  {:>8.0f} nps  {}'.format(name, depth, nodes, nodes / elapsed,
+                                                                          status))
+            if nodes != counts[depth]:
+                failures.append((name, depth, nodes, counts[depth]))
+    print('total {} nodes in {:.2f} s, {:.0f} nps'.format(totalNodes, totalTime, totalNodes / totalTime))
+    return failures
+
+
+def main():
+    """Runs perft or divide on a single position, or the reference suite if no depth is given."""
+    parser = ArgumentParser(description='Perft and divide for the Four-Player Chess move generator.')
+    parser.add_argument('depth', type=int, nargs='?', help='perft depth (omit to run the reference suite)')
+    parser.add_argument('--fen4', default=Algorithm.startFen4, help='position (default: start position)')
+    parser.add_argument('--divide', action='store_true', help='print node count per root move')
+    parser.add_argument('--suite', default=SUITE, help='suite file (default: data/perft/suite.txt)')
+    parser.add_argument('--max-depth', type=int, help='skip suite entries deeper than this')
+    args = parser.parse_args()
+    if args.depth is None:
+        failures = runSuite(args.suite, args.max_depth)
+        if failures:
+            for name, depth, nodes, expected in failures:
+                print('FAILED: {} depth {}: {} nodes, expected {}'.format(name, depth, nodes, expected))
+            sys.exit(1)
+        return
+    board, color = setupBoard(args.fen4)
+    start = perf_counter()
+    if args.divide:
+        result = divide(board, color, args.depth)
+        for move, nodes in sorted(result):
+            print('{:<10} {}'.format(move, nodes))
+        nodes = sum(nodes for _, nodes in result)
+        print('moves {}'.format(len(result)))
+    else:
+        nodes = perft(board, color, args.depth)
+    elapsed = perf_counter() - start
+    print('nodes {}  time {:.2f} s  {:.0f} nps'.format(nodes, elapsed, nodes / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Positions shared by the benchmarks: the start position (FEN4 of Algorithm.startFen4) and positions reached by
+random legal moves from it, the same for the same seed, such that timings of different runs can be compared.
+"""
+
+from random import Random
+from core.algorithm import Algorithm
+from core.board import Board
+
+startFen4 = Algorithm.startFen4
+
+
+def randomPositions(count=20, plies=40, seed=0, boardClass=Board, ffa=False):
+    """Returns list of boards reached by playing random legal moves from the start position, with the rules of the
+    Free-For-All variant if ffa. The same seed always gives the same positions."""
+    rng = Random(seed)
+    boards = []
+    for _ in range(count):
+        board = boardClass(14, 14)
+        board.ffa = ffa
+        board.parseFen4(startFen4)
+        for ply in range(plies):
+            moves = board.generateMoves(ply % 4)
+            if not moves:
+                break
+            move = rng.choice(moves)
+            board.makeMove(move)
+        boards.append(board)
+    return boards
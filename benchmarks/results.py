@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Verification and benchmark of game end detection in the Teams variant (Teams.gameResult()): king capture and
+the check state queries that follow it, checkmate, threefold repetition (also loading the game from PGN4 at the
+repeated position) and the result following the current move when stepping back and entering a variation, and draws
+by repetition and the move count rule in Free-For-All (FFA.gameResult()), then the time per move of gameResult() on
+random games, which must stay well under a millisecond.
+
+Run from the project root: python3 -m benchmarks.results
+"""
+
+from timeit import timeit
+from core.algorithm import Teams, FFA
+from core.board import drawPlies, GREEN, ROOK
+from benchmarks.positions import randomPositions
+
+# Kings, and green king on n7 with its pawns on m6, m7 and m8 (yellow's rook can mate on the n-file)
+kings = {'h1': 'rK', 'a8': 'bK', 'g14': 'yK', 'n7': 'gK'}
+mateFen4 = dict(kings, m6='gP', m7='gP', m8='gP', j11='yR')
+# Green king in check by yellow's rook on the seventh rank, yellow to move
+kingCaptureFen4 = dict(kings, j7='yR')
+
+
+def setupFen4(pieces, player, halfmoveClock=0):
+    """Returns FEN4 with pieces ({square name: piece}), player to move and halfmove clock, no castling
+    availability."""
+    ranks = []
+    for rank in reversed(range(14)):
+        row = ''
+        skip = 0
+        for file in range(14):
+            piece = pieces.get(chr(file + 97) + str(rank + 1))
+            if piece:
+                row += (str(skip) if skip else '') + piece
+                skip = 0
+            else:
+                skip += 1
+        ranks.append(row + (str(skip) if skip else ''))
+    return '/'.join(ranks) + ' ' + player + ' - - {} 0 1'.format(halfmoveClock)
+
+
+def play(algorithm, origin, target):
+    """Makes move from square name origin to square name target, e.g. 'j11', 'n11'."""
+    assert algorithm.makeMove(ord(origin[0]) - 97, int(origin[1:]) - 1, ord(target[0]) - 97, int(target[1:]) - 1), \
+        (origin, target)
+
+
+def verify():
+    """Plays the positions above and a knight shuffle from the start position and checks the results."""
+    algorithm = Teams()
+    algorithm.setBoardState(setupFen4(kingCaptureFen4, 'y'))
+    play(algorithm, 'j7', 'n7')
+    assert algorithm.result == Teams.Team1Wins, algorithm.result
+    board = algorithm.board
+    for color in range(4):  # The view queries all players after every move
+        board.kingInCheck(color)
+    assert board.kingInCheck(GREEN) == (False, None)
+    origin = board.square(13, 6)
+    assert not board.absolutePins(GREEN) and board.kingRay(origin, GREEN) == -1
+    assert board.legalMoves(ROOK, origin, GREEN)
+
+    algorithm.setBoardState(setupFen4(mateFen4, 'y'))
+    play(algorithm, 'j11', 'n11')
+    assert algorithm.result == Teams.Team1Wins, algorithm.result
+    algorithm.prevMove()
+    assert algorithm.result == Teams.NoResult, algorithm.result
+    play(algorithm, 'j11', 'j10')  # Variation without mate
+    assert algorithm.result == Teams.NoResult, algorithm.result
+    algorithm.prevMove()
+    algorithm.nextMove()  # Back into the mating line
+    assert algorithm.result == Teams.Team1Wins, algorithm.result
+
+    algorithm.newGame()
+    shuffle = (('j1', 'i3'), ('a5', 'c6'), ('e14', 'f12'), ('n10', 'l9'))
+    for _ in range(2):
+        for origin, target in shuffle:
+            play(algorithm, origin, target)
+        for origin, target in shuffle:
+            play(algorithm, target, origin)
+    assert algorithm.result == Teams.Draw, algorithm.result
+    pgn4 = []
+    algorithm.onPgn4Generated = pgn4.append
+    algorithm.getPgn4()
+    reloaded = Teams()
+    assert reloaded.parsePgn4(pgn4[-1])
+    assert reloaded.moveNumber == 16, reloaded.moveNumber  # Not at an earlier occurrence of the repeated position
+    algorithm.prevMove()
+    assert algorithm.result == Teams.NoResult, algorithm.result
+
+    # The same draws in Free-For-All
+    algorithm = FFA()
+    algorithm.newGame()
+    for _ in range(2):
+        for origin, target in shuffle:
+            play(algorithm, origin, target)
+        for origin, target in shuffle:
+            play(algorithm, target, origin)
+    assert algorithm.result == FFA.Draw, algorithm.result
+    algorithm.setBoardState(setupFen4(kings, 'r', drawPlies - 1))
+    play(algorithm, 'h1', 'h2')
+    assert algorithm.result == FFA.Draw, algorithm.result
+    print('verified king capture and check state, checkmate, repetition, reloading a repeated position, results after '
+          'stepping back and FFA draws')
+
+
+def main():
+    """Verifies the results, then times gameResult() on random game positions."""
+    verify()
+    algorithm = Teams()
+    boards = randomPositions(count=40, plies=60, seed=1)
+    number = 20
+    total = 0
+    for board in boards:
+        algorithm.board = board
+        total += timeit(algorithm.gameResult, number=number) / number
+    total /= len(boards)
+    print('per position: gameResult() {:.3f} ms'.format(total * 1000))
+
+
+if __name__ == '__main__':
+    main()
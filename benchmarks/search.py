@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark of the alpha-beta team search (core/search.py): depth reached, nodes, nodes per second and move ordering
+quality (fraction of beta cutoffs by the first move searched) on the start position and random game positions.
+
+Run from the project root:
+    python3 -m benchmarks.search            fixed depth 3 on all positions
+    python3 -m benchmarks.search --depth 4 --movetime 5
+"""
+
+from argparse import ArgumentParser
+from core.algorithm import squareName
+from core.board import Board
+from core.search import Search
+from benchmarks.positions import randomPositions, startFen4
+
+
+def main():
+    """Searches the start position and random game positions and prints depth, nodes, nps and best move per
+    position, followed by the totals."""
+    parser = ArgumentParser(description='Benchmark of the alpha-beta team search.')
+    parser.add_argument('--depth', type=int, default=3, help='search depth (default: 3)')
+    parser.add_argument('--movetime', type=float, help='time limit per position in seconds')
+    parser.add_argument('--positions', type=int, default=8, help='number of random game positions (default: 8)')
+    parser.add_argument('--hash', type=int, default=16, help='transposition table size in MB (default: 16)')
+    args = parser.parse_args()
+    start = Board(14, 14)
+    start.parseFen4(startFen4)
+    boards = [start] + randomPositions(count=args.positions)
+    search = Search(args.hash)
+    totalNodes = 0
+    totalTime = 0
+    cutoffs = 0
+    firstMoveCutoffs = 0
+    for index, board in enumerate(boards):
+        move, score = search.search(board, depth=args.depth, movetime=args.movetime)
+        totalNodes += search.nodes
+        totalTime += search.elapsed
+        cutoffs += search.ordering.cutoffs
+        firstMoveCutoffs += search.ordering.firstMoveCutoffs
+        print('position {:>2}  depth {}  score {:>6}  {:>8} nodes  {:>7} nps  pv {}'.format(
+            index, search.depth, score, search.nodes, search.nps(),
+            ' '.join(squareName(move & 255) + '-' + squareName(move >> 8 & 255) for move in search.pv)))
+        print('            transposition table: hit rate {:.1%}  collision rate {:.1%}  fill {:.1%}'.format(
+            search.tt.hitRate(), search.tt.collisionRate(), search.tt.fillRatio()))
+        print('            move ordering: {} cutoffs, first move {:.1%}'.format(
+            search.ordering.cutoffs, search.ordering.firstMoveCutoffRate()))
+    print('total {} nodes in {:.2f} s, {:.0f} nps, first move cutoffs {:.1%}'.format(
+        totalNodes, totalTime, totalNodes / totalTime, firstMoveCutoffs / cutoffs if cutoffs else 0.))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Micro-benchmark of Board.attackers() and the static exchange evaluation (core/search.py): time per call on every
+square and every capture of every player in random game positions.
+
+Run from the project root: python3 -m benchmarks.see
+"""
+
+from timeit import timeit
+from core.board import boardMask
+from core.search import see, hangingPieces, isCapture
+from benchmarks.positions import randomPositions
+
+
+def main():
+    """Times attackers() per square, see() per capture and hangingPieces() per position and prints microseconds per
+    call."""
+    boards = randomPositions()
+    squares = [[board.square(file, rank) for file, rank in board.getSquares(boardMask)] for board in boards]
+    captures = [[move for color in range(4) for move in board.generateMoves(color) if isCapture(move)]
+                for board in boards]
+    calls = sum(len(moves) for moves in captures)
+    print('{} positions, {} squares, {} captures'.format(len(boards), sum(len(s) for s in squares), calls))
+    print('{:<16}{:>10}{:>14}'.format('function', 'calls', 'per call (us)'))
+    for name, function, count, number in (
+            ('attackers', lambda: [board.attackers(square) for board, s in zip(boards, squares) for square in s],
+             sum(len(s) for s in squares), 20),
+            ('see', lambda: [see(board, move) for board, moves in zip(boards, captures) for move in moves],
+             calls, 20),
+            ('hangingPieces', lambda: [hangingPieces(board) for board in boards], len(boards), 5)):
+        seconds = timeit(function, number=number) / number
+        print('{:<16}{:>10}{:>14.2f}'.format(name, count, seconds / count * 1e6))
+
+
+if __name__ == '__main__':
+    main()
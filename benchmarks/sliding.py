@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Verification and benchmark of the loop-free sliding piece attacks against Board.maskBlockedSquares().
+
+Run from the project root: python3 -m benchmarks.sliding
+"""
+
+from random import Random
+from timeit import timeit
+from core.board import Board
+from core.geometry import boardMask, rookAttacks, bishopAttacks, queenAttacks
+from benchmarks.positions import randomPositions
+
+
+def randomOccupancies(count=200, seed=0):
+    """Returns random occupancy bitboards with densities between sparse and fully congested."""
+    rng = Random(seed)
+    squares = [square for square in range(256) if boardMask >> square & 1]
+    return [sum(1 << square for square in squares if rng.random() < density)
+            for density in (rng.random() for _ in range(count))]
+
+
+def verify(board, occupancies):
+    """Asserts that both implementations give the same attacks for every square and occupancy."""
+    squares = [board.square(file, rank) for file, rank in board.getSquares(boardMask)]
+    for occupied in occupancies:
+        for square in squares:
+            assert rookAttacks(square, occupied) == \
+                board.maskBlockedSquares(board.rookMoves(square), square, occupied)
+            assert bishopAttacks(square, occupied) == \
+                board.maskBlockedSquares(board.bishopMoves(square), square, occupied)
+            assert queenAttacks(square, occupied) == \
+                board.maskBlockedSquares(board.queenMoves(square), square, occupied)
+
+
+def main():
+    """Verifies on random occupancies and game positions, then times both implementations per call."""
+    board = Board(14, 14)
+    occupancies = randomOccupancies() + [position.occupiedBB for position in randomPositions()]
+    verify(board, occupancies)
+    print('verified on {} occupancies'.format(len(occupancies)))
+    squares = [board.square(file, rank) for file, rank in board.getSquares(boardMask)]
+    calls = len(squares) * len(occupancies)
+    print('{:<8}{:>16}{:>16}{:>10}'.format('piece', 'blockers (us)', 'loop-free (us)', 'speedup'))
+    for name, moves, attacks in (('rook', board.rookMoves, rookAttacks), ('bishop', board.bishopMoves, bishopAttacks),
+                                 ('queen', board.queenMoves, queenAttacks)):
+        loop = timeit(lambda: [board.maskBlockedSquares(moves(square), square, occupied)
+                               for occupied in occupancies for square in squares], number=1) / calls * 1e6
+        loopFree = timeit(lambda: [attacks(square, occupied)
+                                   for occupied in occupancies for square in squares], number=1) / calls * 1e6
+        print('{:<8}{:>16.2f}{:>16.2f}{:>9.1f}x'.format(name, loop, loopFree, loop / loopFree))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Scaling benchmark of the parallel (Lazy SMP) search (core/smp.py): time to reach a fixed depth on the start
+position and random game positions with 1, 2, 4 and 8 workers, and the speedup relative to the first worker count.
+The table is cleared before each position, such that every search starts cold. First verifies that a search still
+returns the main search's result when helper processes die. Requires Python 3.8 or later.
+
+Run from the project root:
+    python3 -m benchmarks.smp                       depth 4 with 1, 2, 4 and 8 workers
+    python3 -m benchmarks.smp --depth 5 --workers 1 2 4
+"""
+
+from argparse import ArgumentParser
+from threading import Timer
+from core.board import Board
+from core.smp import ParallelSearch
+from benchmarks.positions import randomPositions, startFen4
+
+
+def verifyDeadHelpers(hashSize):
+    """Kills one helper process between searches and the other during a search, and checks that the searches return
+    a move and drop the dead helpers."""
+    board = Board(14, 14)
+    board.parseFen4(startFen4)
+    search = ParallelSearch(3, hashSize)
+    try:
+        process = search.helpers[0][0]
+        process.kill()
+        process.join()
+        move, score = search.search(board, depth=2)
+        assert move and len(search.helpers) == 1
+        Timer(0.2, search.helpers[0][0].kill).start()
+        move, score = search.search(board, movetime=1)
+        assert move and not search.helpers
+    finally:
+        search.close()
+    print('verified search with dead helper processes')
+
+
+def main():
+    """Searches the position suite to a fixed depth with each number of workers and prints time, nodes and nodes per
+    second per position, followed by the totals and the speedup."""
+    parser = ArgumentParser(description='Scaling benchmark of the parallel (Lazy SMP) search.')
+    parser.add_argument('--depth', type=int, default=4, help='search depth (default: 4)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='numbers of worker processes (default: 1 2 4 8)')
+    parser.add_argument('--positions', type=int, default=4, help='number of random game positions (default: 4)')
+    parser.add_argument('--hash', type=int, default=16, help='transposition table size in MB (default: 16)')
+    args = parser.parse_args()
+    verifyDeadHelpers(args.hash)
+    start = Board(14, 14)
+    start.parseFen4(startFen4)
+    boards = [start] + randomPositions(count=args.positions)
+    baseline = None
+    for workers in args.workers:
+        search = ParallelSearch(workers, args.hash)
+        totalNodes = 0
+        totalTime = 0
+        try:
+            for index, board in enumerate(boards):
+                search.tt.clear()
+                move, score = search.search(board, depth=args.depth)
+                totalNodes += search.nodes
+                totalTime += search.elapsed
+                print('workers {}  position {:>2}  depth {}  score {:>6}  {:>6.2f} s  {:>8} nodes  {:>7} nps'.format(
+                    workers, index, search.depth, score, search.elapsed, search.nodes, search.nps()))
+        finally:
+            search.close()
+        if baseline is None:
+            baseline = totalTime
+        print('workers {}  total {:.2f} s  {} nodes  {:.0f} nps  speedup {:.2f}'.format(
+            workers, totalTime, totalNodes, totalNodes / totalTime, baseline / totalTime))
+
+
+if __name__ == '__main__':
+    main()
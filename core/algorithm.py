@@ -0,0 +1,1124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import deque
+from datetime import datetime
+from re import split
+from core.board import Board, pieceChars, drawPlies, KINGSIDE, PAWN, KING
+
+
+def squareName(square):
+    """Returns algebraic name of bitboard square, e.g. 'h2'."""
+    return chr(96 + (square & 15)) + str(square >> 4)  # chr(97) = 'a'
+
+
+class Algorithm:
+    """The Algorithm is the underlying logic responsible for changing the current state of the board. It has no Qt
+    dependency; the Qt algorithm (gui/algorithm.py) overrides the on...() notification methods to emit signals."""
+    chesscom = False  # Use chess.com compatible FEN4 and PGN4
+
+    NoResult, Team1Wins, Team2Wins, Draw = ['*', '1-0', '0-1', '1/2-1/2']  # Results
+    NoPlayer, Red, Blue, Yellow, Green = ['?', 'r', 'b', 'y', 'g']  # Players
+    playerQueue = deque([Red, Blue, Yellow, Green])
+
+    startFen4 = '3yRyNyByKyQyByNyR3/3yPyPyPyPyPyPyPyP3/14/bRbP10gPgR/bNbP10gPgN/bBbP10gPgB/bKbP10gPgQ/' \
+                'bQbP10gPgK/bBbP10gPgB/bNbP10gPgN/bRbP10gPgR/14/3rPrPrPrPrPrPrPrP3/3rRrNrBrQrKrBrNrR3 ' \
+                'r rKrQbKbQyKyQgKgQ - 0 0 1'
+
+    # chess.com: [player to move] - [dead 1/0] - [kingside castle 1/0] - [queenside castle 1/0] - [points] - [ply] -
+    chesscomStartFen4 = 'R-0,0,0,0-1,1,1,1-1,1,1,1-0,0,0,0-0-3,yR,yN,yB,yK,yQ,yB,yN,yR,3/3,yP,yP,yP,yP,yP,yP,yP,yP,3/' \
+                        '14/bR,bP,10,gP,gR/bN,bP,10,gP,gN/bB,bP,10,gP,gB/bK,bP,10,gP,gQ/bQ,bP,10,gP,gK/bB,bP,10,gP,gB/'\
+                        'bN,bP,10,gP,gN/bR,bP,10,gP,gR/14/3,rP,rP,rP,rP,rP,rP,rP,rP,3/3,rR,rN,rB,rQ,rK,rB,rN,rR,3'
+
+    def __init__(self):
+        super().__init__()
+        self.variant = '?'
+        self.board = self.createBoard()
+        self.result = self.NoResult
+        self.currentPlayer = self.NoPlayer
+        self.playerQueue = deque(self.playerQueue)  # Own copy, such that algorithms do not share the player queue
+        self.moveNumber = 0
+        self.currentMove = self.Node(None, [], None)
+        self.currentMove.fen4 = self.startFen4
+        self.redName = self.NoPlayer
+        self.blueName = self.NoPlayer
+        self.yellowName = self.NoPlayer
+        self.greenName = self.NoPlayer
+        self.redRating = '?'
+        self.blueRating = '?'
+        self.yellowRating = '?'
+        self.greenRating = '?'
+        self.chesscomMoveText = ''
+        self.moveText = ''
+        self.moveDict = dict()
+        self.inverseMoveDict = dict()
+        self.index = 0  # Used by getMoveText() method
+        self.fenMoveNumber = 1
+
+    class Node:
+        """Generic node class. Basic element of a tree. Holds the packed integer move (see Board.encodeMove()) that
+        leads to it, or None for the root."""
+        def __init__(self, move, children, parent):
+            self.move = move
+            self.children = children
+            self.parent = parent
+            self.fen4 = None
+            self.hash = None  # Zobrist hash of position after move
+            self.comment = None
+            self.dead = 0  # Eliminated players after move, 1 << color per player (FFA)
+            self.points = (0, 0, 0, 0)  # Points of red, blue, yellow and green after move (FFA)
+
+        @property
+        def name(self):
+            """Returns move in string form, i.e. '<piece> <from> <captured piece> <to>', or 'root'."""
+            if self.move is None:
+                return 'root'
+            captured = pieceChars[self.move >> 22 & 63]
+            return (pieceChars[self.move >> 16 & 63] + ' ' + squareName(self.move & 255) + ' ' +
+                    captured * (captured != ' ') + ' ' + squareName(self.move >> 8 & 255))
+
+        def add(self, node):
+            """Adds node to children."""
+            self.children.append(node)
+
+        def pop(self):
+            """Removes last child from node."""
+            self.children.pop()
+
+        def getRoot(self):
+            """Backtracks tree and returns root node."""
+            if self.parent is None:
+                return self
+            return self.parent.getRoot()
+
+        def pathFromRoot(self, actions=None):
+            """Returns a list of nextMove() actions to reach the current node from the root."""
+            if not actions:
+                actions = []
+            if self.parent is None:
+                return actions
+            else:
+                var = self.parent.children.index(self)
+                actions.insert(0, 'nextMove(' + str(var) + ')')
+            return self.parent.pathFromRoot(actions)
+
+        def getMoveNumber(self):
+            """Returns the move number in the format (ply, variation, move). NOTE: does NOT support subvariations."""
+            varNum = [int(a.strip('nextMove()')) for a in self.pathFromRoot()]
+            ply, var, move = (0, 0, 0)
+            plyCount = True
+            i = 0
+            while i < len(varNum):
+                if varNum[i] != 0:
+                    var = varNum[i]
+                    plyCount = False
+                else:
+                    if plyCount:
+                        ply += 1
+                    else:
+                        move += 1
+                i += 1
+            return str(ply + 1) + '-' + str(var) + '-' + str(move + 1) if var != 0 else str(ply)
+
+    def createBoard(self):
+        """Returns new empty board. Overridden by the Qt algorithm to create a Qt board."""
+        return Board(14, 14)
+
+    def boardFromFen4(self, fen4):
+        """Returns new board set up from FEN4, in chess.com format if chesscom. The flag of the algorithm is the only
+        one: it is passed to the board before parsing."""
+        board = self.createBoard()
+        board.chesscom = self.chesscom
+        board.parseFen4(fen4)
+        return board
+
+    def onBoardChanged(self, board):
+        """Called when the board is replaced by a new board."""
+        pass
+
+    def onGameOver(self, result):
+        """Called when the game result is set."""
+        pass
+
+    def onCurrentPlayerChanged(self, player):
+        """Called when the player to move has changed."""
+        pass
+
+    def onFen4Generated(self, fen4):
+        """Called when the FEN4 of the current position is generated."""
+        pass
+
+    def onPgn4Generated(self, pgn4):
+        """Called when the PGN4 of the game is generated."""
+        pass
+
+    def onMoveTextChanged(self, moveText):
+        """Called when the movetext has changed."""
+        pass
+
+    def onSelectMove(self, key):
+        """Called when the move with key (index, token) in the move dictionary becomes the current move."""
+        pass
+
+    def onRemoveMoveSelection(self):
+        """Called when the current move is the root (no move selected)."""
+        pass
+
+    def onRemoveHighlight(self, color):
+        """Called to remove move highlights of color (hex string '#aarrggbb')."""
+        pass
+
+    def onAddHighlight(self, fromFile, fromRank, toFile, toRank, color):
+        """Called to highlight the move from (fromFile, fromRank) to (toFile, toRank) in color (hex string)."""
+        pass
+
+    def onPlayerNamesChanged(self, red, blue, yellow, green):
+        """Called when the player names have changed."""
+        pass
+
+    def onPlayerRatingChanged(self, red, blue, yellow, green):
+        """Called when the player ratings have changed."""
+        pass
+
+    def onCannotReadPgn4(self):
+        """Called when a PGN4 cannot be read."""
+        pass
+
+    def updatePlayerNames(self, red, blue, yellow, green):
+        """Sets player names to names entered in the player name labels."""
+        self.redName = red if not (red == 'Player Name' or red == '') else '?'
+        self.blueName = blue if not (blue == 'Player Name' or blue == '') else '?'
+        self.yellowName = yellow if not (yellow == 'Player Name' or yellow == '') else '?'
+        self.greenName = green if not (green == 'Player Name' or green == '') else '?'
+        self.getPgn4()  # Update PGN4
+
+    def updatePlayerRating(self, red, blue, yellow, green):
+        """Sets player rating to rating entered in the player name labels."""
+        self.redRating = red
+        self.blueRating = blue
+        self.yellowRating = yellow
+        self.greenRating = green
+
+    def setResult(self, value):
+        """Updates game result, if changed."""
+        if self.result == value:
+            return
+        if self.result == self.NoResult:
+            self.result = value
+            self.onGameOver(self.result)
+        else:
+            self.result = value
+        self.getPgn4()  # Update PGN4
+
+    def setCurrentPlayer(self, value):
+        """Updates current player, if changed."""
+        if self.currentPlayer == value:
+            return
+        self.currentPlayer = value
+        self.setPlayerQueue(self.currentPlayer)
+        self.onCurrentPlayerChanged(self.currentPlayer)
+
+    def setPlayerQueue(self, currentPlayer):
+        """Rotates player queue such that the current player is the first in the queue."""
+        while self.playerQueue[0] != currentPlayer:
+            self.playerQueue.rotate(-1)
+
+    def setBoard(self, board):
+        """Updates board, if changed."""
+        if self.board == board:
+            return
+        self.board = board
+        self.onBoardChanged(self.board)
+
+    def setupBoard(self):
+        """Initializes board."""
+        self.setBoard(self.createBoard())
+
+    def newGame(self):
+        """Initializes board and sets starting position."""
+        if self.chesscom:
+            fen4 = self.chesscomStartFen4
+        else:
+            fen4 = self.startFen4
+        self.setBoardState(fen4)
+        self.onFen4Generated(fen4)
+
+    def getFen4(self, emitSignal=True):
+        """Gets FEN4 from current board state."""
+        fen4 = self.board.getFen4()
+        # Append character for current player
+        fen4 += self.currentPlayer + ' '
+        fen4 += self.board.castlingAvailability() + ' '
+        fen4 += '- '  # En passant target square, n/a
+        fen4 += str(self.board.halfmoveClock) + ' '  # Number of quarter-moves since the last capture or pawn move
+        fen4 += str(self.moveNumber) + ' '  # Number of quarter-moves
+        fen4 += str(self.moveNumber // 4 + 1)  # Number of full moves, starting from 1
+        if self.chesscom:
+            chesscomPrefix = self.currentPlayer.upper() + '-0,0,0,0' + \
+                             self.toChesscomCastling(self.board.castlingAvailability()) + '-0,0,0,0-' + \
+                             str(self.moveNumber) + '-'
+            fen4 = chesscomPrefix + self.board.getChesscomFen4()
+        if emitSignal:
+            self.onFen4Generated(fen4)
+        return fen4
+
+    def toChesscomCastling(self, castling):
+        """Converts castling availability string to chess.com compatible format."""
+        s = '-'
+        s += '1,' if 'rK' in castling else '0,'
+        s += '1,' if 'bK' in castling else '0,'
+        s += '1,' if 'yK' in castling else '0,'
+        s += '1' if 'gK' in castling else '0'
+        s += '-'
+        s += '1,' if 'rQ' in castling else '0,'
+        s += '1,' if 'bQ' in castling else '0,'
+        s += '1,' if 'yQ' in castling else '0,'
+        s += '1' if 'gQ' in castling else '0'
+        return s
+
+    def gameResult(self):
+        """Returns result of the game in the current position, NoResult if it is not over. This method must be
+        implemented to define the rules of the game type (Teams or FFA)."""
+        return self.NoResult
+
+    def syncState(self, node):
+        """Sets state of the variant that moves do not undo (e.g. eliminated players in FFA) to that after the move
+        of node. Nothing to do in Teams."""
+        pass
+
+    def setCastlingAvailability(self, fen4):
+        """Sets castling availability according to FEN4."""
+        self.board.setCastlingAvailability(fen4.split(' ')[2])
+
+    def setBoardState(self, fen4):
+        """Sets board according to FEN4."""
+        if not fen4:
+            return
+        board = self.boardFromFen4(fen4)
+        moveNumber = 0 if self.chesscom else int(fen4.split(' ')[-2])
+        # Same position, halfmove clock and move number: keep the game and do not notify FEN4 generated
+        if board.hash == self.board.hash and board.halfmoveClock == self.board.halfmoveClock and \
+                moveNumber == self.moveNumber:
+            return
+        self.setBoard(board)
+        self.board.onBoardReset()  # Board view is connected to new board only after parsing
+        self.setResult(self.NoResult)
+        if self.chesscom:
+            self.setCurrentPlayer(fen4[0].lower())
+        else:
+            self.setCurrentPlayer(fen4.split(' ')[1])
+        self.moveNumber = moveNumber
+        self.fenMoveNumber = moveNumber + 1
+        self.currentMove = self.Node(None, [], None)
+        self.currentMove.fen4 = fen4
+        self.currentMove.hash = self.board.hash
+        self.chesscomMoveText = ''
+        self.moveText = ''
+        self.moveDict.clear()
+        self.getPgn4()  # Update PGN4
+
+    def toChesscomMove(self, move):
+        """Converts packed integer move to chess.com move notation."""
+        if move >> 28:
+            return 'O-O' if (move >> 28) - 1 == KINGSIDE else 'O-O-O'
+        piece = pieceChars[move >> 16 & 63][1]
+        captured = pieceChars[move >> 22 & 63][1:]
+        if captured:
+            captured = 'x' + captured * (captured != 'P')
+        else:
+            captured = '-'
+        return piece * (piece != 'P') + squareName(move & 255) + captured + squareName(move >> 8 & 255)
+
+    def fromChesscomMove(self, move, player):
+        """Returns fromFile, fromRank, toFile, toRank from chess.com move."""
+        if move == 'O-O':
+            if player == self.Red:
+                fromFile, fromRank, toFile, toRank = (7, 0, 10, 0)
+            elif player == self.Blue:
+                fromFile, fromRank, toFile, toRank = (0, 7, 0, 10)
+            elif player == self.Yellow:
+                fromFile, fromRank, toFile, toRank = (6, 13, 3, 13)
+            elif player == self.Green:
+                fromFile, fromRank, toFile, toRank = (13, 6, 13, 3)
+            else:
+                fromFile, fromRank, toFile, toRank = [None] * 4
+        elif move == 'O-O-O':
+            if player == self.Red:
+                fromFile, fromRank, toFile, toRank = (7, 0, 3, 0)
+            elif player == self.Blue:
+                fromFile, fromRank, toFile, toRank = (0, 7, 0, 3)
+            elif player == self.Yellow:
+                fromFile, fromRank, toFile, toRank = (6, 13, 10, 13)
+            elif player == self.Green:
+                fromFile, fromRank, toFile, toRank = (13, 6, 13, 10)
+            else:
+                fromFile, fromRank, toFile, toRank = [None] * 4
+        else:
+            for c in reversed(move):
+                if c.isupper():
+                    move = move.replace(c, '')
+            move = move.replace('x', '')
+            move = move.replace('-', '')
+            move = move.replace('+', '')
+            move = move.replace('#', '')
+            prev = ''
+            i = 0
+            for char in move:
+                if (not char.isdigit()) and prev.isdigit():
+                    move = [move[:i], move[i:]]
+                    break
+                prev = char
+                i += 1
+            fromFile = ord(move[0][0]) - 97
+            fromRank = int(move[0][1:]) - 1
+            toFile = ord(move[1][0]) - 97
+            toRank = int(move[1][1:]) - 1
+        return fromFile, fromRank, toFile, toRank
+
+    def toAlgebraic(self, move):
+        """Converts packed integer move to algebraic notation."""
+        if move >> 28:
+            return 'O-O' if (move >> 28) - 1 == KINGSIDE else 'O-O-O'
+        piece = pieceChars[move >> 16 & 63][1]
+        captured = 'x' if move >> 22 & 63 else ''
+        return piece * (piece != 'P') + squareName(move & 255) + captured + squareName(move >> 8 & 255)
+
+    def fromAlgebraic(self, move, player):
+        """Returns fromFile, fromRank, toFile, toRank from algebraic move."""
+        if move == 'O-O':
+            if player == self.Red:
+                fromFile, fromRank, toFile, toRank = (7, 0, 10, 0)
+            elif player == self.Blue:
+                fromFile, fromRank, toFile, toRank = (0, 7, 0, 10)
+            elif player == self.Yellow:
+                fromFile, fromRank, toFile, toRank = (6, 13, 3, 13)
+            elif player == self.Green:
+                fromFile, fromRank, toFile, toRank = (13, 6, 13, 3)
+            else:
+                fromFile, fromRank, toFile, toRank = [None] * 4
+        elif move == 'O-O-O':
+            if player == self.Red:
+                fromFile, fromRank, toFile, toRank = (7, 0, 3, 0)
+            elif player == self.Blue:
+                fromFile, fromRank, toFile, toRank = (0, 7, 0, 3)
+            elif player == self.Yellow:
+                fromFile, fromRank, toFile, toRank = (6, 13, 10, 13)
+            elif player == self.Green:
+                fromFile, fromRank, toFile, toRank = (13, 6, 13, 10)
+            else:
+                fromFile, fromRank, toFile, toRank = [None] * 4
+        else:
+            if move[0].isupper():
+                move = move[1:]
+            move = move.replace('x', '')
+            prev = ''
+            i = 0
+            for char in move:
+                if (not char.isdigit()) and prev.isdigit():
+                    move = [move[:i], move[i:]]
+                    break
+                prev = char
+                i += 1
+            fromFile = ord(move[0][0]) - 97
+            fromRank = int(move[0][1:]) - 1
+            toFile = ord(move[1][0]) - 97
+            toRank = int(move[1][1:]) - 1
+        return fromFile, fromRank, toFile, toRank
+
+    def prevMove(self):
+        """Sets board state to previous move."""
+        if self.currentMove.parent is None:
+            return
+        self.syncState(self.currentMove.parent)
+        self.board.unmakeMove()
+        self.currentMove = self.currentMove.parent
+        self.moveNumber -= 1
+        self.setCurrentPlayer([self.Red, self.Blue, self.Yellow, self.Green][self.board.turn])
+        # Notify View to remove last move highlight
+        if self.currentPlayer == self.Red:
+            color = '#33bf3b43'
+        elif self.currentPlayer == self.Blue:
+            color = '#334185bf'
+        elif self.currentPlayer == self.Yellow:
+            color = '#33c09526'
+        elif self.currentPlayer == self.Green:
+            color = '#334e9161'
+        else:
+            color = '#00000000'
+        self.onRemoveHighlight(color)
+        if self.currentMove.parent is not None:
+            key = self.inverseMoveDict[self.currentMove]
+            self.onSelectMove(key)
+        else:
+            self.onRemoveMoveSelection()
+        self.setResult(self.gameResult())  # The game may have ended later in the line
+        self.getFen4()  # Update FEN4
+        self.getPgn4()  # Update PGN4
+
+    def nextMove(self, var=0):
+        """Sets board state to next move. Follows main variation by default (var=0)."""
+        if not self.currentMove.children:
+            return
+        move = self.currentMove.children[var].move
+        self.board.makeMove(move)
+        (fromFile, fromRank), (toFile, toRank) = self.board.fileRank(move & 255), self.board.fileRank(move >> 8 & 255)
+        self.currentMove = self.currentMove.children[var]
+        self.moveNumber += 1
+        # Notify View to add move highlight and remove highlights of next player
+        if self.currentPlayer == self.Red:
+            color = '#33bf3b43'
+        elif self.currentPlayer == self.Blue:
+            color = '#334185bf'
+        elif self.currentPlayer == self.Yellow:
+            color = '#33c09526'
+        elif self.currentPlayer == self.Green:
+            color = '#334e9161'
+        else:
+            color = '#00000000'
+        self.onAddHighlight(fromFile, fromRank, toFile, toRank, color)
+        self.syncState(self.currentMove)
+        self.setCurrentPlayer([self.Red, self.Blue, self.Yellow, self.Green][self.board.turn])
+        if self.currentPlayer == self.Red:
+            color = '#33bf3b43'
+        elif self.currentPlayer == self.Blue:
+            color = '#334185bf'
+        elif self.currentPlayer == self.Yellow:
+            color = '#33c09526'
+        elif self.currentPlayer == self.Green:
+            color = '#334e9161'
+        else:
+            color = '#00000000'
+        self.onRemoveHighlight(color)
+        key = self.inverseMoveDict[self.currentMove]
+        self.onSelectMove(key)
+        self.setResult(self.gameResult())
+        self.getFen4()  # Update FEN4
+        self.getPgn4()  # Update PGN4
+
+    def firstMove(self):
+        """Sets board state to first move."""
+        while self.currentMove.parent is not None:
+            self.prevMove()
+
+    def lastMove(self):
+        """Sets board state to last move."""
+        self.firstMove()
+        while self.currentMove.children:
+            self.nextMove()
+
+    def makeMove(self, fromFile, fromRank, toFile, toRank):
+        """This method must be implemented to define the proper logic corresponding to the game type (Teams or FFA)."""
+        return False
+
+    def getPgn4(self):
+        """Generates PGN4 from current game."""
+        pgn4 = ''
+
+        # Tags: "?" if data unknown, "-" if not applicable
+        pgn4 += '[Variant "' + self.variant + '"]\n'
+        pgn4 += '[Site "www.chess.com/4-player-chess"]\n'
+        pgn4 += '[Date "' + datetime.utcnow().strftime('%a %b %d %Y %H:%M:%S (UTC)') + '"]\n'
+        # pgn4 += '[Event "-"]\n'
+        # pgn4 += '[Round "-"]\n'
+        pgn4 += '[Red "' + self.redName + '"]\n' if not self.redName == '?' else ''
+        pgn4 += '[RedElo "' + self.redRating + '"]\n' if not self.redRating == '?' else ''
+        pgn4 += '[Blue "' + self.blueName + '"]\n' if not self.blueName == '?' else ''
+        pgn4 += '[BlueElo "' + self.blueRating + '"]\n' if not self.blueRating == '?' else ''
+        pgn4 += '[Yellow "' + self.yellowName + '"]\n' if not self.yellowName == '?' else ''
+        pgn4 += '[YellowElo "' + self.yellowRating + '"]\n' if not self.yellowRating == '?' else ''
+        pgn4 += '[Green "' + self.greenName + '"]\n' if not self.greenName == '?' else ''
+        pgn4 += '[GreenElo "' + self.greenRating + '"]\n' if not self.greenRating == '?' else ''
+        # pgn4 += '[Result "' + self.result + '"]\n'  # 1-0 (r & y win), 0-1 (b & g win), 1/2-1/2 (draw), * (no result)
+        # pgn4 += '[Mode "ICS"]\n'  # ICS = Internet Chess Server, OTB = Over-The-Board
+        pgn4 += '[TimeControl "G/1 d15"]\n'  # 1-minute game with 15 seconds delay per move
+        pgn4 += '[PlyCount "' + str(self.moveNumber) + '"]\n'  # Total number of quarter-moves
+        startFen4 = self.currentMove.getRoot().fen4
+        if self.chesscom:
+            if startFen4 != self.chesscomStartFen4:
+                pgn4 += '[SetUp "1"]\n'
+                pgn4 += '[StartFen4 "' + startFen4 + '"]\n'
+        else:
+            if startFen4 != self.startFen4:
+                pgn4 += '[SetUp "1"]\n'
+                pgn4 += '[StartFen4 "' + startFen4 + '"]\n'
+        pgn4 += '[CurrentMove "' + self.currentMove.getMoveNumber() + '"]\n'
+        pgn4 += '[CurrentPosition "' + self.getFen4() + '"]\n\n'
+
+        # Movetext
+        if self.chesscom:
+            pgn4 = pgn4[:-1]  # remove newline
+            pgn4 += self.chesscomMoveText
+        else:
+            pgn4 += self.moveText
+
+            # Append result
+            pgn4 += self.result
+
+        self.onPgn4Generated(pgn4)
+
+    def updateMoveText(self):
+        """Updates movetext and dictionary."""
+        self.chesscomMoveText = ''
+        self.moveText = ''
+        self.moveDict.clear()
+        self.index = 0
+        self.getMoveText(self.currentMove.getRoot(), self.fenMoveNumber)
+        self.inverseMoveDict = {value: key for key, value in self.moveDict.items()}
+        self.onMoveTextChanged(self.moveText)
+        if self.currentMove.parent is not None:
+            key = self.inverseMoveDict[self.currentMove]
+            self.onSelectMove(key)
+
+    def getMoveText(self, node, move=1, var=0):
+        """Traverses move tree to generate movetext and updates move dictionary to keep track of the nodes associated
+        with the movetext."""
+        if node.children:
+            main = node.children[0]
+            if len(node.children) > 1:
+                variations = node.children[1:]
+            else:
+                variations = None
+        else:
+            main = None
+            variations = None
+        # If different FEN4 starting position used, insert move number if needed
+        if node.parent is None and move != 1 and (move - 1) % 4:
+            token = str((move - 1) // 4 + 1) + '.'
+            self.chesscomMoveText += token
+            self.moveText += token + ' '
+            self.moveDict[(self.index, token)] = None
+            self.index += 1
+            token = '.' * ((move - 1) % 4)
+            if token:
+                self.moveText += token
+                self.moveDict[(self.index, token)] = None
+                self.index += 1
+            if (move - 1) % 4:
+                self.chesscomMoveText += ' '
+                self.moveText += ' '
+        # Main move has variations
+        if main and variations:
+            if not (move - 1) % 4:
+                token = str(move // 4 + 1) + '.'
+                self.chesscomMoveText += '\n' + token + ' '
+                self.moveText += token + ' '
+                self.moveDict[(self.index, token)] = None
+                self.index += 1
+            else:
+                self.chesscomMoveText += '.. '
+            # Add main move to movetext before expanding variations, but do not expand main move yet
+            chesscomToken = self.toChesscomMove(main.move)
+            self.chesscomMoveText += chesscomToken + ' '
+            token = self.toAlgebraic(main.move)
+            self.moveText += token + ' '
+            self.moveDict[(self.index, token)] = main
+            self.index += 1
+            if main.comment:
+                self.chesscomMoveText += '{ ' + main.comment + ' } '
+                self.moveText += '{ ' + main.comment + ' } '
+            # Expand variations
+            for variation in variations:
+                if self.moveText[-2] == ')':
+                    self.index += 1
+                token = '('
+                self.chesscomMoveText += token + ' '
+                self.moveText += token + ' '
+                self.moveDict[(self.index, token)] = None
+                self.index += 1
+                token = str(move // 4 + 1)
+                self.chesscomMoveText += token
+                self.moveText += token + ' '
+                self.moveDict[(self.index, token)] = None
+                self.index += 1
+                token = '.' * ((move - 1) % 4)
+                if token:
+                    self.moveText += token
+                    self.moveDict[(self.index, token)] = None
+                    self.index += 1
+                if (move - 1) % 4:
+                    self.chesscomMoveText += '.. '
+                    self.moveText += ' '
+                else:
+                    self.chesscomMoveText += '. '
+                chesscomToken = self.toChesscomMove(variation.move)
+                self.chesscomMoveText += chesscomToken + ' '
+                token = self.toAlgebraic(variation.move)
+                self.moveText += token + ' '
+                self.moveDict[(self.index, token)] = variation
+                self.index += 1
+                if variation.comment:
+                    self.chesscomMoveText += '{ ' + variation.comment + ' } '
+                    self.moveText += '{ ' + variation.comment + ' } '
+                self.getMoveText(variation, move + 1, var + 1)
+            # Expand main move
+            self.index += 1
+            self.getMoveText(main, move + 1, var)
+        # Main move has no variations
+        elif main and not variations:
+            if not (move - 1) % 4:
+                token = str(move // 4 + 1) + '.'
+                self.chesscomMoveText += '\n' + token + ' '
+                self.moveText += token + ' '
+                self.moveDict[(self.index, token)] = None
+                self.index += 1
+            else:
+                self.chesscomMoveText += '.. '
+            chesscomToken = self.toChesscomMove(main.move)
+            self.chesscomMoveText += chesscomToken + ' '
+            token = self.toAlgebraic(main.move)
+            self.moveText += token + ' '
+            self.moveDict[(self.index, token)] = main
+            self.index += 1
+            if main.comment:
+                self.chesscomMoveText += '{ ' + main.comment + ' } '
+                self.moveText += '{ ' + main.comment + ' } '
+            self.getMoveText(main, move + 1, var)
+        # Node is leaf node (i.e. end of variation or main line)
+        else:
+            if var != 0:
+                token = ')'
+                self.chesscomMoveText += token + ' '
+                self.moveText += token + ' '
+                self.moveDict[(self.index, token)] = None
+
+    def split_(self, movetext):
+        """Splits movetext into tokens."""
+        x = split('\s+(?={)|(?<=})\s+', movetext)  # regex: one or more spaces followed by { or preceded by }
+        movetext = []
+        for y in x:
+            if y:
+                if y[0] != '{':
+                    for z in y.split():
+                        movetext.append(z)
+                else:
+                    movetext.append(y)
+        return movetext
+
+    def parseChesscomPgn4(self, pgn4):
+        """Parses chess.com PGN4 and sets game state accordingly."""
+        startPosition = None
+        currentMove = None
+        lines = pgn4.split('\n')
+        movetext = ''
+        for line in lines:
+            if line == '':
+                continue
+            elif line[0] == '[' and line[-1] == ']':
+                tag = line.strip('[]').split('"')[:-1]
+                tag[0] = tag[0].strip()
+                if tag[0] == 'Variant' and tag[1] == 'FFA':
+                    self.onCannotReadPgn4()
+                    return False
+                elif tag[0] == 'Red':
+                    self.redName = tag[1]
+                elif tag[0] == 'RedElo':
+                    self.redRating = tag[1]
+                elif tag[0] == 'Blue':
+                    self.blueName = tag[1]
+                elif tag[0] == 'BlueElo':
+                    self.blueRating = tag[1]
+                elif tag[0] == 'Yellow':
+                    self.yellowName = tag[1]
+                elif tag[0] == 'YellowElo':
+                    self.yellowRating = tag[1]
+                elif tag[0] == 'Green':
+                    self.greenName = tag[1]
+                elif tag[0] == 'GreenElo':
+                    self.greenRating = tag[1]
+                elif tag[0] == 'Result':
+                    self.result = tag[1]
+                elif tag[0] == 'StartFen4':
+                    startPosition = tag[1]
+                elif tag[0] == 'CurrentMove':
+                    currentMove = tag[1]
+                else:
+                    # Irrelevant tags
+                    pass
+            else:
+                if not currentMove:
+                    self.onCannotReadPgn4()
+                    return False
+                movetext += line + ' '
+            # Generate game from movetext
+            self.newGame()
+            tokens = self.split_(movetext)
+            for token in tokens:
+                if token[0] == '(' and len(token) > 1:
+                    index = tokens.index(token)
+                    tokens.insert(index + 1, token[1:])
+                    tokens[index] = token[0]
+            roots = []
+            prev = None
+            i = 0
+            for token in tokens:
+                try:
+                    next_ = tokens[i + 1]
+                except IndexError:
+                    next_ = None
+                if (token[0].isdigit() and token[-1] == '.') or token in '..RT#':
+                    pass
+                elif token[0] == '{':
+                    # Comment
+                    self.currentMove.comment = token[1:-1].strip()
+                elif token == '(':
+                    # Next move is variation
+                    if not prev == ')':
+                        self.prevMove()
+                        roots.append(self.currentMove)
+                    else:
+                        roots.append(self.currentMove)
+                elif token == ')':
+                    # End of variation
+                    root = roots.pop()
+                    while self.currentMove is not root:
+                        self.prevMove()
+                    if next_ != '(':
+                        # Continue with previous line
+                        self.nextMove()
+                else:
+                    fromFile, fromRank, toFile, toRank = self.fromChesscomMove(token, self.currentPlayer)
+                    self.makeMove(fromFile, fromRank, toFile, toRank)
+                prev = token
+                i += 1
+        # Set game position to CurrentMove ("ply-variation-move")
+        self.firstMove()
+        currentMove = [int(c) for c in currentMove.split('-')]
+        if len(currentMove) == 1:
+            ply = currentMove[0]
+            for _ in range(ply):
+                self.nextMove()
+        else:
+            ply, variation, move = currentMove
+            for _ in range(ply - 1):
+                self.nextMove()
+            self.nextMove(variation)
+            for _ in range(move - 1):
+                self.nextMove()
+        # Notify View to update player names and rating
+        self.onPlayerNamesChanged(self.redName, self.blueName, self.yellowName, self.greenName)
+        self.onPlayerRatingChanged(self.redRating, self.blueRating, self.yellowRating, self.greenRating)
+        return True
+
+    def parsePgn4(self, pgn4):
+        """Parses PGN4 and sets game state accordingly."""
+        currentPosition = None
+        lines = pgn4.split('\n')
+        for line in lines:
+            if line == '':
+                continue
+            elif line[0] == '[' and line[-1] == ']':
+                tag = line.strip('[]').split('"')[:-1]
+                tag[0] = tag[0].strip()
+                if tag[0] == 'Variant' and tag[1] == 'FFA':
+                    self.onCannotReadPgn4()
+                    return False
+                elif tag[0] == 'Red':
+                    self.redName = tag[1]
+                elif tag[0] == 'Blue':
+                    self.blueName = tag[1]
+                elif tag[0] == 'Yellow':
+                    self.yellowName = tag[1]
+                elif tag[0] == 'Green':
+                    self.greenName = tag[1]
+                elif tag[0] == 'Result':
+                    self.result = tag[1]
+                elif tag[0] == 'CurrentPosition':
+                    currentPosition = tag[1]
+                else:
+                    # Irrelevant tags
+                    pass
+            else:
+                if not currentPosition:
+                    self.onCannotReadPgn4()
+                    return False
+                # Generate game from movetext
+                self.newGame()
+                line = line.replace(' *', '')
+                line = line.replace(' 1-0', '')
+                line = line.replace(' 0-1', '')
+                line = line.replace(' 1/2-1/2', '')
+                if line == '*':
+                    # No movetext to process
+                    break
+                roots = []
+                tokens = self.split_(line)
+                prev = None
+                i = 0
+                for token in tokens:
+                    try:
+                        next_ = tokens[i + 1]
+                    except IndexError:
+                        next_ = None
+                    if token[0].isdigit() or token[0] == '.':
+                        pass
+                    elif token[0] == '{':
+                        # Comment
+                        self.currentMove.comment = token[1:-1].strip()
+                    elif token == '(':
+                        # Next move is variation
+                        if not prev == ')':
+                            self.prevMove()
+                            roots.append(self.currentMove)
+                        else:
+                            roots.append(self.currentMove)
+                    elif token == ')':
+                        # End of variation
+                        root = roots.pop()
+                        while self.currentMove is not root:
+                            self.prevMove()
+                        if next_ != '(':
+                            # Continue with previous line
+                            self.nextMove()
+                    else:
+                        fromFile, fromRank, toFile, toRank = self.fromAlgebraic(token, self.currentPlayer)
+                        self.makeMove(fromFile, fromRank, toFile, toRank)
+                    prev = token
+                    i += 1
+        # Set game position to FEN4
+        self.firstMove()
+        position = self.boardFromFen4(currentPosition)
+        moveNumber = int(currentPosition.split(' ')[-2])
+        node = None
+        for node in self.traverse(self.currentMove, self.currentMove.children):
+            # Same position, halfmove clock and move number, since a position can occur more than once in a game
+            fields = node.fen4.split(' ')
+            if node.hash == position.hash and int(fields[-3]) == position.halfmoveClock and \
+                    int(fields[-2]) == moveNumber:
+                break
+        if node:
+            actions = node.pathFromRoot()
+            for action in actions:
+                exec('self.' + action)
+        # Notify View to update player names
+        self.onPlayerNamesChanged(self.redName, self.blueName, self.yellowName, self.greenName)
+        return True
+
+    def traverse(self, tree, children):
+        """Traverses nodes of tree in breadth-first order."""
+        yield tree
+        last = tree
+        for node in self.traverse(tree, children):
+            for child in node.children:
+                yield child
+                last = child
+            if last == node:
+                return
+
+
+class Teams(Algorithm):
+    """A subclass of Algorithm for the 4-player chess Teams variant."""
+    def __init__(self):
+        super().__init__()
+        self.variant = 'Teams'
+
+    def makeMove(self, fromFile, fromRank, toFile, toRank):
+        """Moves piece from square (fromFile, fromRank) to square (toFile, toRank), if the move is valid."""
+        if self.currentPlayer == self.NoPlayer:
+            return False
+        # Check if square contains piece of current player. (A player may only move his own pieces.)
+        code = self.board.getPieceCode(fromFile, fromRank)
+        color = code & 3
+        if not code or [self.Red, self.Blue, self.Yellow, self.Green][color] != self.currentPlayer:
+            return False
+
+        # Check if move is legal
+        move = self.board.encodeMove(fromFile, fromRank, toFile, toRank)
+        if move not in self.board.generateMoves(color):
+            return False
+
+        # Check if move already exists
+        if not (self.currentMove.children and (move in (child.move for child in self.currentMove.children))):
+            # Make move child of current move and update current move (i.e. previous move is parent of current move)
+            node = self.Node(move, [], self.currentMove)
+            self.currentMove.add(node)
+            self.currentMove = node
+            # Update movetext and move dictionary and select current move in move list
+            self.updateMoveText()
+        else:
+            # Move already exists. Update current move, but do not change the move tree
+            for child in self.currentMove.children:
+                if child.move == move:
+                    self.currentMove = child
+                    self.updateMoveText()  # Make current move selected in move list
+
+        # Make the move
+        self.board.makeMove(move)
+
+        # Increment move number
+        self.moveNumber += 1
+
+        # Rotate player queue and get next player from the queue (first element)
+        self.playerQueue.rotate(-1)
+        self.setCurrentPlayer(self.playerQueue[0])
+
+        # Update FEN4 and PGN4
+        fen4 = self.getFen4()
+        self.getPgn4()
+
+        # Store FEN4 and hash in current node
+        self.currentMove.fen4 = fen4
+        self.currentMove.hash = self.board.hash
+
+        # Game over by checkmate, stalemate, threefold repetition or move count, or no result if a variation was
+        # entered after the end of the game (updates PGN4 with the result)
+        self.setResult(self.gameResult())
+
+        return True
+
+    def gameResult(self):
+        """Returns result of the current position: the other team wins if a king was captured or the player to move
+        is checkmated, a draw if the player to move is stalemated, the position occurred three times or drawPlies
+        quarter-moves were played without capture or pawn move, otherwise no result."""
+        board = self.board
+        for player in range(4):
+            if not board.pieceBB[player] & board.pieceBB[KING]:
+                return self.Team1Wins if player % 2 else self.Team2Wins  # King captured
+        color = board.turn
+        if not board.hasLegalMove(color):
+            king = board.pieceBB[color] & board.pieceBB[KING]
+            if board.opponentAttackers(king.bit_length() - 1, color, board.occupiedBB):
+                return self.Team1Wins if color % 2 else self.Team2Wins
+            return self.Draw
+        if board.repetitions() >= 3 or board.halfmoveClock >= drawPlies:
+            return self.Draw
+        return self.NoResult
+
+
+class FFA(Algorithm):
+    """A subclass of Algorithm for the 4-player chess Free-For-All (FFA) variant. Every player plays for themselves
+    and scores points: capturing a piece of a player still in the game scores its value, checkmating a player (or
+    capturing their king) scores 20 points for the checking player who moved last, and a player who is stalemated
+    scores 20 points. Checkmated and stalemated players are eliminated: their turn is skipped and their pieces stay on
+    the board as dead pieces, which can be captured for no points. The game ends when one player is left and is won
+    by the player with the most points, or in a draw by threefold repetition or the move count rule."""
+    RedWins, BlueWins, YellowWins, GreenWins = ['1-0-0-0', '0-1-0-0', '0-0-1-0', '0-0-0-1']  # Results
+    capturePoints = [0] * PAWN + [1, 3, 5, 5, 9, 20]  # By piece type
+    checkmatePoints = 20
+    stalematePoints = 20
+
+    def __init__(self):
+        super().__init__()
+        self.variant = 'Free-For-All'
+
+    @property
+    def points(self):
+        """Points of red, blue, yellow and green in the current position."""
+        return self.currentMove.points
+
+    def createBoard(self):
+        """Returns new empty board in which every other player is an opponent."""
+        board = super().createBoard()
+        board.ffa = True
+        return board
+
+    def syncState(self, node):
+        """Sets eliminated players of the board to those after the move of node."""
+        self.board.setDead(node.dead)
+
+    def gameResult(self):
+        """Returns result of the current position: if one player is left, the player with the most points wins (a
+        draw if several players have the most), a draw if the position occurred three times or drawPlies quarter-moves
+        were played without capture or pawn move, otherwise no result."""
+        board = self.board
+        if bin(board.dead).count('1') < 3:
+            if board.repetitions() >= 3 or board.halfmoveClock >= drawPlies:
+                return self.Draw
+            return self.NoResult
+        points = self.points
+        best = max(points)
+        if points.count(best) > 1:
+            return self.Draw
+        return [self.RedWins, self.BlueWins, self.YellowWins, self.GreenWins][points.index(best)]
+
+    def eliminate(self, points):
+        """Eliminates players to move who have no legal move, until a player to move has one or one player is left,
+        and adds checkmate and stalemate points to points."""
+        board = self.board
+        while bin(board.dead).count('1') < 3:
+            color = board.turn
+            if board.hasLegalMove(color):
+                return
+            king = board.pieceBB[color] & board.pieceBB[KING]
+            checkers = board.opponentAttackers(king.bit_length() - 1, color, board.occupiedBB)
+            if checkers:
+                # Checkmate points for the checking player who moved last
+                for offset in (3, 2, 1):
+                    if checkers & board.pieceBB[(color + offset) % 4]:
+                        points[(color + offset) % 4] += self.checkmatePoints
+                        break
+            else:
+                points[color] += self.stalematePoints
+            board.setDead(board.dead | 1 << color)
+
+    def makeMove(self, fromFile, fromRank, toFile, toRank):
+        """Moves piece from square (fromFile, fromRank) to square (toFile, toRank), if the move is valid, and scores
+        and eliminates players according to the FFA rules."""
+        if self.currentPlayer == self.NoPlayer or self.gameResult() != self.NoResult:
+            return False
+        # Check if square contains piece of current player
+        code = self.board.getPieceCode(fromFile, fromRank)
+        color = code & 3
+        if not code or [self.Red, self.Blue, self.Yellow, self.Green][color] != self.currentPlayer:
+            return False
+
+        # Check if move is legal
+        move = self.board.encodeMove(fromFile, fromRank, toFile, toRank)
+        if move not in self.board.generateMoves(color):
+            return False
+
+        # Check if move already exists
+        if not (self.currentMove.children and (move in (child.move for child in self.currentMove.children))):
+            node = self.Node(move, [], self.currentMove)
+            self.currentMove.add(node)
+            self.currentMove = node
+            self.updateMoveText()
+        else:
+            for child in self.currentMove.children:
+                if child.move == move:
+                    self.currentMove = child
+                    self.updateMoveText()
+
+        # Make the move and score captures of pieces of players still in the game (castling captures no piece)
+        points = list(self.currentMove.parent.points)
+        captured = move >> 22 & 63
+        self.board.makeMove(move)
+        if captured and not move >> 28 and not self.board.dead >> (captured & 3) & 1:
+            points[color] += self.capturePoints[captured >> 2]
+            if captured >> 2 == KING:
+                self.board.setDead(self.board.dead | 1 << (captured & 3))
+        self.eliminate(points)
+        self.currentMove.points = tuple(points)
+        self.currentMove.dead = self.board.dead
+
+        self.moveNumber += 1
+        self.setCurrentPlayer([self.Red, self.Blue, self.Yellow, self.Green][self.board.turn])
+
+        # Game over if one player is left
+        self.setResult(self.gameResult())
+
+        # Update FEN4 and PGN4
+        fen4 = self.getFen4()
+        self.getPgn4()
+
+        # Store FEN4 and hash in current node
+        self.currentMove.fen4 = fen4
+        self.currentMove.hash = self.board.hash
+
+        return True
@@ -0,0 +1,1252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from random import Random
+from core.evaluation import pieceSquareValues
+from core.geometry import boardMask, rookLines, bishopLines, between, beyond, line, rookAttacks, bishopAttacks, \
+    queenAttacks
+
+RED, BLUE, YELLOW, GREEN, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(10)
+
+QUEENSIDE, KINGSIDE = (0, 1)
+
+notLeftFile = 0xfffefffefffefffefffefffefffefffefffefffefffefffefffefffefffefffe
+notRightFile = 0x7fff7fff7fff7fff7fff7fff7fff7fff7fff7fff7fff7fff7fff7fff7fff7fff
+notTopRank = 0x0000ffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff
+
+# 256-bit De Bruijn sequence and corresponding index lookup
+debruijn256 = 0x818283848586878898a8b8c8d8e8f929395969799a9b9d9e9faaeb6bedeeff
+index256 = [0] * 256
+for bit in range(256):
+    index256[(((1 << bit) * debruijn256) >> 248) & 255] = bit
+
+# (file, rank) offsets of non-sliding piece attacks
+knightOffsets = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+kingOffsets = ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1))
+pawnOffsets = (((-1, 1), (1, 1)),  # red
+               ((1, 1), (1, -1)),  # blue
+               ((1, -1), (-1, -1)),  # yellow
+               ((-1, -1), (-1, 1)))  # green
+
+
+def playOrder(dead):
+    """Returns next player to move after each player, skipping eliminated players (bitmask dead, 1 << color per
+    player)."""
+    order = []
+    for color in range(4):
+        next_ = (color + 1) % 4
+        while dead >> next_ & 1 and next_ != color:
+            next_ = (next_ + 1) % 4
+        order.append(next_)
+    return order
+
+
+def offsetAttacks(square, offsets):
+    """Returns bitboard of squares at (file, rank) offsets from square (16x16 layout), restricted to the board."""
+    attacks = 0
+    for fileOffset, rankOffset in offsets:
+        file = (square & 15) + fileOffset
+        rank = (square >> 4) + rankOffset
+        if 0 <= file < 16 and 0 <= rank < 16:
+            attacks |= 1 << (rank << 4 | file)
+    return attacks & boardMask
+
+
+# Knight, king and pawn attack lookup tables, indexed by square (and color for pawns)
+knightAttacks = [offsetAttacks(square, knightOffsets) for square in range(256)]
+kingAttacks = [offsetAttacks(square, kingOffsets) for square in range(256)]
+pawnAttacks = [[offsetAttacks(square, pawnOffsets[color]) for square in range(256)] for color in range(4)]
+
+# Packed integer moves: origin | target << 8 | piece code << 16 | captured piece code << 22 | castling << 28, with
+# squares in the 16x16 layout, piece code = piece << 2 | color (0 if no piece) and castling = side + 1 (0 if no
+# castling move). Castling moves have the rook square as target
+pieceChars = [' '] * 40
+pieceCodes = {' ': 0}
+for color, colorChar in enumerate('rbyg'):
+    for piece, pieceChar in zip(range(PAWN, KING + 1), 'PNBRQK'):
+        pieceChars[piece << 2 | color] = colorChar + pieceChar
+        pieceCodes[colorChar + pieceChar] = piece << 2 | color
+
+# Index of square (16x16 layout) in the 14x14 board data (mailbox of piece codes)
+mailboxIndex = [((square >> 4) - 1) * 14 + (square & 15) - 1 for square in range(256)]
+
+# Pawn push offsets (single and double) and second rank mask (16x16 layout), from which double pushes are possible
+pawnPushes = ((16, 32, 0x00000000000000000000000000000000000000000000ffff0000000000000000),  # red
+              (1, 2, 0x0010001000100010001000100010001000100010001000100010001000100010),  # blue
+              (-16, -32, 0x0000000000000000ffff00000000000000000000000000000000000000000000),  # yellow
+              (-1, -2, 0x0800080008000800080008000800080008000800080008000800080008000800))  # green
+
+# Plies without capture or pawn move after which the game is drawn: 50 moves of each of the four players
+drawPlies = 200
+
+# Original king squares h1, a8, g14, n7 (16x16 layout), from which castling is possible
+kingSquares = (0x18, 0x81, 0xe7, 0x7e)
+
+# 64-bit Zobrist keys for (piece, color, square), player to move and castling availability. Fixed seed, such that
+# hashes are the same in every run (and process)
+zobristRandom = Random(2018)
+pieceKeys = {color + piece: [zobristRandom.getrandbits(64) for square in range(256)]
+             for color in 'rbyg' for piece in 'PNBRQK'}
+turnKeys = [zobristRandom.getrandbits(64) for color in range(4)]
+castleKeys = [[zobristRandom.getrandbits(64) for side in (QUEENSIDE, KINGSIDE)] for color in range(4)]
+deadKeys = [zobristRandom.getrandbits(64) for color in range(4)]  # Eliminated players (FFA)
+# Piece keys indexed by piece code instead of two character identifier (empty square: all zero keys)
+codeKeys = [pieceKeys[char] if char != ' ' else [0] * 256 for char in pieceChars]
+# Material and piece-square values (see core/evaluation.py) by piece code and square
+codeValues = [pieceSquareValues[char] if char != ' ' else [0] * 256 for char in pieceChars]
+
+
+class Board:
+    """The Board is the actual chess board and is the data structure shared between the View and the Algorithm. It has
+    no Qt dependency; the Qt board (gui/board.py) overrides the on...() notification methods to emit signals.
+
+    In the Teams variant the partner's pieces are friendly. In the Free-For-All variant (ffa) every other player is an
+    opponent, and eliminated players (dead) are skipped in the order of play; their pieces stay on the board, neither
+    attack nor give check, and can be captured."""
+    chesscom = False  # Read chess.com compatible FEN4, set from Algorithm.chesscom by the algorithm
+
+    def __init__(self, files, ranks, ffa=False):
+        super().__init__()
+        self.files = files
+        self.ranks = ranks
+        self.ffa = ffa
+        self.dead = 0  # Eliminated players, 1 << color per player (FFA)
+        self.nextTurn = playOrder(0)
+        self.boardData = []
+        self.pieceBB = []
+        self.emptyBB = 0
+        self.occupiedBB = 0
+        self.castle = []
+        self.undoStack = []  # Undo records (move, castling availability of moving player, hash, halfmove clock)
+        self.history = []  # Hashes of the positions before the moves made since the position was set
+        self.positionCounts = {}  # Number of times each hash occurs in history
+        self.halfmoveClock = 0  # Plies since the last capture or pawn move
+        self.turn = RED
+        self.hash = 0
+        self.psqt = [0] * 4  # Material and piece-square score per player (see core/evaluation.py)
+        self.initBoard()
+
+    def onBoardReset(self):
+        """Called when the board is reset or set to a new position."""
+        pass
+
+    def onDataChanged(self, file, rank):
+        """Called when the data of square (file, rank) has changed."""
+        pass
+
+    def onAutoRotate(self, rotation):
+        """Called after a move (rotation -1) or take-back (rotation 1), for board view auto-rotation."""
+        pass
+
+    def pieceSet(self, color, piece):
+        """Gets set of pieces of one type and color."""
+        return self.pieceBB[color] & self.pieceBB[piece]
+
+    def square(self, file, rank):
+        """Little-Endian Rank-File (LERF) mapping for 14x14 bitboard embedded in 16x16 bitboard (to fit 256 bits)."""
+        return (rank + 1) << 4 | (file + 1)
+
+    def square256(self, file, rank):
+        """Little-Endian Rank-File (LERF) mapping for 16x16 bitboard."""
+        return rank << 4 | file
+
+    def fileRank(self, square):
+        """Returns file and rank of square."""
+        return (square & 15) - 1, (square >> 4) - 1
+
+    def bitScanForward(self, bitboard):
+        """Finds the index of the least significant 1 bit (LS1B) using De Bruijn sequence multiplication."""
+        assert bitboard != 0
+        return index256[(((bitboard & -bitboard) * debruijn256) >> 248) & 255]
+
+    def getSquares(self, bitboard):
+        """Returns list of squares (file, rank) corresponding to ones in bitboard."""
+        squares = []
+        while bitboard != 0:
+            square = self.bitScanForward(bitboard)
+            squares.append(self.fileRank(square))
+            bitboard ^= 1 << square
+        return squares
+
+    # def flipVertical(self, bitboard):
+    #     """Flips bitboard vertically (parallel prefix approach, 4 delta swaps)."""
+    #     k1 = 0x0000ffff0000ffff0000ffff0000ffff0000ffff0000ffff0000ffff0000ffff
+    #     k2 = 0x00000000ffffffff00000000ffffffff00000000ffffffff00000000ffffffff
+    #     k3 = 0x0000000000000000ffffffffffffffff0000000000000000ffffffffffffffff
+    #     bitboard = ((bitboard >> 16) & k1) | ((bitboard & k1) << 16)
+    #     bitboard = ((bitboard >> 32) & k2) | ((bitboard & k2) << 32)
+    #     bitboard = ((bitboard >> 64) & k3) | ((bitboard & k3) << 64)
+    #     bitboard = (bitboard >> 128) | (bitboard << 128)
+    #     return bitboard
+
+    # def flipHorizontal(self, bitboard):
+    #     """Flips bitboard horizontally (parallel prefix approach, 4 delta swaps)."""
+    #     k1 = 0x5555555555555555555555555555555555555555555555555555555555555555
+    #     k2 = 0x3333333333333333333333333333333333333333333333333333333333333333
+    #     k3 = 0x0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f
+    #     k4 = 0x00ff00ff00ff00ff00ff00ff00ff00ff00ff00ff00ff00ff00ff00ff00ff00ff
+    #     bitboard = ((bitboard >> 1) & k1) | ((bitboard & k1) << 1)
+    #     bitboard = ((bitboard >> 2) & k2) | ((bitboard & k2) << 2)
+    #     bitboard = ((bitboard >> 4) & k3) | ((bitboard & k3) << 4)
+    #     bitboard = ((bitboard >> 8) & k4) | ((bitboard & k4) << 8)
+    #     return bitboard
+
+    # def flipDiagonal(self, bitboard):
+    #     """Flips bitboard about diagonal from lower left to upper right (parallel prefix approach, 4 delta swaps)."""
+    #     k1 = 0x5555000055550000555500005555000055550000555500005555000055550000
+    #     k2 = 0x3333333300000000333333330000000033333333000000003333333300000000
+    #     k3 = 0x0f0f0f0f0f0f0f0f00000000000000000f0f0f0f0f0f0f0f0000000000000000
+    #     k4 = 0x00ff00ff00ff00ff00ff00ff00ff00ff00000000000000000000000000000000
+    #     t = k4 & (bitboard ^ (bitboard << 120))
+    #     bitboard ^= t ^ (t >> 120)
+    #     t = k3 & (bitboard ^ (bitboard << 60))
+    #     bitboard ^= t ^ (t >> 60)
+    #     t = k2 & (bitboard ^ (bitboard << 30))
+    #     bitboard ^= t ^ (t >> 30)
+    #     t = k1 & (bitboard ^ (bitboard << 15))
+    #     bitboard ^= t ^ (t >> 15)
+    #     return bitboard
+
+    # def flipAntiDiagonal(self, bitboard):
+    #     """Flips bitboard about diagonal from upper left to lower right (parallel prefix approach, 4 delta swaps)."""
+    #     k1 = 0xaaaa0000aaaa0000aaaa0000aaaa0000aaaa0000aaaa0000aaaa0000aaaa0000
+    #     k2 = 0xcccccccc00000000cccccccc00000000cccccccc00000000cccccccc00000000
+    #     k3 = 0xf0f0f0f0f0f0f0f00000000000000000f0f0f0f0f0f0f0f00000000000000000
+    #     k4 = 0xff00ff00ff00ff00ff00ff00ff00ff0000ff00ff00ff00ff00ff00ff00ff00ff
+    #     t = bitboard ^ (bitboard << 136)
+    #     bitboard ^= k4 & (t ^ (bitboard >> 136))
+    #     t = k3 & (bitboard ^ (bitboard << 68))
+    #     bitboard ^= t ^ (t >> 68)
+    #     t = k2 & (bitboard ^ (bitboard << 34))
+    #     bitboard ^= t ^ (t >> 34)
+    #     t = k1 & (bitboard ^ (bitboard << 17))
+    #     bitboard ^= t ^ (t >> 17)
+    #     return bitboard
+
+    # def rotate(self, bitboard, degrees):
+    #     """Rotates bitboard +90 (clockwise), -90 (counterclockwise) or 180 degrees using two flips."""
+    #     if degrees == 90:
+    #         return self.flipVertical(self.flipDiagonal(bitboard))
+    #     elif degrees == -90:
+    #         return self.flipVertical(self.flipAntiDiagonal(bitboard))
+    #     elif degrees == 180:
+    #         return self.flipHorizontal(self.flipVertical(bitboard))
+    #     else:
+    #         pass
+
+    def shiftN(self, bitboard, n=1):
+        """Shifts bitboard north by n squares."""
+        for _ in range(n):
+            bitboard = (bitboard << 16) & notTopRank
+        return bitboard
+
+    def shiftNE(self, bitboard, n=1):
+        """Shifts bitboard north-east by n squares."""
+        for _ in range(n):
+            bitboard = (bitboard << 17) & notLeftFile
+        return bitboard
+
+    def shiftE(self, bitboard, n=1):
+        """Shifts bitboard east by n squares."""
+        for _ in range(n):
+            bitboard = (bitboard << 1) & notLeftFile
+        return bitboard
+
+    def shiftSE(self, bitboard, n=1):
+        """Shifts bitboard south-east by n squares."""
+        for _ in range(n):
+            bitboard = (bitboard >> 15) & notRightFile
+        return bitboard
+
+    def shiftS(self, bitboard, n=1):
+        """Shifts bitboard south by n squares."""
+        for _ in range(n):
+            bitboard >>= 16  # no wrap mask needed, as bits just fall off
+        return bitboard
+
+    def shiftSW(self, bitboard, n=1):
+        """Shifts bitboard south-west by n squares."""
+        for _ in range(n):
+            bitboard = (bitboard >> 17) & notRightFile
+        return bitboard
+
+    def shiftW(self, bitboard, n=1):
+        """Shifts bitboard west by n squares."""
+        for _ in range(n):
+            bitboard = (bitboard >> 1) & notRightFile
+        return bitboard
+
+    def shiftNW(self, bitboard, n=1):
+        """Shifts bitboard north-west by n squares."""
+        for _ in range(n):
+            bitboard = (bitboard << 15) & notLeftFile
+        return bitboard
+
+    def rankMask(self, origin):
+        """Returns rank passing through origin, excluding origin itself."""
+        return (0xffff << (origin & 240)) ^ (1 << origin)  # excluding piece square
+
+    def fileMask(self, origin):
+        """Returns file passing through origin, excluding origin itself."""
+        return (0x1000100010001000100010001000100010001000100010001000100010001 << (origin & 15)) ^ (1 << origin)
+
+    def diagonalMask(self, origin):
+        """Returns diagonal passing through origin, excluding origin itself."""
+        mainDiagonal = 0x8000400020001000080004000200010000800040002000100008000400020001
+        diagonal = 16 * (origin & 15) - (origin & 240)
+        north = -diagonal & (diagonal >> 63)
+        south = diagonal & (-diagonal >> 63)
+        return ((mainDiagonal >> south) << north) ^ (1 << origin)
+
+    def antiDiagonalMask(self, origin):
+        """Returns anti-diagonal passing through origin, excluding origin itself."""
+        mainDiagonal = 0x1000200040008001000200040008001000200040008001000200040008000
+        diagonal = 240 - 16 * (origin & 15) - (origin & 240)
+        north = -diagonal & (diagonal >> 63)
+        south = diagonal & (-diagonal >> 63)
+        return ((mainDiagonal >> south) << north) ^ (1 << origin)
+
+    def rayBeyond(self, origin, square):
+        """Returns part of ray from origin beyond blocker square."""
+        return beyond[origin << 8 | square]
+
+    def rayBetween(self, origin, square):
+        """Returns part of ray from origin to square."""
+        return between[origin << 8 | square]
+
+    def maskBlockedSquares(self, moves, origin, occupied=None):
+        """Masks blocked parts of sliding piece attack sets, one blocker at a time."""
+        if not occupied:
+            occupied = self.occupiedBB
+        blockers = moves & occupied
+        origin <<= 8
+        while blockers != 0:
+            blocker = blockers & -blockers
+            moves &= ~beyond[origin | blocker.bit_length() - 1]
+            blockers ^= blocker
+        return moves
+
+    def maskBlockedCastlingMoves(self, moves, origin, color):
+        """Masks castling moves if there are pieces between the king and rook."""
+        castlingMoves = moves
+        while castlingMoves != 0:
+            rookSquare = self.bitScanForward(castlingMoves)
+            if between[origin << 8 | rookSquare] & self.pieceBB[color]:
+                moves ^= 1 << rookSquare
+            castlingMoves &= castlingMoves - 1
+        return moves
+
+    def legalMoves(self, piece, origin, color):
+        """Pseudo-legal moves for piece type."""
+        if color in (RED, YELLOW):
+            friendly = self.pieceBB[RED] | self.pieceBB[YELLOW]
+        else:
+            friendly = self.pieceBB[BLUE] | self.pieceBB[GREEN]
+        if (1 << origin) & self.absolutePins(color):
+            pinMask = self.kingRay(origin, color)
+        else:
+            pinMask = -1
+        if piece == PAWN:
+            return self.pawnMoves(origin, color) & ~friendly & pinMask
+        elif piece == KNIGHT:
+            return self.knightMoves(origin) & ~friendly & pinMask
+        elif piece == BISHOP:
+            return bishopAttacks(origin, self.occupiedBB) & ~friendly & pinMask
+        elif piece == ROOK:
+            return rookAttacks(origin, self.occupiedBB) & ~friendly & pinMask
+        elif piece == QUEEN:
+            return queenAttacks(origin, self.occupiedBB) & ~friendly & pinMask
+        elif piece == KING:
+            if self.kingInCheck(color)[0]:
+                castlingMoves = 0
+            else:
+                castlingMoves = self.castle[color][KINGSIDE] | self.castle[color][QUEENSIDE]
+            return (self.kingMoves(origin) | self.maskBlockedCastlingMoves(castlingMoves, origin, color)) & \
+                   (~friendly | castlingMoves)
+        else:
+            return -1
+
+    def pawnMoves(self, origin, color, attacksOnly=False):
+        """Pseudo-legal pawn moves."""
+        rank4 = 0x00000000000000000000000000000000000000000000ffff0000000000000000
+        rank11 = 0x0000000000000000ffff00000000000000000000000000000000000000000000
+        fileD = 0x0010001000100010001000100010001000100010001000100010001000100010
+        fileK = 0x0800080008000800080008000800080008000800080008000800080008000800
+        if not 0 <= color <= 3:
+            return 0
+        attacks = pawnAttacks[color][origin]
+        if attacksOnly:  # only return attacked squares
+            return attacks
+        origin = 1 << origin
+        if color == RED:
+            singlePush = self.shiftN(origin) & self.emptyBB
+            doublePush = self.shiftN(singlePush) & self.emptyBB & rank4
+            captures = attacks & (self.pieceBB[BLUE] | self.pieceBB[GREEN])
+        elif color == BLUE:
+            singlePush = self.shiftE(origin) & self.emptyBB
+            doublePush = self.shiftE(singlePush) & self.emptyBB & fileD
+            captures = attacks & (self.pieceBB[RED] | self.pieceBB[YELLOW])
+        elif color == YELLOW:
+            singlePush = self.shiftS(origin) & self.emptyBB
+            doublePush = self.shiftS(singlePush) & self.emptyBB & rank11
+            captures = attacks & (self.pieceBB[BLUE] | self.pieceBB[GREEN])
+        else:
+            singlePush = self.shiftW(origin) & self.emptyBB
+            doublePush = self.shiftW(singlePush) & self.emptyBB & fileK
+            captures = attacks & (self.pieceBB[RED] | self.pieceBB[YELLOW])
+        return (singlePush | doublePush | captures) & boardMask
+
+    def knightMoves(self, origin):
+        """Pseudo-legal knight moves."""
+        return knightAttacks[origin]
+
+    def bishopMoves(self, origin):
+        """Pseudo-legal bishop moves."""
+        return bishopLines[origin]
+
+    def rookMoves(self, origin):
+        """Pseudo-legal rook moves."""
+        return rookLines[origin]
+
+    def queenMoves(self, origin):
+        """Pseudo-legal queen moves (= union of bishop and rook)."""
+        return bishopLines[origin] | rookLines[origin]
+
+    def kingMoves(self, origin):
+        """Pseudo-legal king moves."""
+        return kingAttacks[origin]
+
+    def xrayRookAttacks(self, blockers, origin):
+        """Returns X-ray rook attacks through blockers."""
+        attacks = rookAttacks(origin, self.occupiedBB)
+        blockers &= attacks
+        return attacks ^ rookAttacks(origin, self.occupiedBB ^ blockers)
+
+    def xrayBishopAttacks(self, blockers, origin):
+        """Returns X-ray bishop attacks through blockers."""
+        attacks = bishopAttacks(origin, self.occupiedBB)
+        blockers &= attacks
+        return attacks ^ bishopAttacks(origin, self.occupiedBB ^ blockers)
+
+    def absolutePins(self, color):
+        """Returns absolutely (partially) pinned pieces, none if the king has been captured."""
+        pinned = 0
+        ownPieces = self.pieceBB[color]
+        king = self.pieceSet(color, KING)
+        if not king:
+            return pinned
+        kingSquare = self.bitScanForward(king)
+        if color in (RED, YELLOW):
+            opponentRQ = self.pieceSet(BLUE, ROOK) | self.pieceSet(BLUE, QUEEN) | \
+                         self.pieceSet(GREEN, ROOK) | self.pieceSet(GREEN, QUEEN)
+            opponentBQ = self.pieceSet(BLUE, BISHOP) | self.pieceSet(BLUE, QUEEN) | \
+                         self.pieceSet(GREEN, BISHOP) | self.pieceSet(GREEN, QUEEN)
+        else:
+            opponentRQ = self.pieceSet(RED, ROOK) | self.pieceSet(RED, QUEEN) | \
+                         self.pieceSet(YELLOW, ROOK) | self.pieceSet(YELLOW, QUEEN)
+            opponentBQ = self.pieceSet(RED, BISHOP) | self.pieceSet(RED, QUEEN) | \
+                         self.pieceSet(YELLOW, BISHOP) | self.pieceSet(YELLOW, QUEEN)
+        pinner = self.xrayRookAttacks(ownPieces, kingSquare) & opponentRQ
+        pinner |= self.xrayBishopAttacks(ownPieces, kingSquare) & opponentBQ
+        while pinner:
+            square = self.bitScanForward(pinner)
+            pinned |= between[square << 8 | kingSquare] & ownPieces
+            pinner &= pinner - 1
+        return pinned
+
+    # def aligned(self, origin, target, kingSquare):
+    #     """Checks if partially pinned piece is moved along ray from or towards king."""
+    #     alongRay = self.rayBetween(origin, kingSquare) & (1 << target)
+    #     alongRay |= self.rayBetween(target, kingSquare) & (1 << origin)
+    #     return alongRay
+
+    def kingRay(self, square, color):
+        """Returns ray from king that contains square, all squares if the king has been captured."""
+        king = self.pieceSet(color, KING)
+        if not king:
+            return -1
+        kingSquare = self.bitScanForward(king) << 8
+        return between[kingSquare | square] | beyond[kingSquare | square]
+
+    def attackers(self, square, occupied=None):
+        """Returns the pieces of all four players that attack square, given occupied squares (default: all pieces).
+        Pieces not in occupied are ignored, such that removing pieces from occupied reveals x-ray attackers behind
+        them."""
+        pieceBB = self.pieceBB
+        if occupied is None:
+            occupied = self.occupiedBB
+        # Pawns of a player attack square from where pawns of the partner (opposite direction) would attack
+        return ((pawnAttacks[YELLOW][square] & pieceBB[RED] | pawnAttacks[RED][square] & pieceBB[YELLOW] |
+                 pawnAttacks[GREEN][square] & pieceBB[BLUE] | pawnAttacks[BLUE][square] & pieceBB[GREEN]) &
+                pieceBB[PAWN] |
+                knightAttacks[square] & pieceBB[KNIGHT] |
+                kingAttacks[square] & pieceBB[KING] |
+                bishopAttacks(square, occupied) & (pieceBB[BISHOP] | pieceBB[QUEEN]) |
+                rookAttacks(square, occupied) & (pieceBB[ROOK] | pieceBB[QUEEN])) & occupied
+
+    def attacked(self, square, color):
+        """Checks if a square is attacked by a player."""
+        if color == RED:
+            opposite = YELLOW
+        elif color == YELLOW:
+            opposite = RED
+        elif color == BLUE:
+            opposite = GREEN
+        elif color == GREEN:
+            opposite = BLUE
+        else:
+            return False
+        if pawnAttacks[opposite][square] & self.pieceSet(color, PAWN):
+            return True
+        if knightAttacks[square] & self.pieceSet(color, KNIGHT):
+            return True
+        if kingAttacks[square] & self.pieceSet(color, KING):
+            return True
+        if bishopAttacks(square, self.occupiedBB) & (self.pieceSet(color, BISHOP) | self.pieceSet(color, QUEEN)):
+            return True
+        if rookAttacks(square, self.occupiedBB) & (self.pieceSet(color, ROOK) | self.pieceSet(color, QUEEN)):
+            return True
+        return False
+
+    def kingInCheck(self, color):
+        """Checks if a player's king is in check. Returns (inCheck, (file, rank) of the king), or (False, None) if the
+        king has been captured."""
+        king = self.pieceSet(color, KING)
+        if not king:
+            return False, None
+        kingSquare = self.bitScanForward(king)
+        return bool(self.opponentAttackers(kingSquare, color, self.occupiedBB)), self.fileRank(kingSquare)
+
+    def opponentAttackers(self, square, color, occupied):
+        """Returns the pieces of both opponents of color (FFA: all players not eliminated other than color) that
+        attack square, given occupied squares."""
+        pieceBB = self.pieceBB
+        if self.ffa:
+            opponents = pawns = 0
+            for opponent in range(4):
+                if opponent != color and not self.dead >> opponent & 1:
+                    opponents |= pieceBB[opponent]
+                    pawns |= pawnAttacks[(opponent + 2) % 4][square] & pieceBB[opponent]
+            return (pawns & pieceBB[PAWN] |
+                    knightAttacks[square] & pieceBB[KNIGHT] & opponents |
+                    kingAttacks[square] & pieceBB[KING] & opponents |
+                    bishopAttacks(square, occupied) & (pieceBB[BISHOP] | pieceBB[QUEEN]) & opponents |
+                    rookAttacks(square, occupied) & (pieceBB[ROOK] | pieceBB[QUEEN]) & opponents)
+        left, right = (color + 1) % 4, (color + 3) % 4
+        opponents = pieceBB[left] | pieceBB[right]
+        # Pawns of one opponent attack square from where pawns of the other opponent (opposite direction) would attack
+        return ((pawnAttacks[right][square] & pieceBB[left] | pawnAttacks[left][square] & pieceBB[right]) &
+                pieceBB[PAWN] |
+                knightAttacks[square] & pieceBB[KNIGHT] & opponents |
+                kingAttacks[square] & pieceBB[KING] & opponents |
+                bishopAttacks(square, occupied) & (pieceBB[BISHOP] | pieceBB[QUEEN]) & opponents |
+                rookAttacks(square, occupied) & (pieceBB[ROOK] | pieceBB[QUEEN]) & opponents)
+
+    def checksAndPins(self, color, kingSquare, attackers):
+        """Returns (checkers, evasions, pinned, pinLines) of player color with king on kingSquare, given the opponent
+        pieces that can give check or pin: the pieces giving check, the mask of target squares of non-king moves (all
+        squares if not in check, none if in double check), the pinned pieces and for each the line it may move on."""
+        pieceBB = self.pieceBB
+        own = pieceBB[color]
+        # Check evasions: capture or block a single checker, only king moves if double check
+        checkers = self.opponentAttackers(kingSquare, color, self.occupiedBB)
+        if not checkers:
+            evasions = -1
+        elif checkers & (checkers - 1):
+            evasions = 0
+        else:
+            evasions = checkers | between[kingSquare << 8 | checkers.bit_length() - 1]
+        # Absolute pins: pinned pieces may only move along the line through king and pinner
+        pinned = 0
+        pinLines = {}
+        if evasions:
+            rooksQueens = (pieceBB[ROOK] | pieceBB[QUEEN]) & attackers
+            bishopsQueens = (pieceBB[BISHOP] | pieceBB[QUEEN]) & attackers
+            pinners = self.xrayRookAttacks(own, kingSquare) & rooksQueens | \
+                self.xrayBishopAttacks(own, kingSquare) & bishopsQueens
+            while pinners:
+                pinner = pinners & -pinners
+                pinners ^= pinner
+                piece = between[kingSquare << 8 | pinner.bit_length() - 1] & own
+                pinned |= piece
+                pinLines[piece] = line[kingSquare << 8 | pinner.bit_length() - 1]
+        return checkers, evasions, pinned, pinLines
+
+    def generateMoves(self, color, captures=True, quiets=True):
+        """Returns all legal moves of player color as list of packed integer moves (see encodeMove()). Pins, checkers
+        and the check evasion mask are computed once for the whole position. Only captures or only quiet moves
+        (including castling) are generated if quiets or captures is False, such that a search can generate quiet
+        moves only when needed."""
+        moves = []
+        boardData = self.boardData
+        pieceBB = self.pieceBB
+        occupied = self.occupiedBB
+        own = pieceBB[color]
+        friendly = own if self.ffa else own | pieceBB[(color + 2) % 4]
+        opponents = occupied & ~friendly
+        attackers = opponents  # Pieces that can give check or pin, i.e. not of eliminated players
+        if self.dead:
+            for dead in range(4):
+                if self.dead >> dead & 1:
+                    attackers &= ~pieceBB[dead]
+        king = own & pieceBB[KING]
+        if not king:
+            return moves
+        kingSquare = king.bit_length() - 1
+        checkers, evasions, pinned, pinLines = self.checksAndPins(color, kingSquare, attackers)
+        # Non-king moves
+        targets = ~friendly & evasions
+        stage = (opponents if captures else 0) | (~occupied if quiets else 0)
+        targets &= stage
+        empty = ~occupied
+        pieces = own & ~king & pieceBB[PAWN]
+        pushes, doublePushes, rank = pawnPushes[color]
+        while pieces:
+            piece = pieces & -pieces
+            pieces ^= piece
+            origin = piece.bit_length() - 1
+            attacks = pawnAttacks[color][origin] & opponents
+            push = 1 << origin + pushes & empty & boardMask
+            if push:
+                attacks |= push | (1 << origin + doublePushes) & empty & rank
+            attacks &= targets
+            if piece & pinned:
+                attacks &= pinLines[piece]
+            move = origin | (PAWN << 2 | color) << 16
+            while attacks:
+                target = attacks & -attacks
+                attacks ^= target
+                target = target.bit_length() - 1
+                moves.append(move | target << 8 | boardData[mailboxIndex[target]] << 22)
+        for pieceType, attackFunction in ((KNIGHT, None), (BISHOP, bishopAttacks), (ROOK, rookAttacks),
+                                          (QUEEN, queenAttacks)):
+            pieces = own & pieceBB[pieceType]
+            while pieces:
+                piece = pieces & -pieces
+                pieces ^= piece
+                origin = piece.bit_length() - 1
+                if attackFunction:
+                    attacks = attackFunction(origin, occupied) & targets
+                else:
+                    attacks = knightAttacks[origin] & targets
+                if piece & pinned:
+                    attacks &= pinLines[piece]
+                move = origin | (pieceType << 2 | color) << 16
+                while attacks:
+                    target = attacks & -attacks
+                    attacks ^= target
+                    target = target.bit_length() - 1
+                    moves.append(move | target << 8 | boardData[mailboxIndex[target]] << 22)
+        # King moves, not onto squares attacked when the king has left its square
+        attacks = kingAttacks[kingSquare] & ~friendly & stage
+        occupiedWithoutKing = occupied ^ king
+        move = kingSquare | (KING << 2 | color) << 16
+        while attacks:
+            target = attacks & -attacks
+            attacks ^= target
+            target = target.bit_length() - 1
+            if not self.opponentAttackers(target, color, occupiedWithoutKing):
+                moves.append(move | target << 8 | boardData[mailboxIndex[target]] << 22)
+        # Castling: king not in check, no pieces between king and rook, king does not cross or land on attacked square
+        if quiets and not checkers:
+            for side in (KINGSIDE, QUEENSIDE):
+                rook = self.castle[color][side] & own & pieceBB[ROOK]
+                if not rook:
+                    continue
+                rookSquare = rook.bit_length() - 1
+                if between[kingSquare << 8 | rookSquare] & occupied:
+                    continue
+                step = 16 if not (rookSquare - kingSquare) % 16 else 1
+                if rookSquare < kingSquare:
+                    step = -step
+                if self.opponentAttackers(kingSquare + step, color, occupied) or \
+                        self.opponentAttackers(kingSquare + 2 * step, color, occupied):
+                    continue
+                moves.append(move | rookSquare << 8 | (ROOK << 2 | color) << 22 | (side + 1) << 28)
+        return moves
+
+    def hasLegalMove(self, color):
+        """Returns whether player color has a legal move, stopping at the first one found: king moves first, then
+        pieces by whether any target square is left after the check evasion and pin masks, without generating the
+        moves. Castling need not be tried: if it is legal, so is the king's step towards the rook."""
+        pieceBB = self.pieceBB
+        occupied = self.occupiedBB
+        own = pieceBB[color]
+        friendly = own if self.ffa else own | pieceBB[(color + 2) % 4]
+        king = own & pieceBB[KING]
+        if not king:
+            return False
+        kingSquare = king.bit_length() - 1
+        attacks = kingAttacks[kingSquare] & ~friendly
+        occupiedWithoutKing = occupied ^ king
+        while attacks:
+            target = attacks & -attacks
+            attacks ^= target
+            if not self.opponentAttackers(target.bit_length() - 1, color, occupiedWithoutKing):
+                return True
+        attackers = occupied & ~friendly
+        if self.dead:
+            for dead in range(4):
+                if self.dead >> dead & 1:
+                    attackers &= ~pieceBB[dead]
+        checkers, evasions, pinned, pinLines = self.checksAndPins(color, kingSquare, attackers)
+        if not evasions:
+            return False  # Double check and no king move
+        targets = ~friendly & evasions
+        opponents = occupied & ~friendly
+        empty = ~occupied
+        pushes, doublePushes, rank = pawnPushes[color]
+        pieces = own & pieceBB[PAWN]
+        while pieces:
+            piece = pieces & -pieces
+            pieces ^= piece
+            origin = piece.bit_length() - 1
+            attacks = pawnAttacks[color][origin] & opponents
+            push = 1 << origin + pushes & empty & boardMask
+            if push:
+                attacks |= push | (1 << origin + doublePushes) & empty & rank
+            attacks &= targets
+            if piece & pinned:
+                attacks &= pinLines[piece]
+            if attacks:
+                return True
+        for pieceType, attackFunction in ((KNIGHT, None), (BISHOP, bishopAttacks), (ROOK, rookAttacks),
+                                          (QUEEN, queenAttacks)):
+            pieces = own & pieceBB[pieceType]
+            while pieces:
+                piece = pieces & -pieces
+                pieces ^= piece
+                origin = piece.bit_length() - 1
+                if attackFunction:
+                    attacks = attackFunction(origin, occupied) & targets
+                else:
+                    attacks = knightAttacks[origin] & targets
+                if piece & pinned:
+                    attacks &= pinLines[piece]
+                if attacks:
+                    return True
+        return False
+
+    def printBB(self, bitboard):
+        """Prints 14x14 bitboard in easily readable format (for debugging)."""
+        bitstring = ''
+        for rank in reversed(range(14)):
+            for file in range(14):
+                if not ((file < 3 and rank < 3) or (file < 3 and rank > 10) or
+                        (file > 10 and rank < 3) or (file > 10 and rank > 10)):
+                    bitstring += '1 ' if (bitboard & (1 << self.square(file, rank))) else '. '
+                else:
+                    bitstring += '  '
+            bitstring += '\n'
+        print(bitstring)
+
+    def printBB256(self, bitboard):
+        """Prints full 256-bit (16x16) bitboard in easily readable format (for debugging)."""
+        bitstring = ''
+        for rank in reversed(range(16)):
+            for file in range(16):
+                bitstring += '1 ' if (bitboard & (1 << self.square256(file, rank))) else '. '
+            bitstring += '\n'
+        print(bitstring)
+
+    def getPieceColor(self, char):
+        """Returns piece type and color from two character identifier."""
+        code = pieceCodes[char]
+        return code >> 2, code & 3
+
+    def initBoard(self):
+        """Initializes board with empty squares."""
+        self.boardData = bytearray(self.files * self.ranks)  # Piece code per square, 0 if empty
+        self.pieceBB = [0] * 10
+        self.emptyBB = 0
+        self.occupiedBB = 0
+        self.castle = [[1 << self.square(3, 0), 1 << self.square(10, 0)],
+                       [1 << self.square(0, 3), 1 << self.square(0, 10)],
+                       [1 << self.square(10, 13), 1 << self.square(3, 13)],
+                       [1 << self.square(13, 10), 1 << self.square(13, 3)]]
+        self.undoStack = []
+        self.history = []
+        self.positionCounts = {}
+        self.halfmoveClock = 0
+        self.turn = RED
+        self.hash = turnKeys[self.turn] ^ self.castlingHash()
+        self.psqt = [0] * 4
+        self.dead = 0
+        self.nextTurn = playOrder(0)
+        self.onBoardReset()
+
+    def snapshot(self):
+        """Returns position as immutable tuple: the 10 piece bitboards, castling availability (queenside, kingside for
+        each player), player to move, hash, board data, variant (ffa), eliminated players, halfmove clock, the hashes of
+        the positions since the last capture or pawn move (which alone can repeat) and the material and piece-square
+        score per player."""
+        castle = self.castle
+        return (*self.pieceBB, *castle[RED], *castle[BLUE], *castle[YELLOW], *castle[GREEN], self.turn, self.hash,
+                bytes(self.boardData), self.ffa, self.dead, self.halfmoveClock,
+                tuple(self.history[max(0, len(self.history) - self.halfmoveClock):]), tuple(self.psqt))
+
+    def restore(self, state):
+        """Sets position to snapshot state (see snapshot()). The undo stack is cleared; the position history is that
+        of the snapshot."""
+        self.pieceBB = list(state[:10])
+        self.castle = [list(state[10:12]), list(state[12:14]), list(state[14:16]), list(state[16:18])]
+        self.turn, self.hash = state[18:20]
+        self.boardData = bytearray(state[20])
+        self.ffa, self.dead, self.halfmoveClock = state[21:24]
+        self.history = list(state[24])
+        self.psqt = list(state[25])
+        self.positionCounts = {}
+        for hash_ in self.history:
+            self.positionCounts[hash_] = self.positionCounts.get(hash_, 0) + 1
+        self.nextTurn = playOrder(self.dead)
+        self.occupiedBB = self.pieceBB[RED] | self.pieceBB[BLUE] | self.pieceBB[YELLOW] | self.pieceBB[GREEN]
+        self.emptyBB = ~self.occupiedBB
+        self.undoStack = []
+        self.onBoardReset()
+
+    def computePsqt(self):
+        """Returns material and piece-square score per player computed from the board data (see core/evaluation.py).
+        Moves update the scores incrementally."""
+        psqt = [0] * 4
+        for rank in range(self.ranks):
+            for file in range(self.files):
+                code = self.boardData[file + rank * self.files]
+                if code:
+                    psqt[code & 3] += codeValues[code][self.square(file, rank)]
+        return psqt
+
+    def copy(self):
+        """Returns copy of the position as core board, without notifications (also when copying the Qt board) and with
+        an empty undo stack, but with the position history, such that repetitions of earlier positions are detected."""
+        board = Board.__new__(Board)
+        board.files = self.files
+        board.ranks = self.ranks
+        board.boardData = self.boardData[:]
+        board.pieceBB = self.pieceBB[:]
+        board.emptyBB = self.emptyBB
+        board.occupiedBB = self.occupiedBB
+        board.castle = [sides[:] for sides in self.castle]
+        board.undoStack = []
+        board.history = self.history[:]
+        board.positionCounts = self.positionCounts.copy()
+        board.halfmoveClock = self.halfmoveClock
+        board.turn = self.turn
+        board.hash = self.hash
+        board.psqt = self.psqt[:]
+        board.ffa = self.ffa
+        board.dead = self.dead
+        board.nextTurn = self.nextTurn[:]
+        return board
+
+    def getData(self, file, rank):
+        """Gets board data from square (file, rank) as two character identifier, or ' ' if empty."""
+        return pieceChars[self.boardData[file + rank * self.files]]
+
+    def getPieceCode(self, file, rank):
+        """Gets piece code (piece << 2 | color) from square (file, rank), or 0 if empty."""
+        return self.boardData[file + rank * self.files]
+
+    def setData(self, file, rank, data):
+        """Sets board data at square (file, rank) to data (two character identifier, or ' ' if empty)."""
+        index = file + rank * self.files
+        code = pieceCodes[data]
+        if self.boardData[index] == code:
+            return
+        # Update Zobrist hash: remove old piece from square and add new piece (keys of empty square are zero)
+        square = (rank + 1) << 4 | (file + 1)
+        old = self.boardData[index]
+        self.hash ^= codeKeys[old][square] ^ codeKeys[code][square]
+        self.psqt[old & 3] -= codeValues[old][square]
+        self.psqt[code & 3] += codeValues[code][square]
+        self.boardData[index] = code
+        self.onDataChanged(file, rank)
+
+    def castlingHash(self):
+        """Returns Zobrist hash of castling availability (XOR of keys of available castling moves)."""
+        hash_ = 0
+        for color in (RED, BLUE, YELLOW, GREEN):
+            for side in (QUEENSIDE, KINGSIDE):
+                if self.castle[color][side]:
+                    hash_ ^= castleKeys[color][side]
+        return hash_
+
+    def setTurn(self, color):
+        """Sets player to move and updates Zobrist hash."""
+        self.hash ^= turnKeys[self.turn] ^ turnKeys[color]
+        self.turn = color
+
+    def setDead(self, dead):
+        """Sets eliminated players (FFA) to bitmask dead (1 << color per player) and updates Zobrist hash and order of
+        play. If the player to move is eliminated, the next player is to move. Not undone by unmakeMove()."""
+        for color in range(4):
+            if (self.dead ^ dead) >> color & 1:
+                self.hash ^= deadKeys[color]
+        self.dead = dead
+        self.nextTurn = playOrder(dead)
+        if dead >> self.turn & 1:
+            self.setTurn(self.nextTurn[self.turn])
+
+    def repetitions(self):
+        """Returns number of times the current position occurred since the position was set, including now. The
+        position history is counted by hash, so this takes constant time."""
+        return self.positionCounts.get(self.hash, 0) + 1
+
+    def encodeMove(self, fromFile, fromRank, toFile, toRank):
+        """Returns packed integer move of the piece on square (fromFile, fromRank) to square (toFile, toRank) in the
+        current position. A king moving onto a rook of its own color is a castling move."""
+        code = self.getPieceCode(fromFile, fromRank)
+        captured = self.getPieceCode(toFile, toRank)
+        origin = self.square(fromFile, fromRank)
+        target = self.square(toFile, toRank)
+        move = origin | target << 8 | code << 16 | captured << 22
+        if code >> 2 == KING and captured == ROOK << 2 | code & 3:
+            # Kingside rook is three squares away from the king, queenside rook four
+            side = KINGSIDE if abs(target - origin) in (3, 48) else QUEENSIDE
+            move |= (side + 1) << 28
+        return move
+
+    def castlingSquares(self, origin, target):
+        """Returns squares the king and rook land on when castling with king on origin and rook on target: the king
+        moves two squares towards the rook and the rook to the square the king crossed."""
+        step = 1 if (target - origin) % 16 else 16
+        if target < origin:
+            step = -step
+        return origin + 2 * step, origin + step
+
+    def makeMove(self, move):
+        """Makes packed integer move, pushes an undo record (move, castling availability of the moving player and of
+        the player whose rook is captured (None if no rook is captured), hash, halfmove clock) onto the undo stack and the hash of the position before the move onto the position history.
+        Board data, Zobrist hash and piece-square scores are updated directly rather than through setData()."""
+        origin = move & 255
+        target = move >> 8 & 255
+        code = move >> 16 & 63
+        captured = move >> 22 & 63
+        castling = move >> 28
+        piece, color = code >> 2, code & 3
+        pieceBB = self.pieceBB
+        boardData = self.boardData
+        rights = self.castle[color]
+        victimRights = self.castle[captured & 3][:] if captured >> 2 == ROOK and not castling else None
+        self.undoStack.append((move, rights[:], victimRights, self.hash, self.halfmoveClock))
+        self.history.append(self.hash)
+        self.positionCounts[self.hash] = self.positionCounts.get(self.hash, 0) + 1
+        # Captures and pawn moves reset the halfmove clock (castling captures no piece)
+        self.halfmoveClock = 0 if captured and not castling or piece == PAWN else self.halfmoveClock + 1
+        nextTurn = self.nextTurn[color]
+        hash_ = self.hash ^ turnKeys[color] ^ turnKeys[nextTurn]
+        if castling:
+            kingTarget, rookTarget = self.castlingSquares(origin, target)
+            boardData[mailboxIndex[origin]] = 0
+            boardData[mailboxIndex[target]] = 0
+            boardData[mailboxIndex[kingTarget]] = code
+            boardData[mailboxIndex[rookTarget]] = captured
+            hash_ ^= codeKeys[code][origin] ^ codeKeys[code][kingTarget] ^ \
+                codeKeys[captured][target] ^ codeKeys[captured][rookTarget]
+            self.psqt[color] += codeValues[code][kingTarget] - codeValues[code][origin] + \
+                codeValues[captured][rookTarget] - codeValues[captured][target]
+            kingBB = 1 << origin | 1 << kingTarget
+            rookBB = 1 << target | 1 << rookTarget
+            pieceBB[color] ^= kingBB ^ rookBB
+            pieceBB[KING] ^= kingBB
+            pieceBB[ROOK] ^= rookBB
+            self.occupiedBB ^= kingBB ^ rookBB
+            changed = (origin, target, kingTarget, rookTarget)
+        else:
+            boardData[mailboxIndex[origin]] = 0
+            boardData[mailboxIndex[target]] = code
+            hash_ ^= codeKeys[code][origin] ^ codeKeys[code][target]
+            values = codeValues[code]
+            self.psqt[color] += values[target] - values[origin]
+            fromToBB = 1 << origin | 1 << target
+            pieceBB[color] ^= fromToBB
+            pieceBB[piece] ^= fromToBB
+            self.occupiedBB ^= fromToBB
+            if captured:
+                hash_ ^= codeKeys[captured][target]
+                self.psqt[captured & 3] -= codeValues[captured][target]
+                toBB = 1 << target
+                pieceBB[captured & 3] ^= toBB
+                pieceBB[captured >> 2] ^= toBB
+                self.occupiedBB ^= toBB
+            changed = (origin, target)
+        # Castling or moving the king from its original square removes castling availability of both sides, moving a
+        # rook from its original square that of its side
+        if rights[QUEENSIDE] | rights[KINGSIDE]:
+            if castling or (piece == KING and origin == kingSquares[color]):
+                cleared = (QUEENSIDE, KINGSIDE)
+            elif piece == ROOK:
+                cleared = [side for side in (QUEENSIDE, KINGSIDE) if rights[side] == 1 << origin]
+            else:
+                cleared = ()
+            for side in cleared:
+                if rights[side]:
+                    hash_ ^= castleKeys[color][side]
+                    rights[side] = 0
+        # Capturing a rook on its original square removes castling availability of its side
+        if victimRights is not None:
+            victim = captured & 3
+            for side in (QUEENSIDE, KINGSIDE):
+                if victimRights[side] == 1 << target:
+                    hash_ ^= castleKeys[victim][side]
+                    self.castle[victim][side] = 0
+        self.emptyBB = ~self.occupiedBB
+        self.hash = hash_
+        self.turn = nextTurn
+        for square in changed:
+            self.onDataChanged((square & 15) - 1, (square >> 4) - 1)
+        # Notify board view for auto-rotation
+        self.onAutoRotate(-1)
+
+    def unmakeMove(self):
+        """Takes back the last move made by popping its undo record, which restores the captured piece, castling
+        availability, hash and halfmove clock, and the position history. Returns the move taken back."""
+        move, rights, victimRights, hash_, self.halfmoveClock = self.undoStack.pop()
+        self.history.pop()
+        count = self.positionCounts[hash_]
+        if count > 1:
+            self.positionCounts[hash_] = count - 1
+        else:
+            del self.positionCounts[hash_]
+        origin = move & 255
+        target = move >> 8 & 255
+        code = move >> 16 & 63
+        captured = move >> 22 & 63
+        piece, color = code >> 2, code & 3
+        pieceBB = self.pieceBB
+        boardData = self.boardData
+        if move >> 28:
+            kingTarget, rookTarget = self.castlingSquares(origin, target)
+            boardData[mailboxIndex[kingTarget]] = 0
+            boardData[mailboxIndex[rookTarget]] = 0
+            boardData[mailboxIndex[origin]] = code
+            boardData[mailboxIndex[target]] = captured
+            self.psqt[color] -= codeValues[code][kingTarget] - codeValues[code][origin] + \
+                codeValues[captured][rookTarget] - codeValues[captured][target]
+            kingBB = 1 << origin | 1 << kingTarget
+            rookBB = 1 << target | 1 << rookTarget
+            pieceBB[color] ^= kingBB ^ rookBB
+            pieceBB[KING] ^= kingBB
+            pieceBB[ROOK] ^= rookBB
+            self.occupiedBB ^= kingBB ^ rookBB
+            changed = (kingTarget, rookTarget, origin, target)
+        else:
+            boardData[mailboxIndex[origin]] = code
+            boardData[mailboxIndex[target]] = captured
+            values = codeValues[code]
+            self.psqt[color] -= values[target] - values[origin]
+            fromToBB = 1 << origin | 1 << target
+            pieceBB[color] ^= fromToBB
+            pieceBB[piece] ^= fromToBB
+            self.occupiedBB ^= fromToBB
+            if captured:
+                self.psqt[captured & 3] += codeValues[captured][target]
+                toBB = 1 << target
+                pieceBB[captured & 3] ^= toBB
+                pieceBB[captured >> 2] ^= toBB
+                self.occupiedBB ^= toBB
+            changed = (origin, target)
+        self.emptyBB = ~self.occupiedBB
+        self.castle[color] = rights
+        if victimRights is not None:
+            self.castle[captured & 3] = victimRights
+        self.hash = hash_
+        self.turn = color
+        for square in changed:
+            self.onDataChanged((square & 15) - 1, (square >> 4) - 1)
+        # Notify board view for auto-rotation
+        self.onAutoRotate(1)
+        return move
+
+    def setCastlingAvailability(self, castling):
+        """Sets castling availability according to castling availability string, e.g. 'rKrQbKbQyKyQgKgQ'."""
+        self.hash ^= self.castlingHash()
+        self.castle[RED][KINGSIDE] = (1 << self.square(10, 0)) if 'rK' in castling else 0
+        self.castle[RED][QUEENSIDE] = (1 << self.square(3, 0)) if 'rQ' in castling else 0
+        self.castle[BLUE][KINGSIDE] = (1 << self.square(0, 10)) if 'bK' in castling else 0
+        self.castle[BLUE][QUEENSIDE] = (1 << self.square(0, 3)) if 'bQ' in castling else 0
+        self.castle[YELLOW][KINGSIDE] = (1 << self.square(3, 13)) if 'yK' in castling else 0
+        self.castle[YELLOW][QUEENSIDE] = (1 << self.square(10, 13)) if 'yQ' in castling else 0
+        self.castle[GREEN][KINGSIDE] = (1 << self.square(13, 3)) if 'gK' in castling else 0
+        self.castle[GREEN][QUEENSIDE] = (1 << self.square(13, 10)) if 'gQ' in castling else 0
+        self.hash ^= self.castlingHash()
+
+    def castlingAvailability(self):
+        """Returns castling availability string."""
+        castling = ''
+        # "K" if kingside castling available, "Q" if queenside, "-" if no player can castle
+        if self.castle[RED][KINGSIDE]:
+            castling += 'rK'
+        if self.castle[RED][QUEENSIDE]:
+            castling += 'rQ'
+        if self.castle[BLUE][KINGSIDE]:
+            castling += 'bK'
+        if self.castle[BLUE][QUEENSIDE]:
+            castling += 'bQ'
+        if self.castle[YELLOW][KINGSIDE]:
+            castling += 'yK'
+        if self.castle[YELLOW][QUEENSIDE]:
+            castling += 'yQ'
+        if self.castle[GREEN][KINGSIDE]:
+            castling += 'gK'
+        if self.castle[GREEN][QUEENSIDE]:
+            castling += 'gQ'
+        if not castling:
+            castling = '-'
+        return castling
+
+    def parseFen4(self, fen4):
+        """Sets board position according to the FEN4 string fen4: piece placement, player to move, castling
+        availability, en passant (always '-'), halfmove clock (optional), number of quarter-moves and number of full
+        moves. The position history is cleared."""
+        castling = None
+        turn = None
+        halfmoveClock = 0
+        if self.chesscom:
+            # Get player to move and castling availability from chess.com prefix: [player to move] - [dead 1/0] -
+            # [kingside castle 1/0] - [queenside castle 1/0]
+            prefix = fen4.split('-')
+            if len(prefix) > 4:
+                turn = 'rbyg'.find(prefix[0].lower())
+                castling = ''
+                for kingside, queenside, player in zip(prefix[2].split(','), prefix[3].split(','), 'rbyg'):
+                    castling += player + 'K' if kingside == '1' else ''
+                    castling += player + 'Q' if queenside == '1' else ''
+            # Remove chess.com prefix and commas
+            i = fen4.rfind('-')
+            fen4 = fen4[i+1:]
+            fen4 = fen4.replace(',', '')
+            fen4 += ' '
+        elif len(fen4.split(' ')) > 2:
+            turn = 'rbyg'.find(fen4.split(' ')[1])
+            castling = fen4.split(' ')[2]
+            if len(fen4.split(' ')) > 6 and fen4.split(' ')[4].isdigit():
+                halfmoveClock = int(fen4.split(' ')[4])
+        index = 0
+        skip = 0
+        for rank in reversed(range(self.ranks)):
+            for file in range(self.files):
+                if skip > 0:
+                    char = ' '
+                    skip -= 1
+                else:
+                    # Pieces are always two characters, skip value can be single or double digit
+                    char = fen4[index]
+                    index += 1
+                    if char.isdigit():
+                        # Check if next is also digit. If yes, treat as single number
+                        next_ = fen4[index]
+                        if next_.isdigit():
+                            char += next_
+                            index += 1
+                        skip = int(char)
+                        char = ' '
+                        skip -= 1
+                    # If not digit, then it is a two-character piece. Add next character
+                    else:
+                        char += fen4[index]
+                        index += 1
+                self.setData(file, rank, char)
+                # Set bitboards
+                if char != ' ':
+                    piece, color = self.getPieceColor(char)
+                    self.pieceBB[color] |= 1 << self.square(file, rank)
+                    self.pieceBB[piece] |= 1 << self.square(file, rank)
+            next_ = fen4[index]
+            if next_ != '/' and next_ != ' ':
+                # If no slash or space after rank, the FEN4 is invalid, so reset board
+                self.initBoard()
+                return
+            else:  # Skip the slash
+                index += 1
+        self.occupiedBB = self.pieceBB[RED] | self.pieceBB[BLUE] | self.pieceBB[YELLOW] | self.pieceBB[GREEN]
+        self.emptyBB = ~self.occupiedBB
+        self.undoStack = []
+        self.history = []
+        self.positionCounts = {}
+        self.halfmoveClock = halfmoveClock
+        if castling is not None:
+            self.setCastlingAvailability(castling)
+        if turn is not None and turn >= 0:
+            self.setTurn(turn)
+        self.onBoardReset()
+
+    def getFen4(self):
+        """Generates FEN4 from current board state."""
+        fen4 = ''
+        skip = 0
+        prev = ' '
+        for rank in reversed(range(self.ranks)):
+            for file in range(self.files):
+                char = self.getData(file, rank)
+                # If current square is empty, increment skip value
+                if char == ' ':
+                    skip += 1
+                    prev = char
+                else:
+                    # If current square is not empty, but previous square was empty, append skip value to FEN4 string,
+                    # unless the previous square was on the previous rank
+                    if prev == ' ' and file != 0:
+                        fen4 += str(skip)
+                        skip = 0
+                    # Append algebraic piece name to FEN4 string
+                    fen4 += char
+                    prev = char
+            # If skip is non-zero at end of rank, append skip and reset to zero
+            if skip > 0:
+                fen4 += str(skip)
+                skip = 0
+            # Append slash at end of rank and append space after last rank
+            if rank == 0:
+                fen4 += ' '
+            else:
+                fen4 += '/'
+        return fen4
+
+    def getChesscomFen4(self):
+        """Generates chess.com compatible FEN4."""
+        fen4 = ''
+        skip = 0
+        prev = ' '
+        for rank in reversed(range(self.ranks)):
+            for file in range(self.files):
+                char = self.getData(file, rank)
+                # If current square is empty, increment skip value
+                if char == ' ':
+                    skip += 1
+                    prev = char
+                else:
+                    # If current square is not empty, but previous square was empty, append skip value to FEN4 string,
+                    # unless the previous square was on the previous rank
+                    if prev == ' ' and file != 0:
+                        fen4 += str(skip) + ','
+                        skip = 0
+                    # Append algebraic piece name to FEN4 string
+                    fen4 += char + ','
+                    prev = char
+            # If skip is non-zero at end of rank, append skip and reset to zero
+            if skip > 0:
+                fen4 += str(skip) + ','
+                skip = 0
+            # Append slash at end of rank
+            if rank != 0:
+                fen4 = fen4[:-1]
+                fen4 += '/'
+        fen4 = fen4[:-1]
+        return fen4
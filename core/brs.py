@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Search for the Free-For-All variant (Board.ffa), in which three opponents each play for themselves. Searching
+every player's best move for themselves (max^n) allows almost no pruning. Best-Reply Search (Schadd and Winands,
+2011) instead lets the player to move at the root (the root player) alternate with a single opponent move: at
+opponent plies the moves of all opponents are searched together and only the strongest reply against the root player
+counts. The tree is a two-player tree again, so alpha-beta pruning applies, and the root player looks further ahead
+than with the players moving in turn. In paranoid mode the players move in turn and the opponents form a coalition
+minimizing the score of the root player."""
+
+from core.evaluation import evaluateFfa
+from core.search import Search, MoveOrdering, MATE, MAX_PLY, inCheck, captureOrder, scoreToTable, scoreFromTable
+from core.transposition import EXACT, LOWER, UPPER
+
+
+class BestReplySearch(Search):
+    """Iterative deepening Best-Reply Search, or paranoid search if paranoid, with quiescence search of captures.
+    Scores are from the point of view of the root player: material and piece-square score against the average
+    opponent still in the game (evaluateFfa()), or -MATE + n if the root player is checkmated after n plies. An
+    opponent side without legal moves is evaluated statically; eliminations are not searched. The transposition table
+    is cleared when the root player changes, since its scores are relative to the root player."""
+    def __init__(self, hashSize=16, paranoid=False):
+        super().__init__(hashSize)
+        self.paranoid = paranoid
+        self.root = None  # Root player of the last search
+        self.ordering = MoveOrdering(exchange=False)  # Static exchange evaluation assumes teams
+
+    def search(self, board, depth=None, nodes=None, movetime=None):
+        """Searches like Search.search(), with player board.turn as root player."""
+        if board.turn != self.root:
+            self.tt.clear()
+            self.root = board.turn
+        return super().search(board, depth, nodes, movetime)
+
+    def players(self):
+        """Returns players whose moves are searched in the current position: the root player, all opponents still in
+        the game (Best-Reply Search) or the opponent to move (paranoid)."""
+        board = self.board
+        if board.turn == self.root or self.paranoid:
+            return (board.turn,)
+        return tuple(color for color in range(4) if color != self.root and not board.dead >> color & 1)
+
+    def evaluate(self):
+        """Returns static evaluation from the point of view of the side to move (root player or opponents)."""
+        score = evaluateFfa(self.board, self.root)
+        return score if self.board.turn == self.root else -score
+
+    def searchMove(self, move, depth, ply, alpha, beta):
+        """Makes move, searches the position after it to depth and takes the move back. Returns score from the point
+        of view of the side that made the move. In Best-Reply Search the root player moves after every opponent
+        move."""
+        board = self.board
+        turn = board.turn
+        color = move >> 16 & 3
+        if color != turn:
+            board.setTurn(color)  # One of the opponents searched together moves
+        board.makeMove(move)
+        if color != self.root and not self.paranoid:
+            board.setTurn(self.root)
+        if (board.turn == self.root) == (color == self.root):
+            score = self.alphaBeta(depth, ply, alpha, beta)  # Paranoid: next opponent of the coalition
+        else:
+            score = -self.alphaBeta(depth, ply, -beta, -alpha)
+        board.unmakeMove()
+        if turn != color:
+            board.setTurn(turn)
+        return score
+
+    def alphaBeta(self, depth, ply, alpha, beta):
+        """Returns score of position from the point of view of the side to move, searched to depth."""
+        if depth <= 0:
+            return self.quiescence(ply, alpha, beta)
+        self.nodes += 1
+        self.checkLimits()
+        board = self.board
+        pvTable = self.pvTable
+        pvTable[ply] = []
+        hashMove = 0
+        entry = self.tt.probe(board.hash)
+        if entry is not None:
+            hashMove, entryDepth, bound, score = entry
+            if ply and entryDepth >= depth:
+                score = scoreFromTable(score, ply)
+                if bound == EXACT or (bound == LOWER and score >= beta) or (bound == UPPER and score <= alpha):
+                    if hashMove:
+                        pvTable[ply] = [hashMove]
+                    return score
+        if ply >= MAX_PLY:
+            return self.evaluate()
+        alphaOrig = alpha
+        bestMove = 0
+        count = 0
+        for move in self.ordering.moves(board, self.players(), hashMove, ply):
+            count += 1
+            score = self.searchMove(move, depth - 1, ply + 1, alpha, beta)
+            if score > alpha:
+                alpha = score
+                bestMove = move
+                pvTable[ply] = [move] + pvTable[ply + 1]
+                if score >= beta:
+                    self.ordering.cutoff(move, depth, ply, count)
+                    break
+        if not count:
+            if board.turn == self.root:
+                return -MATE + ply if inCheck(board, self.root) else 0
+            return self.evaluate()
+        if alpha >= beta:
+            bound = LOWER
+        elif alpha > alphaOrig:
+            bound = EXACT
+        else:
+            bound = UPPER
+        self.tt.store(board.hash, bestMove, depth, bound, scoreToTable(alpha, ply))
+        return alpha
+
+    def quiescence(self, ply, alpha, beta):
+        """Returns score of position searching captures only. The side to move may stand pat."""
+        self.nodes += 1
+        self.checkLimits()
+        board = self.board
+        self.pvTable[ply] = []
+        standPat = self.evaluate()
+        if standPat >= beta or ply >= MAX_PLY:
+            return standPat
+        alpha = max(alpha, standPat)
+        captures = []
+        for color in self.players():
+            captures += board.generateMoves(color, quiets=False)
+        for move in sorted(captures, key=captureOrder):
+            score = self.searchMove(move, 0, ply + 1, alpha, beta)
+            if score > alpha:
+                alpha = score
+                if score >= beta:
+                    break
+        return alpha
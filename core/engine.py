@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""UCI-like line protocol for the Teams variant over standard input and output, for running the search headless
+(e.g. in tournaments). It has no Qt dependency. Moves are in the notation of Algorithm.toAlgebraic() and
+Algorithm.fromAlgebraic(), e.g. 'd2d4', 'Nb1c3', 'd4xe5' and 'O-O'.
+
+    uci                                            engine replies with id, options and 'uciok'
+    isready                                        engine replies 'readyok'
+    setoption name Hash value <MB>                 transposition table size
+    setoption name Threads value <n>               number of search processes (Lazy SMP, Python 3.8 or later)
+    ucinewgame                                     clear the transposition table
+    position startpos|fen4 <FEN4> [moves <move>...]
+    go [depth <n>] [nodes <n>] [movetime <ms>] [infinite]
+    stop                                           stop the search, engine replies with best move
+    quit
+
+During the search the engine sends
+
+    info depth <n> score cp <centipawns>|mate <plies> nodes <n> nps <n> time <ms> pv <move>...
+    bestmove <move>|(none)
+
+Scores are from the point of view of the team to move; mate scores count plies (all four players), negative if the
+team to move gets mated. If the game is over in the position set (checkmate, stalemate, threefold repetition or the
+move count rule), the engine sends 'info string result 1-0|0-1|1/2-1/2', such that self-play can stop."""
+
+import sys
+from threading import Thread, Lock
+from core.algorithm import Teams
+from core.search import Search, MATE, MAX_PLY
+
+
+class Engine:
+    """Reads commands from input and writes replies to output, one per line. The search runs in a thread, such that
+    stop and isready are handled while it is searching."""
+    name = '4PlayerChess'
+    author = 'GammaDeltaII'
+
+    def __init__(self, input_=sys.stdin, output=sys.stdout, hashSize=16):
+        super().__init__()
+        self.input = input_
+        self.output = output
+        self.outputLock = Lock()  # Lines of the search thread and the main thread must not interleave
+        self.algorithm = Teams()
+        self.algorithm.newGame()
+        self.hashSize = hashSize
+        self.threads = 1
+        self.search = None
+        self.createSearch()
+        self.thread = None
+
+    def createSearch(self):
+        """Replaces the search by one with the current Hash and Threads options."""
+        if self.search is not None:
+            self.search.close()
+        if self.threads > 1:
+            from core.smp import ParallelSearch  # Imported on demand, it starts processes and needs Python 3.8
+            self.search = ParallelSearch(self.threads, self.hashSize)
+        else:
+            self.search = Search(self.hashSize)
+        self.search.onInfo = self.sendInfo
+
+    def send(self, line):
+        """Writes line to output."""
+        with self.outputLock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def sendInfo(self, depth, score, nodes, nps, pv):
+        """Writes info line of completed iteration."""
+        if abs(score) >= MATE - MAX_PLY:
+            score = 'mate {}'.format(MATE - score if score > 0 else -(MATE + score))
+        else:
+            score = 'cp {}'.format(score)
+        self.send('info depth {} score {} nodes {} nps {} time {} pv {}'.format(
+            depth, score, nodes, nps, int(self.search.elapsed * 1000),
+            ' '.join(self.algorithm.toAlgebraic(move) for move in pv)))
+
+    def run(self):
+        """Handles commands until quit or end of input."""
+        for line in self.input:
+            tokens = line.split()
+            if not tokens:
+                continue
+            if not self.handle(tokens[0], tokens[1:]):
+                break
+        self.stop()
+        self.search.close()
+
+    def handle(self, command, args):
+        """Handles command with arguments args. Returns False on quit."""
+        if command == 'uci':
+            self.send('id name {}'.format(self.name))
+            self.send('id author {}'.format(self.author))
+            self.send('option name Hash type spin default 16 min 1 max 4096')
+            self.send('option name Threads type spin default 1 min 1 max 64')
+            self.send('uciok')
+        elif command == 'isready':
+            self.send('readyok')
+        elif command == 'setoption':
+            self.setOption(args)
+        elif command == 'ucinewgame':
+            self.stop()
+            self.search.tt.clear()
+        elif command == 'position':
+            self.stop()
+            self.setPosition(args)
+        elif command == 'go':
+            self.stop()
+            self.go(args)
+        elif command == 'stop':
+            self.stop()
+        elif command == 'quit':
+            return False
+        else:
+            self.send('info string unknown command {}'.format(command))
+        return True
+
+    def setOption(self, args):
+        """Sets option from arguments 'name <name> value <value>'."""
+        if 'name' not in args or 'value' not in args:
+            return
+        name = ' '.join(args[args.index('name') + 1:args.index('value')])
+        value = ' '.join(args[args.index('value') + 1:])
+        if name.lower() not in ('hash', 'threads'):
+            self.send('info string unknown option {}'.format(name))
+            return
+        try:
+            value = max(1, int(value))
+        except ValueError:
+            self.send('info string invalid value {} of option {}'.format(value, name))
+            return
+        self.stop()
+        if name.lower() == 'hash':
+            self.hashSize = value
+        else:
+            self.threads = min(value, 64)
+        self.createSearch()
+
+    def setPosition(self, args):
+        """Sets position from arguments 'startpos|fen4 <FEN4> [moves <move>...]'. Moves are made until the first
+        illegal one. An invalid FEN4 leaves the position unchanged."""
+        moves = []
+        if 'moves' in args:
+            moves = args[args.index('moves') + 1:]
+            args = args[:args.index('moves')]
+        algorithm = Teams()  # New move tree, such that move numbers start from the given position
+        if args and args[0] == 'fen4':
+            try:
+                valid = len(args) > 1
+                if valid:
+                    algorithm.setBoardState(' '.join(args[1:]))
+            except (KeyError, IndexError, ValueError):
+                valid = False
+            if not valid:
+                self.send('info string invalid fen4')
+                return  # Keep the previous position
+        else:
+            algorithm.newGame()
+        self.algorithm = algorithm
+        # Moves are made on the board only, without the move tree, FEN4 and PGN4 updates of Teams.makeMove()
+        board = self.algorithm.board
+        for move in moves:
+            try:
+                encoded = board.encodeMove(*self.algorithm.fromAlgebraic(move, 'rbyg'[board.turn]))
+            except (ValueError, IndexError, TypeError):
+                encoded = None
+            if encoded not in board.generateMoves(board.turn):
+                self.send('info string illegal move {}'.format(move))
+                break
+            board.makeMove(encoded)
+        result = self.algorithm.gameResult()
+        if result != self.algorithm.NoResult:
+            self.send('info string result {}'.format(result))
+
+    def go(self, args):
+        """Starts searching the current position with limits from arguments."""
+        limits = {'depth': None, 'nodes': None, 'movetime': None}
+        for index, arg in enumerate(args[:-1]):
+            if arg in limits:
+                try:
+                    limits[arg] = int(args[index + 1])
+                except ValueError:
+                    pass
+        if limits['movetime'] is not None:
+            limits['movetime'] /= 1000
+        self.thread = Thread(target=self.think, args=(self.algorithm.board, limits['depth'], limits['nodes'],
+                                                      limits['movetime']))
+        self.thread.start()
+
+    def think(self, board, depth, nodes, movetime):
+        """Searches board and writes best move."""
+        move, score = self.search.search(board, depth, nodes, movetime)
+        self.send('bestmove {}'.format(self.algorithm.toAlgebraic(move) if move else '(none)'))
+
+    def stop(self):
+        """Stops the search, if any, and waits for its best move."""
+        if self.thread is None:
+            return
+        # Repeat stop, in case the search had not started yet (search() resets the stopped flag)
+        while self.thread.is_alive():
+            self.search.stop()
+            self.thread.join(0.01)
+        self.thread = None
+
+
+def main():
+    """Runs the engine on standard input and output."""
+    Engine().run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Static evaluation: material and piece-square tables. The tables are defined for red (moving up the board from
+rank 1) and derived for the other players by rotating the board, such that every player's pieces are valued the same
+from their own side. The material and piece-square score of each player (Board.psqt) is updated incrementally by
+Board.makeMove() and Board.unmakeMove(), so evaluate() only adds four numbers.
+
+Tables are keyed by the two-character piece identifier (e.g. 'rP'), like the Zobrist keys, and indexed by square in
+the 16x16 bitboard layout. This module does not import the board, which imports the tables."""
+
+# Piece values in centipawns
+materialValues = {'P': 100, 'N': 300, 'B': 400, 'R': 500, 'Q': 900, 'K': 0}
+
+
+def centerDistance(file, rank):
+    """Returns Manhattan distance of square (file, rank) from the center of the 14x14 board, in half squares."""
+    return abs(2 * file - 13) + abs(2 * rank - 13)
+
+
+def positionalValue(piece, file, rank):
+    """Returns positional bonus in centipawns of a red piece (piece character, e.g. 'N') on square (file, rank)."""
+    if piece == 'P':
+        # Advance towards the center, more so on the center files
+        return 5 * min(rank - 1, 6) + (10 if 5 <= file <= 8 and rank >= 3 else 0)
+    if piece == 'N':
+        return 30 - 3 * centerDistance(file, rank)
+    if piece == 'B':
+        return 20 - 2 * centerDistance(file, rank)
+    if piece == 'R':
+        return 10 if rank == 6 else 0  # Row where opponent pawns start
+    if piece == 'Q':
+        return 10 - centerDistance(file, rank)
+    if piece == 'K':
+        return -20 * min(rank, 3)  # Stay behind the pawns
+    return 0
+
+
+def redSquare(color, file, rank):
+    """Returns square (file, rank) as seen by red, i.e. rotated such that player color sits at rank 1."""
+    if color == 'b':
+        return rank, file
+    if color == 'y':
+        return 13 - file, 13 - rank
+    if color == 'g':
+        return 13 - rank, 13 - file
+    return file, rank
+
+
+def pieceSquareTable(char):
+    """Returns material plus positional value of piece char (e.g. 'bN') per square (16x16 layout, 0 off the
+    board)."""
+    color, piece = char
+    table = [0] * 256
+    for rank in range(14):
+        for file in range(14):
+            if (file < 3 or file > 10) and (rank < 3 or rank > 10):
+                continue  # 3x3 corners
+            redFile, redRank = redSquare(color, file, rank)
+            table[(rank + 1) << 4 | (file + 1)] = materialValues[piece] + positionalValue(piece, redFile, redRank)
+    return table
+
+
+pieceSquareValues = {color + piece: pieceSquareTable(color + piece) for color in 'rbyg' for piece in 'PNBRQK'}
+
+
+def evaluate(board, color):
+    """Returns material and piece-square score in centipawns from the point of view of the team of player color."""
+    psqt = board.psqt
+    return psqt[color] + psqt[(color + 2) % 4] - psqt[(color + 1) % 4] - psqt[(color + 3) % 4]
+
+
+def evaluateFfa(board, color):
+    """Returns material and piece-square score in centipawns of player color minus the average score of the opponents
+    still in the game, for the Free-For-All variant."""
+    psqt = board.psqt
+    opponents = [psqt[opponent] for opponent in range(4) if opponent != color and not board.dead >> opponent & 1]
+    return psqt[color] - sum(opponents) // len(opponents) if opponents else psqt[color]
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Line geometry of the 14x14 board embedded in the 16x16 (256-bit) bitboard layout.
+
+All tables are built once at import. Square pair tables are flat lists indexed by origin << 8 | square and are zero
+for squares that are not on a common rank, file, diagonal or anti-diagonal. All sets are restricted to the board.
+"""
+
+boardMask = 0xff00ff00ff07ffe7ffe7ffe7ffe7ffe7ffe7ffe7ffe0ff00ff00ff00000  # without 3x3 corners
+boardEdgeMask = 0xff008100810781e400240024002400240024002781e081008100ff00000
+squareBoardMask = 0x7ffe7ffe7ffe7ffe7ffe7ffe7ffe7ffe7ffe7ffe7ffe7ffe7ffe7ffe0000  # full 14x14 board
+squareBoardEdgeMask = 0x7ffe4002400240024002400240024002400240024002400240027ffe0000
+
+# (file, rank) steps of the eight ray directions: orthogonal (rook) directions first, then diagonal (bishop)
+N, E, S, W, NE, SE, SW, NW = range(8)
+directions = ((0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (1, -1), (-1, -1), (-1, 1))
+
+
+def raySquares(origin, direction):
+    """Returns the squares (16x16 layout) on the ray from origin in direction, ordered by distance from origin."""
+    fileStep, rankStep = directions[direction]
+    file, rank = origin & 15, origin >> 4
+    squares = []
+    while 0 <= file + fileStep < 16 and 0 <= rank + rankStep < 16:
+        file += fileStep
+        rank += rankStep
+        squares.append(rank << 4 | file)
+    return squares
+
+
+rays = [[0] * 256 for _ in directions]  # rays[direction][square], excluding square
+rookLines = [0] * 256  # rank and file through square, excluding square
+bishopLines = [0] * 256  # diagonal and anti-diagonal through square, excluding square
+between = [0] * 65536  # squares strictly between origin and square
+beyond = [0] * 65536  # squares on the ray from origin through square, beyond square
+line = [0] * 65536  # entire line through origin and square, including both
+
+for origin in range(256):
+    for direction in range(8):
+        for square in raySquares(origin, direction):
+            rays[direction][origin] |= 1 << square
+        rays[direction][origin] &= boardMask
+    rookLines[origin] = rays[N][origin] | rays[E][origin] | rays[S][origin] | rays[W][origin]
+    bishopLines[origin] = rays[NE][origin] | rays[SE][origin] | rays[SW][origin] | rays[NW][origin]
+
+for origin in range(256):
+    for direction in range(8):
+        ray = rays[direction][origin]
+        full = (ray | rays[direction ^ 2][origin] | 1 << origin) & boardMask  # direction ^ 2 is opposite direction
+        ahead = ray
+        for square in raySquares(origin, direction):
+            ahead &= ~(1 << square)
+            between[origin << 8 | square] = ray & ~ahead & ~(1 << square)
+            beyond[origin << 8 | square] = ahead
+            line[origin << 8 | square] = full
+
+
+# Sliding piece attacks by obstruction difference: on each line through the square, the nearest blocker below the
+# square (most significant bit of the lower ray) and the nearest blocker above it (least significant bit of the upper
+# ray) bound the attacked squares, so the cost does not depend on the number of blockers.
+def lineAttacks(lower, upper, occupied):
+    """Returns attacks along the line formed by rays lower and upper (excluding the square between them)."""
+    upperBlockers = upper & occupied
+    lowerBlockers = lower & occupied
+    return (lower | upper) & ((upperBlockers & -upperBlockers) * 2 - (1 << (lowerBlockers | 1).bit_length() - 1))
+
+
+def rookAttacks(square, occupied):
+    """Returns rook attacks from square, blocked by the first occupied square in each direction."""
+    return lineAttacks(rays[S][square], rays[N][square], occupied) | \
+        lineAttacks(rays[W][square], rays[E][square], occupied)
+
+
+def bishopAttacks(square, occupied):
+    """Returns bishop attacks from square, blocked by the first occupied square in each direction."""
+    return lineAttacks(rays[SW][square], rays[NE][square], occupied) | \
+        lineAttacks(rays[SE][square], rays[NW][square], occupied)
+
+
+def queenAttacks(square, occupied):
+    """Returns queen attacks (= union of rook and bishop attacks) from square."""
+    return rookAttacks(square, occupied) | bishopAttacks(square, occupied)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Mate solver for the Teams variant: depth-first proof-number search (df-pn, Nagai 2002) of whether the team to move
+can force checkmate of an opponent within n of its moves, i.e. 2n - 1 plies, whatever the opponents reply. Players
+of the two teams alternate, so the team to move (attacker) chooses a move at every other ply and the opponents
+(defender) at the plies in between.
+
+Every node has a proof number phi and a disproof number delta from the point of view of the player to move: phi is
+the number of leaves that must be proven to show that the side to move wins, delta the number to show that it does
+not. A node is won (phi 0) if a move leads to a position lost for the other side, and lost (delta 0) if all moves lead
+to positions won for the other side. df-pn searches the most proving move below thresholds that are raised as the
+search backs up, keeping the numbers in a fixed-size table instead of the tree.
+
+Run from the project root on a FEN4 position:
+    python3 -m core.mate '<FEN4>' [--moves 3] [--nodes 1000000] [--hash 16]
+"""
+
+from argparse import ArgumentParser
+from array import array
+from core.board import KING
+
+INFINITE = (1 << 31) - 1  # Proof and disproof numbers saturate at INFINITE
+PROVEN, DISPROVEN, UNKNOWN = range(3)  # Results: forced mate found, no forced mate, node limit reached
+ENTRY_SIZE = 16  # Bytes per entry: key and proof and disproof numbers
+DEPTH_KEY = 0x9e3779b97f4a7c15  # Mixed into the hash per remaining ply, such that depths are stored separately
+
+
+class ProofTable:
+    """Proof and disproof numbers by position and remaining plies, in two preallocated flat arrays of unsigned 64-bit
+    integers of at most sizeMB megabytes (keys and phi | delta << 32). Each slot holds one position and is always
+    replaced, so memory stays bounded however long the search runs."""
+    def __init__(self, sizeMB=16):
+        super().__init__()
+        slots = 1
+        while slots * 2 * ENTRY_SIZE <= sizeMB * (1 << 20):
+            slots *= 2
+        self.mask = slots - 1
+        self.keys = array('Q', bytes(slots * 8))
+        self.values = array('Q', bytes(slots * 8))
+
+    def clear(self):
+        """Removes all entries."""
+        self.keys = array('Q', bytes((self.mask + 1) * 8))
+        self.values = array('Q', bytes((self.mask + 1) * 8))
+
+    def lookup(self, hash_, remaining):
+        """Returns (phi, delta) of position hash_ with remaining plies, (1, 1) if not found."""
+        key = (hash_ ^ remaining * DEPTH_KEY) & 0xffffffffffffffff
+        index = key & self.mask
+        if self.keys[index] == key:
+            value = self.values[index]
+            return value & 0xffffffff, value >> 32
+        return 1, 1
+
+    def store(self, hash_, remaining, phi, delta):
+        """Stores phi and delta of position hash_ with remaining plies."""
+        key = (hash_ ^ remaining * DEPTH_KEY) & 0xffffffffffffffff
+        index = key & self.mask
+        self.keys[index] = key
+        self.values[index] = phi | delta << 32
+
+
+class NodeLimit(Exception):
+    """Raised inside the solver when the node limit is reached."""
+
+
+class MateSolver:
+    """Depth-first proof-number search with a proof table of hashSize MB. solve() searches mates in 1, 2, ... n moves
+    of the team to move, so the line found is a shortest forced mate."""
+    def __init__(self, hashSize=16):
+        super().__init__()
+        self.table = ProofTable(hashSize)
+        self.board = None
+        self.attacker = 0  # Team to move at the root: 0 for red and yellow, 1 for blue and green
+        self.nodes = 0
+        self.nodeLimit = None
+
+    def solve(self, board, moves=3, nodes=None):
+        """Searches for a forced checkmate by the team of player board.turn in at most moves of its moves, until the
+        number of nodes is exceeded. Returns (result, line): PROVEN and the mating line as packed integer moves,
+        DISPROVEN or UNKNOWN and an empty line."""
+        self.board = board.copy()
+        self.attacker = board.turn % 2
+        self.nodes = 0
+        self.nodeLimit = nodes
+        self.table.clear()
+        for teamMoves in range(1, moves + 1):
+            remaining = 2 * teamMoves - 1
+            try:
+                phi, delta = self.search(remaining, INFINITE, INFINITE)
+            except NodeLimit:
+                return UNKNOWN, []
+            if phi == 0:
+                self.nodeLimit = None
+                return PROVEN, self.line(remaining)
+        return DISPROVEN, []
+
+    def terminal(self, moves, remaining):
+        """Returns (phi, delta) of the current position if the game or the search ends in it, otherwise None. moves
+        are the legal moves of the player to move."""
+        board = self.board
+        color = board.turn
+        if not moves:
+            king = board.pieceBB[color] & board.pieceBB[KING]
+            if not king or board.opponentAttackers(king.bit_length() - 1, color, board.occupiedBB):
+                return INFINITE, 0  # Checkmate or king captured: lost for the side to move
+            # Stalemate is a draw: lost for the attacker, a successful defence for the defender
+            return (INFINITE, 0) if color % 2 == self.attacker else (0, INFINITE)
+        if not remaining:
+            return (INFINITE, 0) if color % 2 == self.attacker else (0, INFINITE)
+        return None
+
+    def search(self, remaining, thresholdPhi, thresholdDelta):
+        """Searches the current position with remaining plies until its phi or delta reaches its threshold, stores
+        them in the proof table and returns them."""
+        self.nodes += 1
+        if self.nodeLimit is not None and self.nodes > self.nodeLimit:
+            raise NodeLimit
+        board = self.board
+        table = self.table
+        moves = board.generateMoves(board.turn)
+        result = self.terminal(moves, remaining)
+        if result is not None:
+            table.store(board.hash, remaining, *result)
+            return result
+        # Hashes of the positions after each move, to look up their numbers
+        hashes = []
+        for move in moves:
+            board.makeMove(move)
+            hashes.append(board.hash)
+            board.unmakeMove()
+        while True:
+            # phi is the smallest delta of a child, delta the sum of the phis of the children
+            phi = INFINITE
+            delta = 0
+            best = None
+            secondDelta = INFINITE
+            bestPhi = 0
+            for index, hash_ in enumerate(hashes):
+                childPhi, childDelta = table.lookup(hash_, remaining - 1)
+                delta = min(delta + childPhi, INFINITE)
+                if childDelta < phi:
+                    secondDelta = phi
+                    phi = childDelta
+                    best = index
+                    bestPhi = childPhi
+                elif childDelta < secondDelta:
+                    secondDelta = childDelta
+            if phi >= thresholdPhi or delta >= thresholdDelta:
+                table.store(board.hash, remaining, phi, delta)
+                return phi, delta
+            # Search the most proving child with thresholds it must reach for this node to reach its own
+            childThresholdPhi = min(thresholdDelta - delta + bestPhi, INFINITE)
+            childThresholdDelta = min(thresholdPhi, secondDelta + 1)
+            board.makeMove(moves[best])
+            self.search(remaining - 1, childThresholdPhi, childThresholdDelta)
+            board.unmakeMove()
+
+    def line(self, remaining):
+        """Returns mating line from the current (proven) position: a move to a position lost for the defender, or the
+        first reply of the defender, until checkmate. Positions whose numbers were replaced in the table are searched
+        again."""
+        board = self.board
+        line = []
+        while True:
+            moves = board.generateMoves(board.turn)
+            if self.terminal(moves, remaining) is not None:
+                break
+            if board.turn % 2 == self.attacker:
+                chosen = self.provingMove(moves, remaining)
+            else:
+                chosen = moves[0]  # Every reply loses
+            if chosen is None:
+                break
+            line.append(chosen)
+            board.makeMove(chosen)
+            remaining -= 1
+        for _ in line:
+            board.unmakeMove()
+        return line
+
+    def provingMove(self, moves, remaining):
+        """Returns move of the attacker to a position lost for the defender: found in the proof table, or else by
+        searching the positions after the moves again."""
+        board = self.board
+        for research in (False, True):
+            for move in moves:
+                board.makeMove(move)
+                phi, delta = self.table.lookup(board.hash, remaining - 1)
+                if research and phi and delta:
+                    phi, delta = self.search(remaining - 1, INFINITE, INFINITE)
+                board.unmakeMove()
+                if delta == 0:
+                    return move
+        return None
+
+
+def main():
+    """Solves FEN4 position given on the command line and prints the result and mating line."""
+    from core.algorithm import Teams
+    parser = ArgumentParser(description='Forced mate solver for the Teams variant (depth-first proof-number search).')
+    parser.add_argument('fen4', help='position (FEN4)')
+    parser.add_argument('--moves', type=int, default=3, help='maximum number of moves of the team to move (default: 3)')
+    parser.add_argument('--nodes', type=int, help='node limit')
+    parser.add_argument('--hash', type=int, default=16, help='proof table size in MB (default: 16)')
+    args = parser.parse_args()
+    algorithm = Teams()
+    algorithm.setBoardState(args.fen4)
+    solver = MateSolver(args.hash)
+    result, line = solver.solve(algorithm.board, args.moves, args.nodes)
+    if result == PROVEN:
+        print('mate in {} ({} nodes): {}'.format((len(line) + 1) // 2, solver.nodes,
+                                                 ' '.join(algorithm.toAlgebraic(move) for move in line)))
+    elif result == DISPROVEN:
+        print('no mate in {} ({} nodes)'.format(args.moves, solver.nodes))
+    else:
+        print('unknown, node limit reached ({} nodes)'.format(solver.nodes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Monte Carlo Tree Search (UCT) for both variants, an alternative to alpha-beta where static evaluation is noisy.
+The tree grows by one node per playout; a playout plays random moves (preferring captures) for a number of plies
+and scores the final position with a reward in [0, 1] for each player. Every node keeps the rewards of the player who
+made its move, so the same tree serves teams (partners share a reward) and Free-For-All.
+
+Playouts run in a pool of worker processes (concurrent.futures.ProcessPoolExecutor, Python 3.7 or later). Leaves are
+dispatched in batches, one batch per worker, each with the root position and the moves leading to its leaves. While a
+batch is out, its leaves count as visited without reward (virtual loss), such that the next batches explore other
+parts of the tree."""
+
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from math import exp, log, sqrt
+from multiprocessing import get_context
+from random import Random
+from time import perf_counter
+from core.board import Board, RED, KING
+from core.evaluation import evaluate, evaluateFfa
+from core.search import isCapture
+
+EXPLORATION = 1.4  # UCT exploration constant
+REWARD_SCALE = 400  # Evaluation in centipawns giving a reward of 1 / (1 + e^-1)
+
+
+def rewards(board, terminal):
+    """Returns rewards in [0, 1] of red, blue, yellow and green in board. If terminal, the player to move has no legal
+    move: checkmate loses (for the team, in Teams) and stalemate is a draw. Otherwise the rewards are a logistic
+    function of the evaluation."""
+    color = board.turn
+    if terminal:
+        king = board.pieceBB[color] & board.pieceBB[KING]
+        mated = not king or bool(board.opponentAttackers(king.bit_length() - 1, color, board.occupiedBB))
+    if board.ffa:
+        result = [0. if board.dead >> player & 1 else 1 / (1 + exp(-evaluateFfa(board, player) / REWARD_SCALE))
+                  for player in range(4)]
+        if terminal:
+            result[color] = 0. if mated else .5
+        return result
+    if terminal:
+        if not mated:
+            return [.5] * 4
+        return [0. if player % 2 == color % 2 else 1. for player in range(4)]
+    reward = 1 / (1 + exp(-evaluate(board, RED) / REWARD_SCALE))
+    return [reward, 1 - reward, reward, 1 - reward]
+
+
+def playout(board, plies, random):
+    """Plays random legal moves in board for at most plies plies, captures with probability one half if there are
+    any, and returns the rewards (see rewards()) of the final position. The moves are taken back."""
+    made = 0
+    terminal = False
+    for _ in range(plies):
+        moves = board.generateMoves(board.turn)
+        if not moves:
+            terminal = True
+            break
+        captures = [move for move in moves if isCapture(move)]
+        board.makeMove(random.choice(captures if captures and random.random() < .5 else moves))
+        made += 1
+    result = rewards(board, terminal)
+    for _ in range(made):
+        board.unmakeMove()
+    return result
+
+
+def runPlayouts(snapshot, paths, plies, seed):
+    """Worker function: plays one playout after each list of moves in paths from root position snapshot (see
+    Board.snapshot()). Returns list of rewards."""
+    board = Board(14, 14)
+    board.restore(snapshot)
+    random = Random(seed)
+    results = []
+    for path in paths:
+        for move in path:
+            board.makeMove(move)
+        results.append(playout(board, plies, random))
+        for _ in path:
+            board.unmakeMove()
+    return results
+
+
+class Node:
+    """Node of the search tree: the position after packed integer move by player color (None for the root). Moves not
+    yet expanded are in untried (None until the node is first selected)."""
+    def __init__(self, move, color, parent, hash_):
+        self.move = move
+        self.color = color
+        self.parent = parent
+        self.hash = hash_  # Zobrist hash of the position
+        self.children = []
+        self.untried = None
+        self.visits = 0  # Includes playouts in progress (virtual loss)
+        self.value = 0.  # Total reward of player color
+
+    def select(self):
+        """Returns child with the highest upper confidence bound (UCT)."""
+        logVisits = log(self.visits)
+        return max(self.children,
+                   key=lambda child: child.value / child.visits + EXPLORATION * sqrt(logVisits / child.visits))
+
+    def mostVisited(self):
+        """Returns most visited child, or None if there are no children."""
+        return max(self.children, key=lambda child: child.visits) if self.children else None
+
+
+class MonteCarloSearch:
+    """UCT search with playouts in workers processes (in the calling process if workers is 0), in batches of
+    batchSize leaves per worker. The tree is kept between searches: if the position searched next was reached by moves
+    from the last one, e.g. along Algorithm.currentMove, its subtree is reused. close() must be called to stop the
+    workers."""
+    def __init__(self, workers=0, batchSize=8, plies=32, seed=0):
+        super().__init__()
+        self.workers = workers
+        self.batchSize = batchSize
+        self.plies = plies
+        self.random = Random(seed)
+        self.executor = None
+        if workers:
+            # Do not fork a possibly multithreaded (or Qt) process
+            self.executor = ProcessPoolExecutor(workers, mp_context=get_context('spawn'))
+        self.board = None
+        self.root = None
+        self.playouts = 0  # Playouts of the last search
+        self.reused = 0  # Visits of the reused subtree at the start of the last search
+        self.elapsed = 0.
+        self.stopped = False
+
+    def pps(self):
+        """Returns playouts per second of the last search."""
+        return int(self.playouts / self.elapsed) if self.elapsed else 0
+
+    def stop(self):
+        """Stops the search (e.g. from another thread) after the batches in progress."""
+        self.stopped = True
+
+    def close(self):
+        """Stops the worker processes."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def reuse(self, board, currentMove=None):
+        """Sets root to the node of the position of board in the tree of the last search: at the end of the path of
+        moves from the last root to currentMove (an Algorithm.Node), if given, or else among the nodes up to one round
+        of moves after the last root. Starts a new tree if not found."""
+        root = self.root
+        if root is not None and root.hash != board.hash:
+            path = []
+            node = currentMove
+            while node is not None and node.hash != root.hash:
+                path.append(node.move)
+                node = node.parent
+            if node is not None:
+                for move in reversed(path):
+                    root = next((child for child in root.children if child.move == move), None)
+                    if root is None:
+                        break
+            else:
+                level = [root]
+                root = None
+                for _ in range(4):
+                    level = [child for node in level for child in node.children]
+                    root = next((node for node in level if node.hash == board.hash), None)
+                    if root is not None:
+                        break
+        if root is None or root.hash != board.hash:
+            root = Node(None, None, None, board.hash)
+        root.parent = None
+        self.root = root
+
+    def search(self, board, playouts=None, movetime=None, currentMove=None):
+        """Searches position of board until the number of playouts or the time in seconds is reached, or stop() is
+        called. Without limits, searches until stopped. Returns most visited move (None if there is no legal move) and
+        its average reward for the player to move."""
+        self.board = board.copy()
+        self.reuse(board, currentMove)
+        self.reused = self.root.visits
+        self.playouts = 0
+        self.stopped = False
+        start = perf_counter()
+        deadline = start + movetime if movetime is not None else None
+        snapshot = self.board.snapshot()
+        pending = {}  # Future: list of leaf paths (nodes from the root)
+        while True:
+            done = playouts is not None and self.playouts + len(pending) * self.batchSize >= playouts or \
+                self.stopped or deadline is not None and perf_counter() >= deadline
+            if not done and (self.executor is None or len(pending) < self.workers):
+                leaves = [self.select() for _ in range(self.batchSize)]
+                leaves = [path for path in leaves if path]
+                if not leaves:
+                    continue
+                paths = [[node.move for node in path[1:]] for path in leaves]
+                seed = self.random.getrandbits(32)
+                if self.executor is None:
+                    self.backPropagate(leaves, runPlayouts(snapshot, paths, self.plies, seed))
+                else:
+                    pending[self.executor.submit(runPlayouts, snapshot, paths, self.plies, seed)] = leaves
+                continue
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                self.backPropagate(pending.pop(future), future.result())
+        self.elapsed = perf_counter() - start
+        best = self.root.mostVisited()
+        if best is None:
+            return None, 0.
+        return best.move, best.value / best.visits
+
+    def select(self):
+        """Descends the tree by UCT from the root to a node with untried moves, expands one of them and returns the path
+        of nodes to the new leaf, counting a visit (virtual loss) on each. A terminal node is scored at once and an
+        empty path is returned."""
+        board = self.board
+        node = self.root
+        path = [node]
+        while True:
+            if node.untried is None:
+                node.untried = board.generateMoves(board.turn)
+                self.random.shuffle(node.untried)
+            if node.untried or not node.children:
+                break
+            node = node.select()
+            board.makeMove(node.move)
+            path.append(node)
+        if node.untried:
+            move = node.untried.pop()
+            board.makeMove(move)
+            node = Node(move, move >> 16 & 3, node, board.hash)
+            node.parent.children.append(node)
+            path.append(node)
+        for node in path:
+            node.visits += 1
+        terminal = not node.untried and not node.children and node.untried is not None
+        if terminal:
+            self.backPropagate([path], [rewards(board, True)])
+        for _ in path[1:]:
+            board.unmakeMove()
+        return [] if terminal else path
+
+    def backPropagate(self, leaves, results):
+        """Adds rewards of playouts to the nodes on the paths to their leaves. The visits were counted on selection."""
+        for path, reward in zip(leaves, results):
+            self.playouts += 1
+            for node in path[1:]:
+                node.value += reward[node.color]
+
+    def principalVariation(self):
+        """Returns the most visited moves from the root."""
+        pv = []
+        node = self.root.mostVisited()
+        while node is not None:
+            pv.append(node.move)
+            node = node.mostVisited()
+        return pv
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Iterative deepening alpha-beta search for the Teams variant. Red and yellow play against blue and green, and
+the teams alternate every ply (red, blue, yellow, green), so the game tree is searched as a two-sided negamax tree
+with scores from the point of view of the team to move."""
+
+from random import Random
+from threading import Thread
+from time import perf_counter
+from core.board import Board, drawPlies, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, mailboxIndex
+from core.geometry import bishopAttacks, rookAttacks
+from core.evaluation import evaluate, materialValues
+from core.transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+# Piece values in centipawns, indexed by piece type (PAWN to KING)
+pieceValues = [0] * PAWN + [materialValues[char] for char in 'PNBRQK']
+
+MATE = 100000  # Score of checkmate at the root; mate in n plies scores MATE - n
+INFINITE = MATE + 1
+MAX_PLY = 128
+
+
+def inCheck(board, color):
+    """Returns True if the king of player color is attacked by an opponent or was captured, such that a player
+    without king and without legal moves is checkmated rather than stalemated."""
+    king = board.pieceBB[color] & board.pieceBB[KING]
+    return not king or bool(board.opponentAttackers(king.bit_length() - 1, color, board.occupiedBB))
+
+
+def scoreToTable(score, ply):
+    """Returns score to store in the transposition table: mate scores relative to the position instead of the
+    root."""
+    if score >= MATE - MAX_PLY:
+        return score + ply
+    if score <= -MATE + MAX_PLY:
+        return score - ply
+    return score
+
+
+def scoreFromTable(score, ply):
+    """Returns score from the transposition table relative to the root (inverse of scoreToTable())."""
+    if score >= MATE - MAX_PLY:
+        return score - ply
+    if score <= -MATE + MAX_PLY:
+        return score + ply
+    return score
+
+
+def isCapture(move):
+    """Returns True if packed integer move captures an opponent piece (castling moves carry their own rook)."""
+    return bool(move >> 22 & 63) and not move >> 28
+
+
+def captureOrder(move):
+    """Sort key of captures: most valuable victim first, least valuable attacker first."""
+    return (move >> 16 & 63) - ((move >> 24 & 15) << 6)
+
+
+def see(board, move):
+    """Returns static exchange evaluation of packed integer capture move: the material balance in centipawns for the
+    team of the capturing player if the pieces attacking the target square recapture in turn, least valuable piece
+    first, and each side may stop capturing when it would lose material. The players take turns: after a capture,
+    the next recapture is made by the first opponent of the capturing player in turn order who attacks the square.
+    Attackers behind a capturing piece (x-rays) join the exchange. A king only recaptures if the square is no longer
+    attacked."""
+    pieceBB = board.pieceBB
+    target = move >> 8 & 255
+    player = move >> 16 & 3
+    piece = move >> 18 & 15  # Piece on target square, to be captured next
+    gain = [pieceValues[move >> 24 & 15]]
+    occupied = board.occupiedBB ^ 1 << (move & 255)
+    attackers = board.attackers(target, occupied)
+    diagonal = pieceBB[BISHOP] | pieceBB[QUEEN]
+    straight = pieceBB[ROOK] | pieceBB[QUEEN]
+    while True:
+        # Next player to recapture: the next opponent, or else the opponent after the partner
+        own = attackers & pieceBB[(player + 1) % 4]
+        if own:
+            player = (player + 1) % 4
+        else:
+            own = attackers & pieceBB[(player + 3) % 4]
+            if not own:
+                break
+            player = (player + 3) % 4
+        for attacker in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING):
+            if own & pieceBB[attacker]:
+                break
+        if attacker == KING and attackers & (pieceBB[(player + 1) % 4] | pieceBB[(player + 3) % 4]):
+            break  # King cannot capture on an attacked square
+        gain.append(pieceValues[piece] - gain[-1])
+        piece = attacker
+        own &= pieceBB[attacker]
+        occupied ^= own & -own
+        attackers &= occupied
+        # Reveal x-ray attackers behind the capturing piece
+        if attacker in (PAWN, BISHOP, QUEEN):
+            attackers |= bishopAttacks(target, occupied) & diagonal & occupied
+        if attacker in (ROOK, QUEEN):
+            attackers |= rookAttacks(target, occupied) & straight & occupied
+    # Each side chooses between stopping and continuing the exchange, from the last capture back to the first
+    for index in range(len(gain) - 1, 0, -1):
+        gain[index - 1] = -max(-gain[index - 1], gain[index])
+    return gain[0]
+
+
+def losingCapture(board, move):
+    """Returns True if capture move loses material by static exchange evaluation. Captures of a piece of at least
+    the value of the capturing piece are never losing and need no exchange evaluation."""
+    return pieceValues[move >> 24 & 15] < pieceValues[move >> 18 & 15] and see(board, move) < 0
+
+
+def hangingPieces(board):
+    """Returns bitboard of pieces that an opponent can capture winning material, i.e. by a legal capture with a
+    positive static exchange evaluation."""
+    hanging = 0
+    for color in range(4):
+        for move in board.generateMoves(color):
+            if isCapture(move) and not hanging & 1 << (move >> 8 & 255) and see(board, move) > 0:
+                hanging |= 1 << (move >> 8 & 255)
+    return hanging
+
+
+def historyIndex(move):
+    """Returns index of packed integer move in the history table: color, target and origin square."""
+    return (move >> 16 & 3) << 16 | move & 0xffff
+
+
+class MoveOrdering:
+    """Staged move ordering: moves() yields the moves of a position lazily in the order hash move, captures that do
+    not lose material (most valuable victim, least valuable attacker), killer moves (quiet moves that caused a
+    cutoff at the same ply), remaining quiet moves by history score, then losing captures (see see()). Quiet moves
+    are only generated when the hash move and captures did not cause a cutoff. If random is given, quiet moves of
+    equal history score are shuffled (helper searches, see Search). Without exchange, captures are not evaluated by
+    static exchange evaluation, which assumes the Teams variant."""
+    def __init__(self, random=None, exchange=True):
+        super().__init__()
+        self.random = random
+        self.exchange = exchange
+        self.killers = [[0, 0] for _ in range(MAX_PLY + 1)]
+        self.history = [0] * (4 << 16)  # Indexed by historyIndex()
+        self.cutoffs = 0
+        self.firstMoveCutoffs = 0
+
+    def newSearch(self):
+        """Clears killer moves, ages history scores and resets statistics."""
+        self.killers = [[0, 0] for _ in range(MAX_PLY + 1)]
+        self.history = [score >> 1 for score in self.history]
+        self.cutoffs = 0
+        self.firstMoveCutoffs = 0
+
+    def moves(self, board, colors, hashMove, ply):
+        """Yields legal moves of players colors (usually only the player to move) in board in search order. hashMove
+        (0 if none) is taken from the transposition table and must belong to the position."""
+        boardData = board.boardData
+        # A hash move from a different position (hash collision) is unlikely, but would not match the board
+        if hashMove and hashMove >> 16 & 3 in colors and \
+                boardData[mailboxIndex[hashMove & 255]] == hashMove >> 16 & 63 and \
+                boardData[mailboxIndex[hashMove >> 8 & 255]] == hashMove >> 22 & 63:
+            yield hashMove
+        else:
+            hashMove = 0
+        losing = []
+        captures = []
+        for color in colors:
+            captures += board.generateMoves(color, quiets=False)
+        for move in sorted(captures, key=captureOrder):
+            if move == hashMove:
+                continue
+            if self.exchange and losingCapture(board, move):
+                losing.append(move)
+            else:
+                yield move
+        quiets = []
+        for color in colors:
+            quiets += board.generateMoves(color, captures=False)
+        killers = self.killers[ply]
+        for killer in killers:
+            if killer and killer != hashMove and killer in quiets:
+                yield killer
+        if self.random is not None:
+            self.random.shuffle(quiets)
+        history = self.history
+        quiets.sort(key=lambda move: history[historyIndex(move)], reverse=True)
+        for move in quiets:
+            if move != hashMove and move not in killers:
+                yield move
+        yield from losing
+
+    def cutoff(self, move, depth, ply, count):
+        """Records beta cutoff by move at depth and ply, the count-th move searched. A quiet move becomes a killer
+        move of the ply and its history score increases by depth squared."""
+        self.cutoffs += 1
+        if count == 1:
+            self.firstMoveCutoffs += 1
+        if isCapture(move):
+            return
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[historyIndex(move)] += depth * depth
+
+    def firstMoveCutoffRate(self):
+        """Returns fraction of beta cutoffs caused by the first move searched."""
+        return self.firstMoveCutoffs / self.cutoffs if self.cutoffs else 0.
+
+
+class StopSearch(Exception):
+    """Raised inside the search when it is stopped or a node or time limit is reached."""
+
+
+class Search:
+    """Iterative deepening alpha-beta (negamax) search with quiescence search of captures. The search works on its
+    own copy of the board, so the board passed in (e.g. the Qt board) is never changed and sends no notifications.
+    After each completed iteration onInfo() is called; the Qt analysis worker overrides it to emit a signal. The
+    transposition table of hashSize MB is kept between searches; it is stored in buffer, if given (see
+    TranspositionTable.share()). Moves are ordered by MoveOrdering. A helper search (helper > 0) of a parallel search
+    (core/smp.py) shuffles quiet moves of equal history score and odd helpers skip the first iteration, such that
+    helpers sharing a table search different parts of the tree."""
+    def __init__(self, hashSize=16, helper=0, buffer=None):
+        super().__init__()
+        self.board = None
+        self.nodes = 0
+        self.depth = 0  # Depth of last completed iteration
+        self.score = 0
+        self.pv = []  # Principal variation of last completed iteration (packed integer moves)
+        self.elapsed = 0.
+        self.stopped = False
+        self.nodeLimit = None
+        self.deadline = None
+        self.start = 0.
+        self.tt = TranspositionTable(hashSize, buffer)
+        self.pvTable = [[] for _ in range(MAX_PLY + 1)]
+        self.helper = helper
+        self.ordering = MoveOrdering(Random(helper) if helper else None)
+
+    def onInfo(self, depth, score, nodes, nps, pv):
+        """Called after each completed iteration with depth, score (centipawns, from the point of view of the team to
+        move), nodes searched, nodes per second and principal variation."""
+        pass
+
+    def nps(self):
+        """Returns nodes per second of the last search."""
+        return int(self.nodes / self.elapsed) if self.elapsed else 0
+
+    def stop(self):
+        """Stops the search (e.g. from another thread). search() returns the result of the last completed
+        iteration."""
+        self.stopped = True
+
+    def close(self):
+        """Frees resources held by the search, e.g. processes and shared memory of a parallel search."""
+        pass
+
+    def search(self, board, depth=None, nodes=None, movetime=None):
+        """Searches position of board with player board.turn to move, until depth is reached, the number of nodes or
+        the time in seconds is exceeded, or stop() is called. Without limits, searches until stopped. Returns best
+        move (None if there is no legal move) and its score."""
+        self.board = board.copy()
+        self.nodes = 0
+        self.depth = 0
+        self.score = 0
+        self.pv = []
+        self.stopped = False
+        self.nodeLimit = nodes
+        self.start = perf_counter()
+        self.deadline = self.start + movetime if movetime is not None else None
+        self.tt.newSearch()
+        self.tt.resetStats()
+        self.ordering.newSearch()
+        color = self.board.turn
+        rootMoves = self.board.generateMoves(color)
+        if not rootMoves:
+            self.score = -MATE if inCheck(self.board, color) else 0
+            return None, self.score
+        self.pv = [next(self.ordering.moves(self.board, (color,), 0, 0))]
+        iteration = 1 + (self.helper & 1)
+        while depth is None or iteration <= depth:
+            try:
+                score = self.alphaBeta(iteration, 0, -INFINITE, INFINITE)
+            except StopSearch:
+                break
+            self.depth = iteration
+            self.score = score
+            self.pv = self.pvTable[0][:]
+            self.elapsed = perf_counter() - self.start
+            self.onInfo(self.depth, self.score, self.nodes, self.nps(), self.pv)
+            if abs(score) >= MATE - MAX_PLY or iteration >= MAX_PLY:
+                break  # Forced mate found
+            iteration += 1
+        self.elapsed = perf_counter() - self.start
+        return self.pv[0], self.score
+
+    def checkLimits(self):
+        """Raises StopSearch if the search is stopped or a limit is exceeded. Time is checked every 1024 nodes."""
+        if self.stopped:
+            raise StopSearch
+        if self.nodeLimit is not None and self.nodes >= self.nodeLimit:
+            raise StopSearch
+        if self.deadline is not None and not self.nodes & 1023 and perf_counter() >= self.deadline:
+            self.stopped = True
+            raise StopSearch
+
+    def alphaBeta(self, depth, ply, alpha, beta):
+        """Returns score of position from the point of view of the team to move, searched to depth."""
+        if depth <= 0:
+            return self.quiescence(ply, alpha, beta)
+        self.nodes += 1
+        self.checkLimits()
+        board = self.board
+        color = board.turn
+        pvTable = self.pvTable
+        pvTable[ply] = []
+        # Draw if the position occurred before (in the game or the search), as the players could repeat it again, or
+        # by the move count rule. Not stored in the transposition table, since it depends on the path
+        if ply and (board.hash in board.positionCounts or board.halfmoveClock >= drawPlies):
+            return 0
+        hashMove = 0
+        entry = self.tt.probe(board.hash)
+        if entry is not None:
+            hashMove, entryDepth, bound, score = entry
+            # No cutoff at the root, which must return a move and principal variation
+            if ply and entryDepth >= depth:
+                score = scoreFromTable(score, ply)
+                if bound == EXACT or (bound == LOWER and score >= beta) or (bound == UPPER and score <= alpha):
+                    if hashMove:
+                        pvTable[ply] = [hashMove]
+                    return score
+        if ply >= MAX_PLY:
+            return evaluate(board, color)
+        alphaOrig = alpha
+        bestMove = 0
+        count = 0
+        for move in self.ordering.moves(board, (color,), hashMove, ply):
+            count += 1
+            board.makeMove(move)
+            score = -self.alphaBeta(depth - 1, ply + 1, -beta, -alpha)
+            board.unmakeMove()
+            if score > alpha:
+                alpha = score
+                bestMove = move
+                pvTable[ply] = [move] + pvTable[ply + 1]
+                if score >= beta:
+                    self.ordering.cutoff(move, depth, ply, count)
+                    break
+        if not count:
+            return -MATE + ply if inCheck(board, color) else 0
+        if alpha >= beta:
+            bound = LOWER
+        elif alpha > alphaOrig:
+            bound = EXACT
+        else:
+            bound = UPPER
+        self.tt.store(board.hash, bestMove, depth, bound, scoreToTable(alpha, ply))
+        return alpha
+
+    def quiescence(self, ply, alpha, beta):
+        """Returns score of position searching captures only, to avoid evaluating positions in the middle of an
+        exchange. The player to move may stand pat (decline to capture). Captures losing material by static exchange
+        evaluation are pruned. In check there is no standing pat: all evasions are searched, captures first, and
+        without any the player is checkmated."""
+        self.nodes += 1
+        self.checkLimits()
+        board = self.board
+        color = board.turn
+        self.pvTable[ply] = []
+        evading = inCheck(board, color)
+        if evading:
+            moves = board.generateMoves(color)
+            if not moves:
+                return -MATE + ply
+            if ply >= MAX_PLY:
+                return evaluate(board, color)
+            captures = sorted((move for move in moves if isCapture(move)), key=captureOrder)
+            moves = captures + [move for move in moves if not isCapture(move)]
+        else:
+            standPat = evaluate(board, color)
+            if standPat >= beta or ply >= MAX_PLY:
+                return standPat
+            alpha = max(alpha, standPat)
+            moves = sorted(board.generateMoves(color, quiets=False), key=captureOrder)
+        for move in moves:
+            if not evading and losingCapture(board, move):
+                continue
+            board.makeMove(move)
+            score = -self.quiescence(ply + 1, -beta, -alpha)
+            board.unmakeMove()
+            if score > alpha:
+                alpha = score
+                if score >= beta:
+                    break
+        return alpha
+
+
+def serve(commands, results, hashSize=16, search=None):
+    """Main loop of an analysis worker process, searching with search (by default a new Search with a table of
+    hashSize MB). Receives commands over connection commands and sends results over connection results (see
+    multiprocessing.Pipe()):
+
+        ('go', id, snapshot, depth, nodes, movetime)  search position snapshot (see Board.snapshot()) with limits
+        ('stop',)                                     stop the current search
+        ('quit',)                                     stop the current search and return
+
+        ('info', id, depth, score, nodes, nps, pv)    after each completed iteration
+        ('bestmove', id, move, score, nodes)          when a search ends (also when stopped)
+
+    The search runs in a thread, such that stop commands are received while it is searching."""
+    if search is None:
+        search = Search(hashSize)
+    thread = None
+
+    def run(searchId, snapshot, depth, nodes, movetime):
+        board = Board(14, 14)
+        board.restore(snapshot)
+        search.onInfo = lambda *info: results.send(('info', searchId) + info)
+        move, score = search.search(board, depth, nodes, movetime)
+        results.send(('bestmove', searchId, move, score, search.nodes))
+
+    while True:
+        try:
+            command = commands.recv()
+        except EOFError:
+            command = ('quit',)
+        if thread is not None:
+            # Repeat stop, in case the search had not started yet (search() resets the stopped flag)
+            while thread.is_alive():
+                search.stop()
+                thread.join(0.01)
+            thread = None
+        if command[0] == 'go':
+            thread = Thread(target=run, args=command[1:])
+            thread.start()
+        elif command[0] == 'quit':
+            return
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Lazy SMP: parallel search in several processes sharing one transposition table. A single process cannot use more
+than one core for the search because of the GIL. The main search runs in the calling process; helper processes run
+the same iterative deepening on the same position with perturbed move ordering (see Search) until the main search
+ends, and only contribute through the entries they store in the shared table. Requires Python 3.8 or later
+(multiprocessing.shared_memory)."""
+
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from core.search import Search, serve
+from core.transposition import tableSize
+
+
+def helperProcess(commands, results, memoryName, hashSize, helper):
+    """Runs helper search number helper on the shared table in shared memory block memoryName."""
+    memory = SharedMemory(memoryName)
+    search = Search(hashSize, helper, memory.buf)
+    try:
+        serve(commands, results, search=search)
+    finally:
+        search.tt.release()
+        memory.close()
+
+
+class ParallelSearch(Search):
+    """Search with workers - 1 helper processes sharing its transposition table of hashSize MB. After a search,
+    nodes is the total of all workers; during the search (onInfo()) it counts the main search only. close() must be
+    called to stop the helpers and free the shared memory."""
+    def __init__(self, workers=2, hashSize=16):
+        self.memory = SharedMemory(create=True, size=tableSize(hashSize))
+        super().__init__(hashSize, buffer=self.memory.buf)
+        self.workers = workers
+        self.helpers = []  # (process, commands, results)
+        self.searchId = 0
+        context = get_context('spawn')  # Do not fork a possibly multithreaded (or Qt) process
+        for helper in range(1, workers):
+            childCommands, commands = context.Pipe(duplex=False)  # (receiving end, sending end)
+            results, childResults = context.Pipe(duplex=False)
+            process = context.Process(target=helperProcess, daemon=True,
+                                      args=(childCommands, childResults, self.memory.name, hashSize, helper))
+            process.start()
+            childCommands.close()
+            childResults.close()
+            self.helpers.append((process, commands, results))
+
+    def search(self, board, depth=None, nodes=None, movetime=None):
+        """Searches like Search.search(), with the helpers searching the same position until the main search
+        ends. Helpers whose process died are dropped; the result is that of the main search."""
+        self.searchId += 1
+        snapshot = board.snapshot()
+        searching = []
+        for helper in self.helpers[:]:
+            try:
+                helper[1].send(('go', self.searchId, snapshot, None, None, None))
+                searching.append(helper)
+            except OSError:  # BrokenPipeError: the helper process died
+                self.dropHelper(helper)
+        try:
+            move, score = super().search(board, depth, nodes, movetime)
+        finally:
+            for helper in searching[:]:
+                try:
+                    helper[1].send(('stop',))
+                except OSError:
+                    searching.remove(helper)
+                    self.dropHelper(helper)
+            for helper in searching:
+                try:
+                    while True:
+                        result = helper[2].recv()
+                        if result[0] == 'bestmove' and result[1] == self.searchId:
+                            self.nodes += result[4]
+                            break
+                except (EOFError, OSError):  # The helper process died
+                    self.dropHelper(helper)
+        return move, score
+
+    def dropHelper(self, helper):
+        """Removes helper (process, commands, results) whose process died, such that searches no longer wait for
+        it."""
+        process, commands, results = helper
+        self.helpers.remove(helper)
+        commands.close()
+        results.close()
+        process.join()
+
+    def close(self):
+        """Stops the helper processes and frees the shared memory."""
+        for process, commands, results in self.helpers:
+            commands.send(('quit',))
+        for process, commands, results in self.helpers:
+            process.join()
+        self.helpers = []
+        self.tt.release()
+        self.memory.close()
+        self.memory.unlink()
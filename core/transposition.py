@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Transposition table keyed by the Zobrist hash of the position (Board.hash), stored in two preallocated flat
+arrays of unsigned 64-bit integers (array module, or a buffer shared between processes): one with the packed entry
+
+    move | depth << 30 | bound << 38 | (score + SCORE_OFFSET) << 40 | generation << 58
+
+where move is a packed integer move (see Board.encodeMove()), 0 if none, and one with the full hash of the position
+XOR the packed entry. A probe only accepts an entry if both words belong together, so processes sharing the table
+need no locks: an entry torn by simultaneous writes to the same slot does not verify and reads as a miss. Each bucket
+has two entries: the first is replaced only by a search of at least the same depth or by a newer search
+(depth-preferred), the second is always replaced."""
+
+from array import array
+
+NONE, EXACT, LOWER, UPPER = range(4)  # Bound types: score is exact, a lower bound (fail high) or an upper bound
+
+SCORE_OFFSET = 1 << 17  # Scores are stored as unsigned 18-bit integers
+ENTRY_SIZE = 16  # Bytes per entry: hash and packed entry
+MOVE_MASK = (1 << 30) - 1
+FILL_SAMPLE = 4096  # Entries sampled by fillRatio()
+
+
+def bucketCount(sizeMB):
+    """Returns number of buckets of a table of at most sizeMB megabytes, a power of two."""
+    buckets = 1
+    while buckets * 4 * ENTRY_SIZE <= sizeMB * (1 << 20):
+        buckets *= 2
+    return buckets
+
+
+def tableSize(sizeMB):
+    """Returns size in bytes of the buffer of a table of sizeMB megabytes (see TranspositionTable.share())."""
+    return bucketCount(sizeMB) * 2 * ENTRY_SIZE
+
+
+class TranspositionTable:
+    """Fixed-size transposition table with depth-preferred/always-replace buckets and a size given in MB. If buffer
+    is given, e.g. multiprocessing shared memory, the table is stored in it instead (see share())."""
+    def __init__(self, sizeMB=16, buffer=None):
+        super().__init__()
+        self.keys = array('Q')
+        self.entries = array('Q')
+        self.views = []  # Memoryviews of a shared buffer, to be released before it is closed
+        self.mask = 0
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.collisions = 0  # Stores that replaced an entry of a different position
+        if buffer is None:
+            self.resize(sizeMB)
+        else:
+            self.share(buffer, sizeMB)
+
+    def resize(self, sizeMB):
+        """Allocates an empty table of at most sizeMB megabytes. The number of buckets is a power of two."""
+        self.release()
+        self.mask = bucketCount(sizeMB) - 1
+        self.clear()
+
+    def share(self, buffer, sizeMB):
+        """Stores the table of sizeMB megabytes in buffer (of at least tableSize(sizeMB) bytes, e.g. the buf of a
+        multiprocessing.shared_memory.SharedMemory) instead of own arrays. Entries already in buffer are kept, such
+        that several processes can attach to the same table."""
+        self.release()
+        self.mask = bucketCount(sizeMB) - 1
+        size = (self.mask + 1) * 2
+        data = memoryview(buffer)[:size * 2 * 8]
+        words = data.cast('Q')
+        self.views = [data, words]
+        self.entries = words[:size]
+        self.keys = words[size:]
+        self.views += [self.entries, self.keys]
+        self.generation = 0
+        self.resetStats()
+
+    def release(self):
+        """Releases the shared buffer, if any, such that its owner can close it. The table is empty afterwards."""
+        for view in reversed(self.views):
+            view.release()
+        self.views = []
+        self.keys = array('Q')
+        self.entries = array('Q')
+
+    def clear(self):
+        """Removes all entries and resets statistics. A shared buffer is cleared for all processes."""
+        size = (self.mask + 1) * 2
+        if self.views:
+            self.views[0][:] = bytes(len(self.views[0]))
+        else:
+            self.keys = array('Q', bytes(size * 8))
+            self.entries = array('Q', bytes(size * 8))
+        self.generation = 0
+        self.resetStats()
+
+    def resetStats(self):
+        """Resets probe and store counters."""
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.collisions = 0
+
+    def newSearch(self):
+        """Starts a new search: entries of older searches are replaced first."""
+        self.generation = (self.generation + 1) & 63
+
+    def probe(self, hash_):
+        """Returns (move, depth, bound, score) of the entry of position hash_, or None if not found."""
+        self.probes += 1
+        index = (hash_ & self.mask) << 1
+        keys = self.keys
+        entries = self.entries
+        data = entries[index]
+        if not data or keys[index] ^ data != hash_:
+            data = entries[index + 1]
+            if not data or keys[index + 1] ^ data != hash_:
+                return None
+        self.hits += 1
+        return data & MOVE_MASK, data >> 30 & 255, data >> 38 & 3, (data >> 40 & 0x3ffff) - SCORE_OFFSET
+
+    def store(self, hash_, move, depth, bound, score):
+        """Stores search result of position hash_. The depth-preferred entry of the bucket is used if the position is
+        already there, or if it is empty, from an older search or of lower or equal depth; otherwise the always-replace
+        entry. A stored best move is kept if move is 0."""
+        self.stores += 1
+        index = (hash_ & self.mask) << 1
+        keys = self.keys
+        entries = self.entries
+        preferred = entries[index]
+        if not (keys[index] ^ preferred == hash_ or not preferred or preferred >> 58 != self.generation or
+                depth >= preferred >> 30 & 255):
+            index += 1
+        old = entries[index]
+        if old:
+            if keys[index] ^ old != hash_:
+                self.collisions += 1
+            elif not move:
+                move = old & MOVE_MASK
+        data = move | min(depth, 255) << 30 | bound << 38 | (score + SCORE_OFFSET) << 40 | self.generation << 58
+        entries[index] = data
+        keys[index] = hash_ ^ data
+
+    def hitRate(self):
+        """Returns fraction of probes that found the position."""
+        return self.hits / self.probes if self.probes else 0.
+
+    def collisionRate(self):
+        """Returns fraction of stores that replaced an entry of a different position."""
+        return self.collisions / self.stores if self.stores else 0.
+
+    def fillRatio(self):
+        """Returns fraction of entries in use, estimated from the first FILL_SAMPLE entries (like the hashfull of UCI
+        engines), such that entries stored by all processes sharing the table count."""
+        sample = self.entries[:FILL_SAMPLE]
+        return sum(1 for data in sample if data) / len(sample) if len(sample) else 0.
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the Four-Player Chess project, a four-player chess GUI.
+#
+# Copyright (C) 2018, GammaDeltaII
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from multiprocessing import get_context
+from PyQt5.QtCore import QThread, pyqtSignal
+from core.board import Board
+from core.mate import MateSolver
+from core.search import serve
+
+
+def analysisProcess(commands, results, hashSize):
+    """Runs the search process (core.search.serve()) at lower priority, such that the GUI stays responsive when both
+    have to share a CPU core."""
+    if hasattr(os, 'nice'):
+        os.nice(10)
+    serve(commands, results, hashSize)
+
+
+def mateProcess(connection, snapshot, moves, nodes, hashSize):
+    """Solves position snapshot for a forced mate in at most moves (see core.mate.MateSolver) at lower priority and
+    sends (result, line) over connection."""
+    if hasattr(os, 'nice'):
+        os.nice(10)
+    board = Board(14, 14)
+    board.restore(snapshot)
+    connection.send(MateSolver(hashSize).solve(board, moves, nodes))
+
+
+class AnalysisWorker(QThread):
+    """Analyzes positions off the GUI thread. The search runs in a separate process (core.search.serve()), such that
+    it does not hold the GIL of the GUI process; this thread only waits for its results and emits them as signals,
+    which are queued to the receivers in the GUI thread. Results of a cancelled or superseded search are dropped;
+    since a signal may already be queued when the next search starts, the signals carry the search id returned by
+    analyze(), such that receivers can drop them too."""
+    info = pyqtSignal(int, int, int, int, int, list)  # search id, depth, score, nodes, nps, principal variation
+    bestMove = pyqtSignal(int, int, int)  # search id, move (0 if none), score
+
+    def __init__(self, hashSize=16):
+        super().__init__()
+        self.hashSize = hashSize
+        self.process = None
+        self.commands = None
+        self.results = None
+        self.searchId = 0
+
+    def startProcess(self):
+        """Starts the search process and this thread to receive its results."""
+        context = get_context('spawn')  # Do not fork the Qt application
+        childCommands, self.commands = context.Pipe(duplex=False)  # (receiving end, sending end)
+        self.results, childResults = context.Pipe(duplex=False)
+        self.process = context.Process(target=analysisProcess, args=(childCommands, childResults, self.hashSize),
+                                       daemon=True)
+        self.process.start()
+        # Close the child's ends in this process, such that recv() raises EOFError when the process exits
+        childCommands.close()
+        childResults.close()
+        self.start()
+
+    def analyze(self, snapshot, depth=None, nodes=None, movetime=None):
+        """Stops the current search, if any, and starts analyzing position snapshot (see Board.snapshot()). Without
+        limits, analyzes until cancelled. Returns the id of the search."""
+        if self.process is None:
+            self.startProcess()
+        self.searchId += 1
+        self.commands.send(('go', self.searchId, snapshot, depth, nodes, movetime))
+        return self.searchId
+
+    def cancel(self):
+        """Stops the current search. Results still underway are dropped."""
+        if self.process is not None:
+            self.searchId += 1
+            self.commands.send(('stop',))
+
+    def shutdown(self):
+        """Stops the search process and waits for this thread to finish."""
+        if self.process is not None:
+            self.searchId += 1
+            self.commands.send(('quit',))
+            self.wait()
+            self.process.join()
+            self.process = None
+
+    def run(self):
+        """Receives results from the search process and emits those of the current search."""
+        while True:
+            try:
+                result = self.results.recv()
+            except EOFError:
+                return
+            if result[1] != self.searchId:
+                continue
+            if result[0] == 'info':
+                self.info.emit(*result[1:])
+            elif result[0] == 'bestmove':
+                self.bestMove.emit(result[1], result[2] or 0, result[3])
+
+
+class MateWorker(QThread):
+    """Searches for a forced mate off the GUI thread, in a separate process per search (see mateProcess()), and emits
+    the result as a signal."""
+    solved = pyqtSignal(int, list)  # result (core.mate.PROVEN, DISPROVEN or UNKNOWN), mating line
+
+    def __init__(self, hashSize=16):
+        super().__init__()
+        self.hashSize = hashSize
+        self.process = None
+        self.connection = None
+
+    def solve(self, snapshot, moves, nodes=None):
+        """Cancels the current search, if any, and starts searching position snapshot (see Board.snapshot()) for a
+        forced mate in at most moves of the team to move, within nodes nodes."""
+        self.cancel()
+        context = get_context('spawn')  # Do not fork the Qt application
+        self.connection, childConnection = context.Pipe(duplex=False)  # (receiving end, sending end)
+        self.process = context.Process(target=mateProcess, daemon=True,
+                                       args=(childConnection, snapshot, moves, nodes, self.hashSize))
+        self.process.start()
+        childConnection.close()
+        self.start()
+
+    def cancel(self):
+        """Stops the current search without emitting its result."""
+        if self.process is not None:
+            self.process.terminate()
+            self.wait()
+            self.process.join()
+            self.process = None
+
+    def run(self):
+        """Waits for the result of the search process and emits it."""
+        try:
+            result, line = self.connection.recv()
+        except EOFError:
+            return  # Cancelled
+        self.solved.emit(result, line)
@@ -19,14 +19,19 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from PyQt5.QtWidgets import QMainWindow, QSizePolicy, QLayout, QListWidget, QListWidgetItem, QListView, QFrame, \
-    QFileDialog, QMenu, QAction, QDialog, QDialogButtonBox, QScrollArea
-from PyQt5.QtCore import Qt, QSize, QPoint, QRect, QSettings, QUrl
+    QFileDialog, QMenu, QAction, QDialog, QDialogButtonBox, QScrollArea, QInputDialog
+from PyQt5.QtCore import Qt, QSize, QPoint, QRect, QSettings, QUrl, QTimer
 from PyQt5.QtGui import QIcon, QColor, QFont, QFontMetrics, QPainter, QDesktopServices
 from ui.mainwindow import Ui_MainWindow
 from ui.settings import Ui_Preferences
 from ui.infodialog import Ui_InfoDialog
 from gui.algorithm import Teams
+from gui.analysis import AnalysisWorker, MateWorker
 from gui.view import Comment
+from core.board import RED, YELLOW, BLUE, GREEN
+from core.search import MATE, MAX_PLY, hangingPieces
+from core.mate import PROVEN, DISPROVEN
+from collections import OrderedDict
 from urllib import request
 import certifi
 from re import compile
@@ -47,6 +52,12 @@ VERSION = MAJOR + '.' + MINOR + '.' + PATCH + PRE_RELEASE
 
 class MainWindow(QMainWindow, Ui_MainWindow):
     """The application main window. The imported UI code is generated by PyQt5 from reading the Qt Creator .ui file."""
+    # Arrow colors of the engine's best line per player, fading with each ply
+    analysisColors = {RED: '#ab272f', BLUE: '#2d71ab', YELLOW: '#ac8112', GREEN: '#3a7d4d'}
+    analysisAlpha = (224, 160, 112, 80)
+    mateNodes = 1000000  # Node limit of the mate solver
+    analysisCacheSize = 1000  # Positions whose analysis result is kept, least recently used dropped first
+
     def __init__(self):
         super().__init__()
         self.setupUi(self)
@@ -57,6 +68,22 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         # Create algorithm instance (view instance is already created in UI code)
         self.algorithm = Teams()
 
+        # Create analysis worker (the search process is started when analysis is first switched on)
+        self.analysis = AnalysisWorker()
+        self.analysisHash = None  # Hash of analyzed position, None if not analyzing
+        self.analysisId = None  # Search id of the analysis of the position, None if not analyzing
+        self.analysisTurn = RED  # Player to move in analyzed position
+        self.analysisCache = OrderedDict()  # Deepest result per position hash: (turn, depth, score, nodes, nps, pv)
+        self.mate = MateWorker()
+        self.mateHash = None  # Hash of position searched for mate, None if not searching
+        self.mateLineHash = None  # Hash of position whose mating line is shown, None if none
+        self.mateMoves = 3
+
+        # Single-shot timer to analyze the position once control returns to the event loop, such that loading a game
+        # (which generates a FEN4 for every move) analyzes only the final position
+        self.positionTimer = QTimer(self)
+        self.positionTimer.setSingleShot(True)
+
         # Create comment label
         self.comment = Comment()
         self.comment.setParent(self.moveListTab)
@@ -98,6 +125,13 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.view.pieceMoved.connect(self.movePiece)
         self.commentField.focusOut.connect(self.setComment)
         self.algorithm.cannotReadPgn4.connect(self.pgnParseError)
+        self.algorithm.fen4Generated.connect(lambda: self.positionTimer.start())  # Position may have changed
+        self.positionTimer.timeout.connect(self.analyzePosition)
+        self.positionTimer.timeout.connect(self.showHangingPieces)
+        self.analysis.info.connect(self.showAnalysis)
+        self.analysis.bestMove.connect(self.showBestMove)
+        self.mate.solved.connect(self.showMate)
+        self.algorithm.fen4Generated.connect(self.clearMate)
 
         # Connect menu actions
         self.actionCheck_for_Updates.triggered.connect(self.checkUpdate)
@@ -118,6 +152,11 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.actionRotate_Board_Left.triggered.connect(lambda: self.view.rotateBoard(-1))
         self.actionRotate_Board_Right.triggered.connect(lambda: self.view.rotateBoard(1))
         self.actionFlip_Board.triggered.connect(lambda: self.view.rotateBoard(2))
+        self.actionAnalyze.toggled.connect(self.toggleAnalysis)
+        self.actionAnalyze.toggled.connect(self.analyzeButton.setChecked)
+        self.analyzeButton.toggled.connect(self.actionAnalyze.setChecked)
+        self.actionShow_Hanging_Pieces.toggled.connect(self.showHangingPieces)
+        self.actionFind_Mate.triggered.connect(self.findMate)
         self.actionAbout.triggered.connect(self.about)
         self.actionAbout_PyQt.triggered.connect(self.aboutPyQt)
         self.actionQuick_Reference.triggered.connect(self.quickReference)
@@ -333,7 +372,9 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.view.removeLegalMoveIndicators()
             moved = False
             if square != self.clickPoint:
+                self.cancelAnalysis()  # Cancel on move, resumed below if the move is not made
                 moved = self.algorithm.makeMove(self.clickPoint.x(), self.clickPoint.y(), square.x(), square.y())
+                self.analyzePosition()
             self.clickPoint = QPoint()
             if not moved:
                 self.view.removeHighlight(self.selectedSquare)
@@ -390,7 +431,9 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             color = QColor('#334e9161')
         else:
             color = QColor('#00000000')
+        self.cancelAnalysis()  # Cancel on move, resumed below if the move is not made
         moved = self.algorithm.makeMove(fromSquare.x(), fromSquare.y(), toSquare.x(), toSquare.y())
+        self.analyzePosition()
         if not moved:
             self.view.removeHighlight(self.selectedSquare)
             self.view.maskedSquare = None
@@ -413,6 +456,148 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.moveHighlight = 0
         self.selectedSquare = 0
 
+    def toggleAnalysis(self, checked):
+        """Starts or stops analysis of the current position."""
+        if checked:
+            self.analyzePosition()
+        else:
+            self.cancelAnalysis()
+            self.analysisField.clear()
+            self.view.setAnalysisArrows([])
+
+    def analyzePosition(self):
+        """Starts analysis of the current position if analysis is on and the position is not being analyzed yet. The
+        previous search is stopped by the worker. A cached result of the position is shown immediately; the search
+        itself starts from the transposition table the worker keeps between searches."""
+        board = self.algorithm.board
+        if not self.actionAnalyze.isChecked() or board.hash == self.analysisHash:
+            return
+        self.analysisHash = board.hash
+        self.analysisTurn = board.turn
+        if board.hash in self.analysisCache:
+            self.analysisCache.move_to_end(board.hash)
+            self.displayAnalysis(*self.analysisCache[board.hash])
+        else:
+            self.analysisField.clear()
+            self.view.setAnalysisArrows([])
+        self.analysisId = self.analysis.analyze(board.snapshot())
+
+    def cancelAnalysis(self):
+        """Stops analysis. Results of the cancelled search are no longer shown."""
+        self.analysis.cancel()
+        self.analysisHash = None
+        self.analysisId = None
+
+    def showAnalysis(self, searchId, depth, score, nodes, nps, pv):
+        """Caches analysis result of the analyzed position, unless a deeper result is cached, and shows it. Results
+        of an earlier search, queued before the position changed, are dropped."""
+        if searchId != self.analysisId:
+            return
+        cached = self.analysisCache.get(self.analysisHash)
+        if cached is not None and cached[1] > depth:
+            return
+        self.analysisCache[self.analysisHash] = (self.analysisTurn, depth, score, nodes, nps, pv)
+        self.analysisCache.move_to_end(self.analysisHash)
+        if len(self.analysisCache) > self.analysisCacheSize:
+            self.analysisCache.popitem(last=False)
+        self.displayAnalysis(self.analysisTurn, depth, score, nodes, nps, pv)
+
+    def showBestMove(self, searchId, move, score):
+        """Marks the end of an analysis that stopped by itself, because a forced mate was found or the position has no
+        legal moves: adds the best move to the analysis tab, or shows that there is none. Results of an earlier search
+        are dropped."""
+        if searchId != self.analysisId:
+            return
+        if move:
+            self.analysisField.appendPlainText('\nBest move ' + self.algorithm.toAlgebraic(move))
+        else:
+            self.analysisField.setPlainText('No legal moves ({})'.format('checkmate' if score else 'stalemate'))
+            self.view.setAnalysisArrows([])
+
+    def displayAnalysis(self, turn, depth, score, nodes, nps, pv):
+        """Shows analysis result in the analysis tab and the first moves of the principal variation as arrows on the
+        board, in the color of the player making the move. Scores are shown in pawns from the point of view of red
+        and yellow."""
+        if turn not in (RED, YELLOW):
+            score = -score
+        if abs(score) >= MATE - MAX_PLY:
+            score = '#' + '-' * (score < 0) + str(MATE - abs(score))
+        else:
+            score = '{:+.2f}'.format(score / 100)
+        self.analysisField.setPlainText('Depth {}  Score {}\nNodes {}  {} nps\n\n{}'.format(
+            depth, score, nodes, nps, ' '.join(self.algorithm.toAlgebraic(move) for move in pv)))
+        self.view.setAnalysisArrows(self.lineArrows(turn, pv[:len(self.analysisAlpha)], self.analysisAlpha))
+
+    def lineArrows(self, turn, moves, alphas):
+        """Returns arrows (fromFile, fromRank, toFile, toRank, color) of line of moves starting with player turn to
+        move, in the color of the player making the move with alpha value per ply."""
+        board = self.algorithm.board
+        arrows = []
+        for ply, move in enumerate(moves):
+            origin, target = move & 255, move >> 8 & 255
+            if move >> 28:  # Castling: arrow to the square the king lands on
+                target = board.castlingSquares(origin, target)[0]
+            color = QColor(self.analysisColors[(turn + ply) % 4])
+            color.setAlpha(alphas[ply])
+            arrows.append(board.fileRank(origin) + board.fileRank(target) + (color,))
+        return arrows
+
+    def findMate(self):
+        """Asks for the number of moves and starts searching the current position for a forced mate by the team to
+        move. Analysis is switched off, such that its arrows do not replace the mating line."""
+        moves, ok = QInputDialog.getInt(self, 'Find Mate', 'Mate in at most (moves of the team to move):',
+                                        self.mateMoves, 1, 5)
+        if not ok:
+            return
+        self.mateMoves = moves
+        self.actionAnalyze.setChecked(False)
+        board = self.algorithm.board
+        self.mateHash = board.hash
+        self.analysisTurn = board.turn
+        self.analysisField.setPlainText('Searching for mate in {}...'.format(moves))
+        self.view.setAnalysisArrows([])
+        self.mate.solve(board.snapshot(), moves, self.mateNodes)
+
+    def showMate(self, result, line):
+        """Shows result of the mate search in the analysis tab and the mating line as arrows on the board, if the
+        position has not changed since."""
+        if self.algorithm.board.hash != self.mateHash:
+            return
+        self.mateHash = None
+        self.mateLineHash = self.algorithm.board.hash
+        if result == PROVEN:
+            self.analysisField.setPlainText('Mate in {}\n\n{}'.format(
+                (len(line) + 1) // 2, ' '.join(self.algorithm.toAlgebraic(move) for move in line)))
+            alphas = [max(224 - 32 * ply, 64) for ply in range(len(line))]
+            self.view.setAnalysisArrows(self.lineArrows(self.analysisTurn, line, alphas))
+        elif result == DISPROVEN:
+            self.analysisField.setPlainText('No mate in {}'.format(self.mateMoves))
+        else:
+            self.analysisField.setPlainText('No mate found within {} nodes'.format(self.mateNodes))
+
+    def clearMate(self):
+        """Removes the result of the mate search when the position has changed."""
+        if self.mateLineHash is None or self.algorithm.board.hash == self.mateLineHash:
+            return
+        self.mateLineHash = None
+        if not self.actionAnalyze.isChecked():
+            self.analysisField.clear()
+            self.view.setAnalysisArrows([])
+
+    def showHangingPieces(self):
+        """Marks pieces that an opponent can capture winning material, if enabled."""
+        if not self.actionShow_Hanging_Pieces.isChecked():
+            self.view.setHangingPieces([])
+            return
+        board = self.algorithm.board
+        self.view.setHangingPieces(board.getSquares(hangingPieces(board)))
+
+    def closeEvent(self, event):
+        """Stops the analysis and mate workers before closing."""
+        self.analysis.shutdown()
+        self.mate.cancel()
+        super().closeEvent(event)
+
     def keyPressEvent(self, event):
         """Handles arrow key press events to go to previous, next, first or last move. Also stores key modifier for View
         to draw different color arrows and squares."""
@@ -80,6 +80,11 @@ class View(QWidget):
         self.keyModifier = None
         self.arrowColor = None
         self.squareColor = None
+        # Analysis arrows of the engine's best line, kept apart from the user's arrows
+        self.analysisMoves = []
+        self.analysisArrows = []
+        # Hanging pieces overlay, list of (file, rank)
+        self.hangingSquares = []
         # Coordinate help
         self.coordinate = None
         self.setMouseTracking(True)
@@ -119,6 +124,7 @@ class View(QWidget):
         self.orientation.rotate(rotation)
         self.movePlayerLabels(self.orientation[0])
         self.removeArrows()
+        self.setAnalysisArrows(self.analysisMoves)
         self.update()
 
     def autoRotate(self, rotation):
@@ -181,16 +187,16 @@ class View(QWidget):
         file = square.x()
         rank = square.y()
         if orientation == 'b':
-            return QPoint((self.board.ranks - (rank + 1)) * sqSize.width() + sqSize.width() / 2,
-                          (self.board.files - (file + 1)) * sqSize.height() + sqSize.height() / 2)
+            return QPoint((self.board.ranks - (rank + 1)) * sqSize.width() + sqSize.width() // 2,
+                          (self.board.files - (file + 1)) * sqSize.height() + sqSize.height() // 2)
         elif orientation == 'y':
-            return QPoint((self.board.files - (file + 1)) * sqSize.width() + sqSize.width() / 2,
-                          rank * sqSize.height() + sqSize.height() / 2)
+            return QPoint((self.board.files - (file + 1)) * sqSize.width() + sqSize.width() // 2,
+                          rank * sqSize.height() + sqSize.height() // 2)
         elif orientation == 'g':
-            return QPoint(rank * sqSize.width() + sqSize.width() / 2, file * sqSize.height() + sqSize.height() / 2)
+            return QPoint(rank * sqSize.width() + sqSize.width() // 2, file * sqSize.height() + sqSize.height() // 2)
         else:  # red by default
-            return QPoint(file * sqSize.width() + sqSize.width() / 2,
-                          (self.board.ranks - (rank + 1)) * sqSize.height() + sqSize.height() / 2)
+            return QPoint(file * sqSize.width() + sqSize.width() // 2,
+                          (self.board.ranks - (rank + 1)) * sqSize.height() + sqSize.height() // 2)
 
     def paintEvent(self, event):
         """Implements paintEvent() method. Draws squares and pieces on the board."""
@@ -205,6 +211,7 @@ class View(QWidget):
                     self.drawSquare(painter, file, rank)
         # Draw square highlights
         self.drawSquareHighlights(painter)
+        self.drawHangingPieces(painter)
         painter.fillRect(self.squareRect(12, 1, self.orientation[0]), QColor('#40bf3b43'))
         painter.fillRect(self.squareRect(1, 1, self.orientation[0]), QColor('#404185bf'))
         painter.fillRect(self.squareRect(1, 12, self.orientation[0]), QColor('#40c09526'))
@@ -587,6 +594,20 @@ class View(QWidget):
                 elif highlight.Type == self.SquareHighlight.Type and highlight.color in colors:
                     self.removeHighlight(highlight)
 
+    def moveArrows(self, moves):
+        """Returns list of arrows for list of moves (fromFile, fromRank, toFile, toRank, color) in the current board
+        orientation."""
+        return [self.Arrow(self.squareCenter(QPoint(fromFile, fromRank), self.orientation[0]),
+                           self.squareCenter(QPoint(toFile, toRank), self.orientation[0]), color)
+                for fromFile, fromRank, toFile, toRank, color in moves]
+
+    def setAnalysisArrows(self, moves):
+        """Sets arrows of the engine's best line or a mating line from list of (fromFile, fromRank, toFile, toRank,
+        color), replacing the previous ones."""
+        self.analysisMoves = moves
+        self.analysisArrows = self.moveArrows(moves)
+        self.update()
+
     def drawSquareHighlights(self, painter):
         """Draws all recognized highlights stored in the list."""
         for highlight in self.highlights:
@@ -599,9 +620,23 @@ class View(QWidget):
                     rect = self.squareRect(highlight.file, highlight.rank, self.orientation[0])
                 painter.fillRect(rect, highlight.color)
 
+    def setHangingPieces(self, squares):
+        """Sets squares (list of (file, rank)) of hanging pieces to mark, replacing the previous ones."""
+        self.hangingSquares = squares
+        self.update()
+
+    def drawHangingPieces(self, painter):
+        """Draws a frame around hanging pieces."""
+        lineWidth = 4
+        painter.setPen(QPen(QColor('#c0e0102f'), lineWidth, Qt.SolidLine, Qt.SquareCap, Qt.MiterJoin))
+        painter.setBrush(Qt.NoBrush)
+        for file, rank in self.hangingSquares:
+            rect = self.squareRect(file, rank, self.orientation[0])
+            painter.drawRect(rect.adjusted(lineWidth // 2, lineWidth // 2, -lineWidth // 2, -lineWidth // 2))
+
     def drawArrows(self, painter):
         """Draws arrows on the board."""
-        for highlight in self.highlights:
+        for highlight in self.highlights + self.analysisArrows:
             if highlight.Type == self.Arrow.Type:
                 lineWidth = 10
                 sqSize = self.squareSize
@@ -681,15 +716,17 @@ class View(QWidget):
             identifier = self.board.getData(fromFile, fromRank)
             if identifier != ' ' and identifier[0] == self.currentPlayer:
                 color = ['r', 'b', 'y', 'g'].index(identifier[0])
-                piece = ['P', 'N', 'B', 'R', 'Q', 'K'].index(identifier[1]) + 4
-                self.addLegalMoveIndicators(piece, fromFile, fromRank, color)
+                self.addLegalMoveIndicators(fromFile, fromRank, color)
 
-    def addLegalMoveIndicators(self, piece, fromFile, fromRank, color):
+    def addLegalMoveIndicators(self, fromFile, fromRank, color):
         """Adds legal move indicators."""
         origin = self.board.square(fromFile, fromRank)
-        moves = self.board.getSquares(self.board.legalMoves(piece, origin, color) & self.board.emptyBB)
-        captures = self.board.getSquares(self.board.legalMoves(piece, origin, color) &
-                                         self.board.occupiedBB)
+        targets = 0
+        for move in self.board.generateMoves(color):
+            if move & 255 == origin:
+                targets |= 1 << (move >> 8 & 255)
+        moves = self.board.getSquares(targets & self.board.emptyBB)
+        captures = self.board.getSquares(targets & self.board.occupiedBB)
         for move in moves:
             legalMoveIndicator = self.LegalMoveIndicator(QPoint(move[0], move[1]))
             self.addHighlight(legalMoveIndicator)
@@ -732,14 +769,15 @@ class View(QWidget):
                     pass
 
     def highlightChecks(self):
-        """Adds red square highlight for kings in check."""
+        """Adds red square highlight for kings in check. Captured kings are skipped."""
         checkColor = QColor('#ccff0000')
         for highlight in reversed(self.highlights):  # reversed list, because modifying while looping
             if highlight.Type == self.SquareHighlight.Type and highlight.color == checkColor:
                 self.removeHighlight(highlight)
         for color in range(4):
-            inCheck, (file, rank) = self.board.kingInCheck(color)
+            inCheck, kingSquare = self.board.kingInCheck(color)
             if inCheck:
+                file, rank = kingSquare
                 highlight = self.SquareHighlight(file, rank, checkColor)
                 self.addHighlight(highlight)
 
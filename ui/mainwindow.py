@@ -274,6 +274,40 @@ class Ui_MainWindow(object):
         self.horizontalLayout_3.addItem(spacerItem)
         self.verticalLayout_4.addLayout(self.horizontalLayout_3)
         self.tabWidget.addTab(self.pgnTab, "")
+        self.analysisTab = QtWidgets.QWidget()
+        self.analysisTab.setObjectName("analysisTab")
+        self.analysisLayoutWidget = QtWidgets.QWidget(self.analysisTab)
+        self.analysisLayoutWidget.setGeometry(QtCore.QRect(10, 10, 302, 542))
+        self.analysisLayoutWidget.setObjectName("analysisLayoutWidget")
+        self.verticalLayout_5 = QtWidgets.QVBoxLayout(self.analysisLayoutWidget)
+        self.verticalLayout_5.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.analysisField = QtWidgets.QPlainTextEdit(self.analysisLayoutWidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.analysisField.sizePolicy().hasHeightForWidth())
+        self.analysisField.setSizePolicy(sizePolicy)
+        self.analysisField.setMinimumSize(QtCore.QSize(300, 500))
+        font = QtGui.QFont()
+        font.setFamily("Trebuchet MS")
+        self.analysisField.setFont(font)
+        self.analysisField.setStyleSheet("background-color: rgb(255, 255, 255);")
+        self.analysisField.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.analysisField.setReadOnly(True)
+        self.analysisField.setObjectName("analysisField")
+        self.verticalLayout_5.addWidget(self.analysisField)
+        self.horizontalLayout_6 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_6.setSpacing(5)
+        self.horizontalLayout_6.setObjectName("horizontalLayout_6")
+        self.analyzeButton = QtWidgets.QPushButton(self.analysisLayoutWidget)
+        self.analyzeButton.setCheckable(True)
+        self.analyzeButton.setObjectName("analyzeButton")
+        self.horizontalLayout_6.addWidget(self.analyzeButton)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_6.addItem(spacerItem1)
+        self.verticalLayout_5.addLayout(self.horizontalLayout_6)
+        self.tabWidget.addTab(self.analysisTab, "")
         self.verticalLayout.addWidget(self.tabWidget)
         self.fenGroupBox = QtWidgets.QGroupBox(self.centralwidget)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
@@ -335,8 +369,8 @@ class Ui_MainWindow(object):
         self.setFenButton = QtWidgets.QPushButton(self.layoutWidget2)
         self.setFenButton.setObjectName("setFenButton")
         self.horizontalLayout.addWidget(self.setFenButton)
-        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
-        self.horizontalLayout.addItem(spacerItem1)
+        spacerItem2 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem2)
         self.boardResetButton = QtWidgets.QPushButton(self.layoutWidget2)
         self.boardResetButton.setObjectName("boardResetButton")
         self.horizontalLayout.addWidget(self.boardResetButton)
@@ -380,6 +414,14 @@ class Ui_MainWindow(object):
         self.actionRotate_Board_Right.setObjectName("actionRotate_Board_Right")
         self.actionFlip_Board = QtWidgets.QAction(MainWindow)
         self.actionFlip_Board.setObjectName("actionFlip_Board")
+        self.actionAnalyze = QtWidgets.QAction(MainWindow)
+        self.actionAnalyze.setCheckable(True)
+        self.actionAnalyze.setObjectName("actionAnalyze")
+        self.actionShow_Hanging_Pieces = QtWidgets.QAction(MainWindow)
+        self.actionShow_Hanging_Pieces.setCheckable(True)
+        self.actionShow_Hanging_Pieces.setObjectName("actionShow_Hanging_Pieces")
+        self.actionFind_Mate = QtWidgets.QAction(MainWindow)
+        self.actionFind_Mate.setObjectName("actionFind_Mate")
         self.actionNew_Game = QtWidgets.QAction(MainWindow)
         self.actionNew_Game.setObjectName("actionNew_Game")
         self.actionPreferences = QtWidgets.QAction(MainWindow)
@@ -403,6 +445,10 @@ class Ui_MainWindow(object):
         self.menuView.addAction(self.actionRotate_Board_Left)
         self.menuView.addAction(self.actionRotate_Board_Right)
         self.menuView.addAction(self.actionFlip_Board)
+        self.menuView.addSeparator()
+        self.menuView.addAction(self.actionAnalyze)
+        self.menuView.addAction(self.actionShow_Hanging_Pieces)
+        self.menuView.addAction(self.actionFind_Mate)
         self.menu4PlayerChess.addAction(self.actionAbout)
         self.menu4PlayerChess.addAction(self.actionCheck_for_Updates)
         self.menu4PlayerChess.addSeparator()
@@ -441,6 +487,9 @@ class Ui_MainWindow(object):
         self.savePgnButton.setStatusTip(_translate("MainWindow", "Save game to PGN4 file"))
         self.savePgnButton.setText(_translate("MainWindow", "Save As..."))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.pgnTab), _translate("MainWindow", "PGN4"))
+        self.analyzeButton.setStatusTip(_translate("MainWindow", "Analyze current position"))
+        self.analyzeButton.setText(_translate("MainWindow", "Analyze"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.analysisTab), _translate("MainWindow", "Analysis"))
         self.fenGroupBox.setTitle(_translate("MainWindow", "Current Position (FEN4):"))
         self.fenField.setStatusTip(_translate("MainWindow", "Enter FEN4"))
         self.fenField.setPlaceholderText(_translate("MainWindow", "Enter FEN4 here..."))
@@ -479,6 +528,15 @@ class Ui_MainWindow(object):
         self.actionFlip_Board.setText(_translate("MainWindow", "Flip Board"))
         self.actionFlip_Board.setStatusTip(_translate("MainWindow", "Flip board"))
         self.actionFlip_Board.setShortcut(_translate("MainWindow", "Ctrl+F"))
+        self.actionAnalyze.setText(_translate("MainWindow", "Analyze"))
+        self.actionAnalyze.setStatusTip(_translate("MainWindow", "Analyze current position"))
+        self.actionAnalyze.setShortcut(_translate("MainWindow", "Ctrl+E"))
+        self.actionShow_Hanging_Pieces.setText(_translate("MainWindow", "Show Hanging Pieces"))
+        self.actionShow_Hanging_Pieces.setStatusTip(_translate("MainWindow", "Mark pieces that can be captured winning material"))
+        self.actionShow_Hanging_Pieces.setShortcut(_translate("MainWindow", "Ctrl+H"))
+        self.actionFind_Mate.setText(_translate("MainWindow", "Find Mate..."))
+        self.actionFind_Mate.setStatusTip(_translate("MainWindow", "Search for a forced checkmate by the team to move"))
+        self.actionFind_Mate.setShortcut(_translate("MainWindow", "Ctrl+M"))
         self.actionNew_Game.setText(_translate("MainWindow", "New Game"))
         self.actionNew_Game.setStatusTip(_translate("MainWindow", "Start new game"))
         self.actionNew_Game.setShortcut(_translate("MainWindow", "Ctrl+N"))